@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Microbenchmarks do trabalho de CPU por arquivo no supervisor.
+
+Mede ns/op e alocação (pico de memória por operação, via tracemalloc) de:
+
+- ``_format_code_with_line_numbers`` (uma vez por agente)
+- ``CodeParser`` (``ast.parse`` + metadados, uma vez por agente em ``_add_metadata``)
+- ``_add_metadata`` (validação + metadados das detecções de um agente)
+- ``model_dump`` de uma detecção
+- ``DetectionValidator.validate_detection`` (regex sobre a descrição)
+
+em entradas sintéticas de 60, 600 e 3000 linhas. Os tempos são comparados ao
+baseline normalizados por um laço de calibração, para que o mesmo baseline
+sirva em máquinas diferentes, com tolerância larga (``--tolerance``), pois
+máquinas compartilhadas variam bastante entre execuções. As alocações são
+determinísticas e têm tolerância estreita (``--alloc-tolerance``). Qualquer
+piora acima da tolerância termina o script com código 1.
+
+    python scripts/benchmark_hotpaths.py
+    python scripts/benchmark_hotpaths.py --update-baseline
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from devtools.settings import configure_settings
+
+configure_settings()
+from core.schemas.agent_response import (
+    ComplexMethodDetection,
+    LongIdentifierDetection,
+    LongStatementDetection,
+    MagicNumberDetection,
+)
+from core.supervisor import CodeSmellSupervisor
+from core.utils.code_parser import CodeParser
+from core.utils.detection_validator import DetectionValidator
+
+base_dir = Path(__file__).parent.parent
+baseline_file = base_dir / "results" / "benchmarks" / "hotpaths_baseline.json"
+
+SIZES = {"small": 60, "medium": 600, "large": 3000}
+
+# Crescimento de alocação ignorado na comparação, em bytes
+ALLOC_SLACK_BYTES = 1024
+
+# Novas medições de um caso acima da tolerância antes de reprová-lo
+RECHECKS = 2
+
+FUNCTION_TEMPLATE = '''def compute_{index}(alpha, beta, gamma, delta, epsilon):
+    """Função sintética {index}."""
+    total = alpha * 42 + beta
+    if alpha > 3 and beta < 7 or gamma == 11:
+        total += delta.values.items().count(epsilon)
+    try:
+        total /= gamma
+    except ZeroDivisionError:
+        pass
+    return total + 3.14159
+'''
+
+
+def make_code(lines):
+    """Código sintético com exatamente ``lines`` linhas (funções de 10 linhas)."""
+    functions = [FUNCTION_TEMPLATE.format(index=index) for index in range(lines // 10)]
+    return "".join(functions)[:-1]
+
+
+def make_detections(code):
+    """Uma detecção por função, alternando tipos com validações por regex diferentes."""
+    detections = []
+    for index in range(code.count("\ndef ") + 1):
+        line = index * 10 + 1
+        kind = index % 4
+        if kind == 0:
+            detection = MagicNumberDetection(
+                Method=f"compute_{index}",
+                Line_no=line + 2,
+                Description="Magic number 42 in expression",
+            )
+        elif kind == 1:
+            detection = ComplexMethodDetection(
+                Method=f"compute_{index}",
+                Line_no=line,
+                Description="Method has cyclomatic complexity of 9 (threshold 7)",
+                cyclomatic_complexity=9,
+            )
+        elif kind == 2:
+            detection = LongIdentifierDetection(
+                Method=f"compute_{index}",
+                Line_no=line,
+                Description="Identifier compute_intermediate_total has 30 characters",
+                identifier_name="compute_intermediate_total_val",
+                length=30,
+            )
+        else:
+            detection = LongStatementDetection(
+                Method=f"compute_{index}",
+                Line_no=line + 4,
+                Description="Statement has 150 characters",
+                line_length=150,
+            )
+        detections.append(detection)
+    return detections
+
+
+def calibration():
+    """Laço de referência em Python puro (mede a velocidade da máquina)."""
+    total = 0
+    for value in range(1000):
+        total += value * value % 7
+    return total
+
+
+def measure(func, per_call=1, alloc_func=None, min_seconds=0.3, repeat=7):
+    """ns/op (melhor de ``repeat`` rodadas) e pico de memória alocada por operação.
+
+    ``func`` pode executar ``per_call`` operações; nesse caso a alocação é
+    medida em ``alloc_func``, que executa uma só.
+    """
+    func()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds / repeat or loops >= 1_000_000:
+            break
+        loops *= 2
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            best = min(best, (time.perf_counter() - started) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        (alloc_func or func)()
+        peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ns_per_op": round(best * 1e9 / per_call, 1),
+        "alloc_peak_bytes": max(peak_bytes, 0),
+        "loops": loops,
+    }
+
+
+def run_benchmarks(only=None):
+    """Resultados por benchmark e tamanho de entrada (ou só os nomes em ``only``)."""
+    supervisor = CodeSmellSupervisor()
+    validator = DetectionValidator()
+    results = {"calibration": measure(calibration)}
+    calibrations = [results["calibration"]["ns_per_op"]]
+    for size, lines in SIZES.items():
+        code = make_code(lines)
+        file_path = f"bench/{size}.py"
+        detections = make_detections(code)
+        dicts = [d.model_dump() for d in detections]
+        count = len(detections)
+
+        def dump_all():
+            for detection in detections:
+                detection.model_dump()
+
+        def validate_all():
+            for detection in dicts:
+                validator.validate_detection(detection)
+
+        # pylint: disable=protected-access
+        cases = {
+            "format_code_with_line_numbers": {
+                "func": lambda: supervisor._format_code_with_line_numbers(code)
+            },
+            "code_parser": {"func": lambda: CodeParser(code, file_path)},
+            "add_metadata": {
+                "func": lambda: supervisor._add_metadata(detections, code, file_path, "Bench")
+            },
+            # Por detecção: o tempo é dividido pelo número de detecções
+            "model_dump": {
+                "func": dump_all,
+                "per_call": count,
+                "alloc_func": detections[0].model_dump,
+            },
+            "detection_validator": {
+                "func": validate_all,
+                "per_call": count,
+                "alloc_func": lambda: validator.validate_detection(dicts[0]),
+            },
+        }
+        for name, case in cases.items():
+            if only is not None and f"{name}[{size}]" not in only:
+                continue
+            result = measure(**case)
+            result["lines"] = lines
+            results[f"{name}[{size}]"] = result
+            calibrations.append(measure(calibration)["ns_per_op"])
+    # Melhor tempo da calibração ao longo da execução (como o melhor de cada caso)
+    results["calibration"]["ns_per_op"] = min(calibrations)
+    return results
+
+
+def compare(results, baseline, tolerance, alloc_tolerance):
+    """Linhas da comparação com o baseline e se houve regressão."""
+    calibration_now = results["calibration"]["ns_per_op"]
+    calibration_then = baseline["results"]["calibration"]["ns_per_op"]
+    rows, regressed = [], False
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if name == "calibration" or old is None:
+            continue
+        time_change = (result["ns_per_op"] / calibration_now) / (
+            old["ns_per_op"] / calibration_then
+        ) - 1
+        alloc_growth = result["alloc_peak_bytes"] - old["alloc_peak_bytes"]
+        alloc_change = alloc_growth / old["alloc_peak_bytes"] if old["alloc_peak_bytes"] else 0.0
+        if alloc_growth < ALLOC_SLACK_BYTES:
+            # Variações de poucos bytes (cache interno, interning) não são regressão
+            alloc_change = min(alloc_change, 0.0)
+        failed = time_change > tolerance or alloc_change > alloc_tolerance
+        regressed |= failed
+        rows.append((name, result, time_change, alloc_change, "REGRESSÃO" if failed else "ok"))
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks do supervisor")
+    parser.add_argument("--baseline", type=Path, default=baseline_file)
+    parser.add_argument("--update-baseline", action="store_true", help="Grava o baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Piora de tempo aceita")
+    parser.add_argument(
+        "--alloc-tolerance", type=float, default=0.10, help="Piora de alocação aceita"
+    )
+    parser.add_argument("--output", type=Path, help="Arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("MICROBENCHMARKS DO SUPERVISOR")
+    print("=" * 80)
+    results = run_benchmarks()
+    report = {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+
+    for name, result in results.items():
+        print(
+            f"  {name:<45} {result['ns_per_op']:>14,.1f} ns/op | "
+            f"{result['alloc_peak_bytes']:>12,} bytes/op"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nBaseline gravado em: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nSem baseline em {args.baseline} (use --update-baseline)")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    rows, regressed = compare(results, baseline, args.tolerance, args.alloc_tolerance)
+    for _ in range(RECHECKS):
+        if not regressed:
+            break
+        # Casos acima da tolerância são medidos de novo (fica o melhor tempo),
+        # para que um pico de ruído da máquina não reprove a execução
+        suspects = {name for name, *_, status in rows if status != "ok"}
+        for name, result in run_benchmarks(only=suspects).items():
+            if name != "calibration":
+                results[name]["ns_per_op"] = min(results[name]["ns_per_op"], result["ns_per_op"])
+        rows, regressed = compare(results, baseline, args.tolerance, args.alloc_tolerance)
+    print(
+        "\nComparação com o baseline "
+        f"(tempo normalizado pela calibração, tolerância {args.tolerance:.0%}; "
+        f"alocação {args.alloc_tolerance:.0%}):"
+    )
+    for name, _, time_change, alloc_change, status in rows:
+        print(
+            f"  {name:<45} tempo {time_change:+7.1%} | alocação {alloc_change:+7.1%} {status}"
+        )
+    if regressed:
+        print("\nREGRESSÃO DE DESEMPENHO: ver as linhas marcadas acima")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Benchmark ponta a ponta do supervisor (vazão, latência, CPU, memória e tokens).
+
+Roda o pipeline completo sobre o dataset, opcionalmente replicado (``--scale``)
+ou acrescido de arquivos sintéticos grandes, contra um backend local:
+
+- ``fake``: o servidor de devtools/fake_openrouter.py, no mesmo processo
+  (transporte ASGI do httpx, sem rede); as opções dele vão em ``--fake-args``
+- ``replay``: respostas gravadas com LLM_BACKEND=record (LLM_ARCHIVE_PATH)
+
+O relatório JSON vai para results/benchmarks/. Com ``--compare`` ele é
+comparado a um relatório anterior e o script termina com código 1 se alguma
+métrica piorar mais que ``--tolerance``. No replay, uma requisição sem
+resposta gravada também termina o script com código 1.
+
+    python scripts/benchmark_pipeline.py --scale 5 --fake-args "--latency-ms 200"
+    python scripts/benchmark_pipeline.py --compare results/benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import shlex
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from devtools.settings import configure_settings
+
+base_dir = Path(__file__).parent.parent
+results_dir = base_dir / "results" / "benchmarks"
+
+# Métricas comparadas com --compare: (caminho no relatório, maior é melhor)
+COMPARED_METRICS = (
+    (("throughput", "files_per_minute"), True),
+    (("file_latency_seconds", "p50"), False),
+    (("file_latency_seconds", "p95"), False),
+    (("file_latency_seconds", "p99"), False),
+    (("cpu", "cpu_ms_per_file"), False),
+    (("memory", "peak_rss_mb"), False),
+    (("tokens", "total_tokens_per_line"), False),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark ponta a ponta do supervisor")
+    parser.add_argument("--backend", choices=("fake", "replay"), default="fake")
+    parser.add_argument("--fake-args", default="--latency-ms 100", help="Opções do servidor falso")
+    parser.add_argument("--scale", type=int, default=1, help="Cópias de cada arquivo do dataset")
+    parser.add_argument("--synthetic-files", type=int, default=0, help="Arquivos sintéticos")
+    parser.add_argument("--synthetic-lines", type=int, default=2000, help="Linhas por sintético")
+    parser.add_argument("--limit", type=int, default=0, help="Arquivos do dataset (0 = todos)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Arquivos em paralelo")
+    parser.add_argument("--prompt-type", default="simple")
+    parser.add_argument("--grouping", default="none")
+    parser.add_argument("--layout", default="prompt_first")
+    parser.add_argument("--engine", default="llm")
+    parser.add_argument("--gating", action="store_true")
+    parser.add_argument("--chunked", action="store_true", help="Divide arquivos grandes em blocos")
+    parser.add_argument("--output", type=Path, help="Arquivo do relatório JSON")
+    parser.add_argument("--compare", type=Path, help="Relatório anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Piora relativa aceita")
+    return parser.parse_args()
+
+
+def settings_overrides(args):
+    """Configurações do benchmark, além das do ambiente/.env."""
+    if args.backend == "replay":
+        return {"LLM_BACKEND": "replay"}
+    # Provedor falso: os limites de taxa do provedor real não se aplicam
+    return {
+        "OPENROUTER_BASE_URL": "http://fake-openrouter/v1",
+        "RATE_LIMIT_RPM": 1_000_000,
+        "RATE_LIMIT_TPM": 1_000_000_000,
+    }
+
+
+def load_corpus(args):
+    """[(file_path, código)] do dataset replicado e dos arquivos sintéticos."""
+    dataset_dir = base_dir / "dataset"
+    py_files = sorted(f for f in dataset_dir.rglob("*.py") if "ground_truth" not in str(f))
+    if args.limit:
+        py_files = py_files[: args.limit]
+    sources = [(str(f.relative_to(base_dir)), f.read_text(encoding="utf-8")) for f in py_files]
+
+    corpus = []
+    for copy in range(args.scale):
+        # Caminhos distintos por cópia: nenhuma resposta é reaproveitada entre cópias
+        corpus.extend((f"copy{copy}/{path}", code) for path, code in sources)
+
+    for index in range(args.synthetic_files):
+        # Arquivos do dataset concatenados até o tamanho pedido
+        parts, lines = [], 0
+        position = index
+        while lines < args.synthetic_lines and sources:
+            code = sources[position % len(sources)][1]
+            parts.append(code)
+            lines += code.count("\n") + 1
+            position += 1
+        corpus.append((f"synthetic/synthetic_{index}.py", "\n".join(parts)))
+    return corpus
+
+
+def git_commit():
+    """Commit do repositório (para comparar execuções entre commits)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=base_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_supervisor(args):
+    """Supervisor apontado para o backend do benchmark."""
+    from config.settings import settings
+    from core.supervisor import CodeSmellSupervisor
+
+    http_client = None
+    fake = None
+    if args.backend == "fake":
+        import httpx
+
+        from devtools.fake_openrouter import create_app, parse_args as parse_fake_args
+
+        _, fake_config = parse_fake_args(shlex.split(args.fake_args))
+        app = create_app(fake_config)
+        fake = app.state.fake
+        http_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            timeout=settings.HTTP_TIMEOUT_SECONDS,
+        )
+
+    supervisor = CodeSmellSupervisor(
+        prompt_type=args.prompt_type,
+        grouping=args.grouping,
+        layout=args.layout,
+        engine=args.engine,
+        http_async_client=http_client,
+    )
+    return supervisor, fake
+
+
+async def run_benchmark(args, corpus):
+    """Analisa o corpus e coleta latências, CPU e uso de tokens."""
+    from core.utils.metrics import metrics, percentile
+
+    supervisor, fake = build_supervisor(args)
+    metrics.reset()
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    file_latencies = []
+    token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    summary = {"smells": 0, "failed_agents": 0, "replay_misses": 0, "errors": 0, "lines": 0}
+
+    async def analyze(file_path, code):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await supervisor.analyze_code(
+                code,
+                file_path,
+                "Benchmark",
+                use_cache=False,
+                chunked=args.chunked,
+                gating=args.gating,
+            )
+            elapsed = time.perf_counter() - started
+        if result.get("error"):
+            # Arquivo rejeitado pela validação de tamanho (ver --chunked): não entra na vazão
+            print(f"   {file_path}: {result['error']}")
+            summary["errors"] += 1
+            return
+        file_latencies.append(elapsed)
+        summary["lines"] += code.count("\n") + 1
+        failed_agents = result.get("agent_calls", {}).get("failed_agents", {})
+        summary["smells"] += result["total_smells_detected"]
+        summary["failed_agents"] += len(failed_agents)
+        summary["replay_misses"] += sum(
+            1 for failure in failed_agents.values() if failure["reason"] == "replay_miss"
+        )
+        for field in token_usage:
+            token_usage[field] += (result.get("token_usage") or {}).get(field, 0)
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    loop_cpu_started = time.thread_time()
+    await asyncio.gather(*(analyze(path, code) for path, code in corpus))
+    wall_seconds = time.perf_counter() - wall_started
+    cpu_seconds = time.process_time() - cpu_started
+    loop_cpu_seconds = time.thread_time() - loop_cpu_started
+
+    # Só arquivos analisados: os rejeitados não entram na vazão nem nos tokens por linha
+    total_lines = summary["lines"]
+    analyzed = len(file_latencies)
+    prefix = "llm.agent_latency_seconds."
+    agent_latency = {
+        name[len(prefix):]: observed
+        for name, observed in metrics.snapshot()["observations"].items()
+        if name.startswith(prefix)
+    }
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "files": {"total": len(corpus), "analyzed": analyzed, "errors": summary["errors"]},
+        "total_lines": total_lines,
+        "throughput": {
+            "wall_seconds": round(wall_seconds, 3),
+            "files_per_minute": round(analyzed / wall_seconds * 60, 2) if wall_seconds else 0.0,
+            "lines_per_second": round(total_lines / wall_seconds, 1) if wall_seconds else 0.0,
+        },
+        "file_latency_seconds": {
+            "mean": round(sum(file_latencies) / analyzed, 4) if analyzed else 0.0,
+            "p50": round(percentile(file_latencies, 50), 4),
+            "p95": round(percentile(file_latencies, 95), 4),
+            "p99": round(percentile(file_latencies, 99), 4),
+            "max": round(max(file_latencies, default=0.0), 4),
+        },
+        "agent_latency_seconds": dict(sorted(agent_latency.items())),
+        "cpu": {
+            # Com o backend fake, o servidor roda no mesmo loop e entra na conta
+            "process_cpu_seconds": round(cpu_seconds, 3),
+            "event_loop_cpu_seconds": round(loop_cpu_seconds, 3),
+            "cpu_ms_per_file": round(cpu_seconds / analyzed * 1000, 2) if analyzed else 0.0,
+            "event_loop_utilization": round(loop_cpu_seconds / wall_seconds, 4)
+            if wall_seconds
+            else 0.0,
+        },
+        "memory": {"peak_rss_mb": round(peak_rss_kb / 1024, 1)},
+        "tokens": {
+            **token_usage,
+            "total_tokens_per_line": round(token_usage["total_tokens"] / total_lines, 2)
+            if total_lines
+            else 0.0,
+            "prompt_tokens_per_line": round(token_usage["prompt_tokens"] / total_lines, 2)
+            if total_lines
+            else 0.0,
+        },
+        "detections": {
+            "total_smells": summary["smells"],
+            "failed_agents": summary["failed_agents"],
+            "replay_misses": summary["replay_misses"],
+        },
+        "fake_server": fake.stats() if fake is not None else None,
+    }
+
+
+def _metric(report, path):
+    value = report
+    for key in path:
+        value = (value or {}).get(key)
+    return value
+
+
+def compare_reports(current, baseline, tolerance):
+    """Diferenças relativas por métrica; retorna (linhas, houve regressão)."""
+    rows, regressed = [], False
+    for path, higher_is_better in COMPARED_METRICS:
+        new, old = _metric(current, path), _metric(baseline, path)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        status = "REGRESSÃO" if worse > tolerance else "ok"
+        regressed |= worse > tolerance
+        rows.append((".".join(path), old, new, change, status))
+    return rows, regressed
+
+
+async def main():
+    args = parse_args()
+    configure_settings(**settings_overrides(args))
+    corpus = load_corpus(args)
+
+    print("=" * 80)
+    print("BENCHMARK DO PIPELINE")
+    print("=" * 80)
+    print(
+        f"Backend: {args.backend} | Arquivos: {len(corpus)} | "
+        f"Concorrência: {args.concurrency} | grouping: {args.grouping}"
+    )
+
+    results = await run_benchmark(args, corpus)
+    report = {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "config": {
+            key: (str(value) if isinstance(value, Path) else value)
+            for key, value in vars(args).items()
+            if key not in ("output", "compare", "tolerance")
+        },
+        **results,
+    }
+
+    output_file = args.output or results_dir / (
+        f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    latency = report["file_latency_seconds"]
+    print(f"\n   • Arquivos/min: {report['throughput']['files_per_minute']:,.1f}")
+    print(
+        f"   • Latência por arquivo: p50 {latency['p50']:.3f}s | "
+        f"p95 {latency['p95']:.3f}s | p99 {latency['p99']:.3f}s"
+    )
+    print(
+        f"   • CPU: {report['cpu']['cpu_ms_per_file']:.1f} ms/arquivo | "
+        f"loop {report['cpu']['event_loop_utilization']:.0%} ocupado"
+    )
+    print(f"   • Pico de RSS: {report['memory']['peak_rss_mb']:.1f} MB")
+    print(f"   • Tokens por linha: {report['tokens']['total_tokens_per_line']:.2f}")
+    print(f"\nRelatório salvo em: {output_file}")
+
+    replay_misses = report["detections"]["replay_misses"]
+    if replay_misses:
+        # Resultado degradado: o arquivo não cobre esta configuração
+        print(f"\nREPLAY INCOMPLETO: {replay_misses} chamadas sem resposta gravada")
+        sys.exit(1)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows, regressed = compare_reports(report, baseline, args.tolerance)
+        print(f"\nComparação com {args.compare} ({baseline.get('git_commit')}):")
+        for name, old, new, change, status in rows:
+            print(f"  {name:<40} {old:>12,.3f} -> {new:>12,.3f} ({change:+.1%}) {status}")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Mede a vazão (arquivos/s) da engine estática sobre o dataset."""
+
+import asyncio
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from devtools.settings import configure_settings
+
+configure_settings()
+from core.supervisor import CodeSmellSupervisor
+from core.utils.static_detector import StaticSmellDetector
+
+base_dir = Path(__file__).parent.parent
+results_dir = base_dir / "results"
+ground_truth_file = base_dir / "dataset" / "ground_truth" / "implementation_smells_manual_filtered.csv"
+
+
+def bench_detector(sources, rounds):
+    """Só a detecção pela AST (parse + visitantes)."""
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        for code in sources.values():
+            StaticSmellDetector(code).detect()
+    return time.perf_counter() - start_time
+
+
+async def bench_supervisor(sources, rounds):
+    """Caminho completo do supervisor (validação, metadados, formato de saída)."""
+    supervisor = CodeSmellSupervisor(engine="static")
+    counts = Counter()
+    start_time = time.perf_counter()
+    for round_index in range(rounds):
+        for file_path, code in sources.items():
+            result = await supervisor.analyze_code(code, str(file_path), "Dataset", use_cache=False)
+            if round_index == 0:
+                for smell in result["code_smells"]:
+                    counts[(Path(file_path).stem, smell["Smell"].lower())] += 1
+    return time.perf_counter() - start_time, counts
+
+
+def load_ground_truth():
+    """Contagens do ground truth por (módulo, smell) para os smells estáticos."""
+    if not ground_truth_file.exists():
+        return Counter()
+    counts = Counter()
+    with ground_truth_file.open(encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            counts[(row["Module"], row["Smell"].lower())] += int(row["Count"])
+    return counts
+
+
+def compare_with_ground_truth(static_counts, ground_truth):
+    """Resumo por smell: detectado pela engine estática vs. ground truth."""
+    smells = sorted({smell for _, smell in static_counts} | {smell for _, smell in ground_truth})
+    static_smells = {name.replace("_", " ") for name in StaticSmellDetector.SUPPORTED_AGENTS}
+    summary = {}
+    for smell in smells:
+        if smell not in static_smells:
+            continue
+        summary[smell] = {
+            "static": sum(c for (_, s), c in static_counts.items() if s == smell),
+            "ground_truth": sum(c for (_, s), c in ground_truth.items() if s == smell),
+        }
+    return summary
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    dataset_dir = base_dir / "dataset"
+    py_files = [f for f in dataset_dir.rglob("*.py") if "ground_truth" not in str(f)]
+    sources = {f: f.read_text(encoding="utf-8") for f in py_files}
+    total_lines = sum(code.count("\n") + 1 for code in sources.values())
+    processed = len(sources) * rounds
+
+    print("=" * 80)
+    print("BENCHMARK DA ENGINE ESTÁTICA")
+    print("=" * 80)
+    print(f"Arquivos: {len(sources)} | Linhas: {total_lines:,} | Rodadas: {rounds}")
+
+    detector_seconds = bench_detector(sources, rounds)
+    supervisor_seconds, static_counts = await bench_supervisor(sources, rounds)
+
+    report = {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "total_files": len(sources),
+        "total_lines": total_lines,
+        "rounds": rounds,
+        "detector": {
+            "seconds": round(detector_seconds, 4),
+            "files_per_second": round(processed / detector_seconds, 2),
+            "lines_per_second": round(total_lines * rounds / detector_seconds, 2),
+        },
+        "supervisor": {
+            "seconds": round(supervisor_seconds, 4),
+            "files_per_second": round(processed / supervisor_seconds, 2),
+            "lines_per_second": round(total_lines * rounds / supervisor_seconds, 2),
+        },
+        "detections_vs_ground_truth": compare_with_ground_truth(
+            static_counts, load_ground_truth()
+        ),
+    }
+
+    results_dir.mkdir(exist_ok=True)
+    output_file = results_dir / "static_engine_benchmark.json"
+    output_file.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for name in ("detector", "supervisor"):
+        stats = report[name]
+        print(
+            f"{name:>10}: {stats['files_per_second']:>10,.1f} arquivos/s | "
+            f"{stats['lines_per_second']:>12,.0f} linhas/s"
+        )
+    print("\nDetecções (engine estática vs. ground truth):")
+    for smell, counts in report["detections_vs_ground_truth"].items():
+        print(f"  {smell:<25} {counts['static']:>4} | {counts['ground_truth']:>4}")
+    print(f"\nResultado salvo em: {output_file}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
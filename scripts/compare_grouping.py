@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Compara tokens e latência dos modos de agrupamento contra os 11 agentes."""
+
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from core.supervisor import analyze_code
+from core.supervisor.agent_config import GROUPING_MODES
+
+base_dir = Path(__file__).parent.parent
+results_dir = base_dir / "results"
+
+
+async def run_mode(grouping, prompt_type, py_files):
+    """Executa o dataset com um modo de agrupamento, sem cache."""
+    token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    latencies = []
+    smells = 0
+
+    for i, file_path in enumerate(py_files, 1):
+        print(f"[{grouping}] [{i}/{len(py_files)}] {file_path.name}...", end=" ")
+        code = file_path.read_text(encoding="utf-8")
+
+        start_time = time.time()
+        result = await analyze_code(
+            code,
+            str(file_path),
+            "Dataset",
+            parallel=True,
+            prompt_type=prompt_type,
+            use_cache=False,
+            grouping=grouping,
+        )
+        latencies.append(time.time() - start_time)
+
+        usage = result.get("token_usage", {})
+        for key in token_usage:
+            token_usage[key] += usage.get(key, 0)
+        smells += result["total_smells_detected"]
+        print(f"✓ ({result['total_smells_detected']} smells, {latencies[-1]:.1f}s)")
+
+    return {
+        "grouping": grouping,
+        "total_smells_detected": smells,
+        "token_usage": token_usage,
+        "total_latency_seconds": round(sum(latencies), 2),
+        "average_latency_seconds": round(sum(latencies) / len(latencies), 2)
+        if latencies
+        else 0,
+    }
+
+
+def add_savings(report, baseline):
+    """Adiciona economia relativa ao baseline de 11 agentes."""
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        base = baseline["token_usage"][key]
+        saved = base - report["token_usage"][key]
+        report[f"{key}_saved"] = saved
+        report[f"{key}_saved_pct"] = round(saved / base * 100, 2) if base else 0
+
+    base_latency = baseline["total_latency_seconds"]
+    saved_latency = base_latency - report["total_latency_seconds"]
+    report["latency_saved_seconds"] = round(saved_latency, 2)
+    report["latency_saved_pct"] = (
+        round(saved_latency / base_latency * 100, 2) if base_latency else 0
+    )
+
+
+async def main():
+    prompt_type = sys.argv[1] if len(sys.argv) > 1 else "complete"
+    modes = sys.argv[2:] or list(GROUPING_MODES)
+    if "none" not in modes:
+        modes.insert(0, "none")
+
+    dataset_dir = base_dir / "dataset"
+    py_files = [f for f in dataset_dir.rglob("*.py") if "ground_truth" not in str(f)]
+
+    print("=" * 80)
+    print(f"COMPARAÇÃO DE AGRUPAMENTO - prompts {prompt_type}")
+    print("=" * 80)
+    print(f"Modos: {', '.join(modes)} | Arquivos: {len(py_files)}")
+
+    reports = {}
+    for grouping in modes:
+        reports[grouping] = await run_mode(grouping, prompt_type, py_files)
+
+    for grouping, report in reports.items():
+        if grouping != "none":
+            add_savings(report, reports["none"])
+
+    output = {
+        "prompt_type": prompt_type,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "total_files_analyzed": len(py_files),
+        "modes": reports,
+    }
+    output_file = results_dir / f"grouping_comparison_{prompt_type}.json"
+    output_file.write_text(
+        json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+
+    print("\n" + "=" * 80)
+    for grouping, report in reports.items():
+        line = (
+            f"{grouping:>9}: {report['token_usage']['total_tokens']:>10,} tokens | "
+            f"{report['total_latency_seconds']:>8.1f}s | "
+            f"{report['total_smells_detected']} smells"
+        )
+        if grouping != "none":
+            line += (
+                f" | economia: {report['prompt_tokens_saved_pct']}% prompt tokens, "
+                f"{report['latency_saved_pct']}% latência"
+            )
+        print(line)
+    print(f"\nResultado salvo em: {output_file}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
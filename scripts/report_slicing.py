@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Estima a redução de tokens de entrada por agente com o recorte de código."""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from devtools.settings import configure_settings
+
+configure_settings()
+from core.supervisor import CodeSmellSupervisor
+from core.utils.token_estimator import estimate_tokens
+
+base_dir = Path(__file__).parent.parent
+results_dir = base_dir / "results"
+
+
+def prompt_tokens(supervisor, config, numbered_code):
+    """Tokens estimados das mensagens completas enviadas ao agente."""
+    return estimate_tokens(
+        supervisor._messages_text(supervisor._build_messages(config, numbered_code))
+    )
+
+
+def main():
+    prompt_type = sys.argv[1] if len(sys.argv) > 1 else "complete"
+    supervisor = CodeSmellSupervisor(prompt_type=prompt_type)
+
+    dataset_dir = base_dir / "dataset"
+    py_files = sorted(f for f in dataset_dir.rglob("*.py") if "ground_truth" not in str(f))
+
+    agents = {
+        name: {"full_prompt_tokens": 0, "sliced_prompt_tokens": 0, "skipped_calls": 0}
+        for name in supervisor.agent_configs
+    }
+    files = {}
+
+    for file_path in py_files:
+        code = file_path.read_text(encoding="utf-8")
+        full_numbered = supervisor._format_code_with_line_numbers(code)
+        configs, inputs = supervisor._slice_inputs(code, supervisor.agent_configs)
+
+        file_full = file_sliced = 0
+        for name, config in supervisor.agent_configs.items():
+            full = prompt_tokens(supervisor, config, full_numbered)
+            sliced = prompt_tokens(supervisor, config, inputs[name]) if name in configs else 0
+            agents[name]["full_prompt_tokens"] += full
+            agents[name]["sliced_prompt_tokens"] += sliced
+            agents[name]["skipped_calls"] += name not in configs
+            file_full += full
+            file_sliced += sliced
+
+        files[str(file_path.relative_to(base_dir))] = {
+            "lines": code.count("\n") + 1,
+            "full_prompt_tokens": file_full,
+            "sliced_prompt_tokens": file_sliced,
+        }
+
+    for stats in list(agents.values()) + list(files.values()):
+        full = stats["full_prompt_tokens"]
+        stats["reduction_pct"] = (
+            round((full - stats["sliced_prompt_tokens"]) / full * 100, 2) if full else 0.0
+        )
+
+    total_full = sum(a["full_prompt_tokens"] for a in agents.values())
+    total_sliced = sum(a["sliced_prompt_tokens"] for a in agents.values())
+    output = {
+        "prompt_type": prompt_type,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "total_files_analyzed": len(py_files),
+        "full_prompt_tokens": total_full,
+        "sliced_prompt_tokens": total_sliced,
+        "reduction_pct": round((total_full - total_sliced) / total_full * 100, 2) if total_full else 0.0,
+        "agents": agents,
+        "files": files,
+    }
+
+    results_dir.mkdir(exist_ok=True)
+    output_file = results_dir / f"slicing_reduction_{prompt_type}.json"
+    output_file.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print("=" * 80)
+    print(f"REDUÇÃO DE TOKENS COM RECORTE - prompts {prompt_type} ({len(py_files)} arquivos)")
+    print("=" * 80)
+    for name, stats in agents.items():
+        print(
+            f"{name:>22}: {stats['full_prompt_tokens']:>9,} -> {stats['sliced_prompt_tokens']:>9,} "
+            f"tokens ({stats['reduction_pct']:>6.2f}%) | chamadas puladas: {stats['skipped_calls']}"
+        )
+    print(
+        f"\n{'total':>22}: {total_full:>9,} -> {total_sliced:>9,} tokens "
+        f"({output['reduction_pct']:.2f}%)"
+    )
+    print(f"\nResultado salvo em: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
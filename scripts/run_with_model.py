@@ -5,47 +5,56 @@ import asyncio
 import json
 import sys
 import time
-import os
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-# Configurações de modelos disponíveis
-MODELS = {
-    "claude-sonnet": {
-        "id": "anthropic/claude-sonnet-4",
-        "company": "anthropic",
-        "name": "claude-sonnet-4.5",
-        "input_price": 3.00 / 1_000_000,  # $3/M
-        "output_price": 15.00 / 1_000_000,  # $15/M
-    },
-    "gpt-4o-mini": {
-        "id": "openai/gpt-4o-mini",
-        "company": "openai",
-        "name": "gpt-4o-mini",
-        "input_price": 0.15 / 1_000_000,  # $0.15/M
-        "output_price": 0.60 / 1_000_000,  # $0.60/M
-    },
-    "deepseek-v3": {
-        "id": "deepseek/deepseek-v3.2",
-        "company": "deepseek",
-        "name": "deepseek-v3.2",
-        "input_price": 0.224 / 1_000_000,  # $0.224/M
-        "output_price": 0.32 / 1_000_000,  # $0.32/M
-    },
-}
-
-
-def calculate_cost(prompt_tokens, completion_tokens, model_config):
-    return (
-        prompt_tokens * model_config["input_price"]
-        + completion_tokens * model_config["output_price"]
+from config.models import MODELS, calculate_cost
+
+
+def print_estimate(model_config: dict, prompt_type: str, py_files: list, results_root: Path):
+    """Dry-run: estimativa de tokens e custo por arquivo e total, sem chamar o modelo."""
+    from core.supervisor import get_supervisor
+    from core.utils.cost_estimator import CostEstimator
+
+    started = time.perf_counter()
+    files = [(str(f), f.read_text(encoding="utf-8")) for f in py_files]
+    supervisor = get_supervisor(prompt_type=prompt_type)
+    estimator = CostEstimator(model_config["id"], prompt_type, results_root)
+    estimate = estimator.estimate(supervisor.estimate_files(files))
+    elapsed = time.perf_counter() - started
+
+    for item in estimate["files"]:
+        if "error" in item:
+            print(f"   {Path(item['file_path']).name}: ignorado ({item['error']})")
+            continue
+        print(
+            f"   {Path(item['file_path']).name}: {item['llm_calls']} chamadas | "
+            f"{item['prompt_tokens']:,} + {item['completion_tokens']:,} tokens | "
+            f"${item['cost_usd']:.4f}"
+        )
+
+    total = estimate["total"]
+    source = estimate["completion_ratio_source"]
+    print("\n" + "=" * 80)
+    print("ESTIMATIVA (dry-run)")
+    print("=" * 80)
+    print(f"Arquivos: {total['files']} ({total['skipped_files']} ignorados)")
+    print(f"Chamadas LLM: {total['llm_calls']:,}")
+    print(f"Tokens de entrada: {total['prompt_tokens']:,}")
+    print(
+        f"Tokens de saída: {total['completion_tokens']:,} "
+        f"(razão {estimate['completion_ratio']:.4f}, histórico: {source['match']}, "
+        f"{len(source.get('runs', []))} execuções)"
     )
+    print(f"Custo estimado: ${total['cost_usd']:.4f}")
+    print(f"Estimativa calculada em {elapsed:.2f}s")
+    return estimate
 
 
-async def run_analysis(model_key: str, prompt_type: str = "complete"):
-    """Executa análise com o modelo especificado."""
+async def run_analysis(model_key: str, prompt_type: str = "complete", dry_run: bool = False):
+    """Executa análise com o modelo especificado (ou só estima o custo, com dry_run)."""
     
     if model_key not in MODELS:
         print(f"Modelo '{model_key}' não encontrado!")
@@ -53,15 +62,7 @@ async def run_analysis(model_key: str, prompt_type: str = "complete"):
         sys.exit(1)
     
     model_config = MODELS[model_key]
-    
-    # Configurar variável de ambiente ANTES de importar settings
-    os.environ["OPENROUTER_API_MODEL"] = model_config["id"]
-    
-    # Importar após configurar a variável de ambiente
-    from config.settings import settings
-    # Sobrescrever o modelo no settings já carregado
-    settings.__dict__["OPENROUTER_API_MODEL"] = model_config["id"]
-    
+
     from core.supervisor import analyze_code
     
     base_dir = Path(__file__).parent.parent
@@ -79,6 +80,10 @@ async def run_analysis(model_key: str, prompt_type: str = "complete"):
     print(f"Prompt: {prompt_type}")
     print("=" * 80)
     print(f"\nEncontrados {len(py_files)} arquivos Python")
+
+    if dry_run:
+        return print_estimate(model_config, prompt_type, py_files, base_dir / "results")
+
     print(f"Resultados serão salvos em: {results_dir}")
     print("\nIniciando em 3 segundos...")
     time.sleep(3)
@@ -95,7 +100,12 @@ async def run_analysis(model_key: str, prompt_type: str = "complete"):
             start_time = time.time()
 
             result = await analyze_code(
-                code, str(file_path), "Dataset", parallel=True, prompt_type=prompt_type
+                code,
+                str(file_path),
+                "Dataset",
+                parallel=True,
+                prompt_type=prompt_type,
+                model=model_config["id"],
             )
 
             execution_time = time.time() - start_time
@@ -181,14 +191,18 @@ async def run_analysis(model_key: str, prompt_type: str = "complete"):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Uso: python run_with_model.py <modelo> [prompt_type]")
+    dry_run = "--dry-run" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--dry-run"]
+
+    if not args:
+        print("Uso: python run_with_model.py <modelo> [prompt_type] [--dry-run]")
         print(f"Modelos disponíveis: {', '.join(MODELS.keys())}")
         print("Tipos de prompt: complete (padrão), simple")
+        print("--dry-run: só estima tokens e custo, sem chamar o modelo")
         sys.exit(1)
     
-    model = sys.argv[1]
-    prompt_type = sys.argv[2] if len(sys.argv) > 2 else "complete"
+    model = args[0]
+    prompt_type = args[1] if len(args) > 1 else "complete"
     
-    asyncio.run(run_analysis(model, prompt_type))
+    asyncio.run(run_analysis(model, prompt_type, dry_run))
 
@@ -1,14 +1,30 @@
 """API FastAPI para detecção de code smells."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.routes import analysis
+from api.routes import analysis, estimate, jobs, metrics
+from core.jobs import job_manager
+from core.supervisor import supervisor_registry
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Mantém supervisores, pool HTTP e workers de jobs durante a vida do processo."""
+    await supervisor_registry.start()
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    await supervisor_registry.stop()
+
 
 app = FastAPI(
     title="Multi-Agent Code Smell Detector",
     description="Detecção de code smells usando LLMs",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,6 +36,9 @@ app.add_middleware(
 )
 
 app.include_router(analysis.router)
+app.include_router(estimate.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
 
 
 if __name__ == "__main__":
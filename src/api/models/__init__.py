@@ -1,6 +1,23 @@
 """Modelos da API."""
 
-from .requests import AnalyzeRequest
-from .responses import AnalyzeResponse
+from .requests import AnalyzeRequest, BatchRequest, EstimateRequest, JobRequest, SourceFile
+from .responses import (
+    AnalyzeResponse,
+    BatchResponse,
+    EstimateResponse,
+    JobResponse,
+    JobSubmitResponse,
+)
 
-__all__ = ["AnalyzeRequest", "AnalyzeResponse"]
+__all__ = [
+    "AnalyzeRequest",
+    "AnalyzeResponse",
+    "BatchRequest",
+    "BatchResponse",
+    "EstimateRequest",
+    "EstimateResponse",
+    "JobRequest",
+    "JobResponse",
+    "JobSubmitResponse",
+    "SourceFile",
+]
@@ -9,3 +9,71 @@ class AnalyzeRequest(BaseModel):
     python_code: str
     file_path: Optional[str] = None
     project_name: str = "Code"
+    use_cache: bool = True
+    grouping: str = "none"
+    layout: str = "prompt_first"
+    chunked: bool = False
+    gating: bool = False
+    engine: str = "llm"
+    hedging: bool = False
+    slicing: bool = False
+    incremental_key: Optional[str] = None
+    deadline_seconds: Optional[float] = None
+
+
+class SourceFile(BaseModel):
+    """Arquivo enviado em um job ou batch."""
+    file_path: str
+    python_code: str
+
+
+class JobRequest(BaseModel):
+    """Request para análise assíncrona de vários arquivos.
+
+    Informe ``files`` ou ``project_dir`` (diretório relativo a
+    JOBS_PROJECT_ROOT no servidor, cujos arquivos .py são lidos
+    recursivamente).
+    """
+    files: list[SourceFile] = []
+    project_dir: Optional[str] = None
+    project_name: str = "Code"
+    use_cache: bool = True
+    grouping: str = "none"
+    layout: str = "prompt_first"
+    chunked: bool = False
+    gating: bool = False
+    engine: str = "llm"
+    hedging: bool = False
+    slicing: bool = False
+    incremental_key: Optional[str] = None
+    # Orçamento próprio do job (além do orçamento do processo)
+    budget_usd: Optional[float] = None
+    budget_tokens: Optional[int] = None
+
+
+class BatchRequest(BaseModel):
+    """Request para análise síncrona de vários arquivos com empacotamento."""
+    files: list[SourceFile]
+    project_name: str = "Code"
+    use_cache: bool = True
+    grouping: str = "none"
+    layout: str = "prompt_first"
+    gating: bool = False
+    engine: str = "llm"
+    hedging: bool = False
+    max_pack_tokens: Optional[int] = None
+
+
+class EstimateRequest(BaseModel):
+    """Request para estimar tokens e custo de uma análise sem executá-la.
+
+    ``model`` (chave curta ou id do OpenRouter) define os preços, por padrão
+    o modelo configurado.
+    """
+    files: list[SourceFile]
+    model: Optional[str] = None
+    prompt_type: str = "simple"
+    grouping: str = "none"
+    chunked: bool = False
+    gating: bool = False
+    engine: str = "llm"
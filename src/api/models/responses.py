@@ -1,5 +1,6 @@
 """Modelos de resposta da API."""
 
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -8,3 +9,68 @@ class AnalyzeResponse(BaseModel):
     total_smells_detected: int
     code_smells: list[dict]
     agents_executed: int
+    token_usage: Optional[dict] = None
+    prompt_cache: Optional[dict] = None
+    cache: Optional[dict] = None
+    grouping: Optional[dict] = None
+    chunks: Optional[int] = None
+    gating: Optional[dict] = None
+    engine: Optional[dict] = None
+    slicing: Optional[dict] = None
+    incremental: Optional[dict] = None
+    agent_calls: Optional[dict] = None
+    hedging: Optional[dict] = None
+    output_budget: Optional[dict] = None
+    budget: Optional[dict] = None
+    incomplete_agents: list[str] = []
+
+
+class JobSubmitResponse(BaseModel):
+    """Response da submissão de um job."""
+    job_id: str
+    status: str
+    total_files: int
+    deduplicated: bool
+    # Arquivos de project_dir não lidos (não UTF-8 ou fora de JOBS_PROJECT_ROOT)
+    skipped_files: list[str] = []
+
+
+class JobResponse(BaseModel):
+    """Estado de um job com resultados parciais."""
+    job_id: str
+    status: str
+    project_name: str
+    options: dict
+    progress: dict
+    total_smells_detected: int
+    token_usage: dict
+    cost_usd: Optional[float] = None
+    budget: Optional[dict] = None
+    files: list[dict]
+    created_at: float
+    updated_at: float
+
+
+class BatchResponse(BaseModel):
+    """Response com code smells por arquivo e economia do empacotamento."""
+    total_smells_detected: int
+    files: list[dict]
+    agents_executed: int
+    token_usage: Optional[dict] = None
+    prompt_cache: Optional[dict] = None
+    cache: Optional[dict] = None
+    packing: Optional[dict] = None
+    gating: Optional[dict] = None
+    agent_calls: Optional[dict] = None
+    hedging: Optional[dict] = None
+    budget: Optional[dict] = None
+
+
+class EstimateResponse(BaseModel):
+    """Estimativa de tokens e custo por arquivo e total."""
+    model: str
+    pricing: Optional[dict] = None
+    completion_ratio: float
+    completion_ratio_source: dict
+    files: list[dict]
+    total: dict
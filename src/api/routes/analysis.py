@@ -1,27 +1,86 @@
 """Endpoints de análise de código."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from typing import Any, Awaitable, Literal, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from config.logs import logger
-from core.supervisor import analyze_code
-from api.models import AnalyzeRequest, AnalyzeResponse
+from core.supervisor import analyze_batch, analyze_code, analyze_code_stream
+from core.utils.metrics import metrics
+from api.models import AnalyzeRequest, AnalyzeResponse, BatchRequest, BatchResponse
+
+STREAM_MEDIA_TYPES = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+
+# Intervalo de verificação de desconexão do cliente durante a análise
+DISCONNECT_POLL_SECONDS = 0.5
 
 router = APIRouter(prefix="/api", tags=["analysis"])
 
 
+def _resolve_deadline(
+    request: AnalyzeRequest, header_deadline: Optional[float]
+) -> Optional[float]:
+    """Prazo da análise: o menor entre o corpo e o cabeçalho X-Deadline-Seconds."""
+    deadlines = [d for d in (request.deadline_seconds, header_deadline) if d is not None]
+    if any(d <= 0 for d in deadlines):
+        raise HTTPException(status_code=400, detail="deadline_seconds deve ser positivo")
+    return min(deadlines) if deadlines else None
+
+
+async def _run_until_disconnect(http_request: Request, work: Awaitable[Any]) -> Any:
+    """Executa a análise, cancelando-a se o cliente desconectar antes do fim."""
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                logger.warning("Cliente desconectou: análise cancelada")
+                metrics.increment("api.cancelled_on_disconnect")
+                raise HTTPException(status_code=499, detail="Cliente desconectou")
+    finally:
+        task.cancel()
+
+
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze(request: AnalyzeRequest) -> AnalyzeResponse:
-    """Analisa código Python e retorna code smells."""
+async def analyze(
+    request: AnalyzeRequest,
+    http_request: Request,
+    x_deadline_seconds: Optional[float] = Header(default=None),
+) -> AnalyzeResponse:
+    """Analisa código Python e retorna code smells.
+
+    O prazo pode vir em ``deadline_seconds`` ou no cabeçalho
+    ``X-Deadline-Seconds``; agentes não concluídos no prazo são cancelados e
+    listados em ``incomplete_agents``. Se o cliente desconectar, as chamadas
+    em andamento são canceladas.
+    """
     try:
         if not request.python_code.strip():
             raise HTTPException(status_code=400, detail="Código vazio")
+        deadline_seconds = _resolve_deadline(request, x_deadline_seconds)
 
-        result = await analyze_code(
+        analysis = analyze_code(
             python_code=request.python_code,
             file_path=request.file_path or "unknown.py",
             project_name=request.project_name,
-            parallel=True
+            parallel=True,
+            use_cache=request.use_cache,
+            grouping=request.grouping,
+            layout=request.layout,
+            chunked=request.chunked,
+            gating=request.gating,
+            engine=request.engine,
+            hedging=request.hedging,
+            slicing=request.slicing,
+            incremental_key=request.incremental_key,
+            deadline_seconds=deadline_seconds,
         )
+        result = await _run_until_disconnect(http_request, analysis)
 
         logger.info("Análise concluída: %s smells", result["total_smells_detected"])
 
@@ -29,6 +88,20 @@ async def analyze(request: AnalyzeRequest) -> AnalyzeResponse:
             total_smells_detected=result["total_smells_detected"],
             code_smells=result["code_smells"],
             agents_executed=result["agents_executed"],
+            token_usage=result.get("token_usage"),
+            prompt_cache=result.get("prompt_cache"),
+            cache=result.get("cache"),
+            grouping=result.get("grouping"),
+            chunks=result.get("chunks"),
+            gating=result.get("gating"),
+            engine=result.get("engine"),
+            slicing=result.get("slicing"),
+            incremental=result.get("incremental"),
+            agent_calls=result.get("agent_calls"),
+            hedging=result.get("hedging"),
+            output_budget=result.get("output_budget"),
+            budget=result.get("budget"),
+            incomplete_agents=result.get("incomplete_agents", []),
         )
 
     except HTTPException:
@@ -40,3 +113,88 @@ async def analyze(request: AnalyzeRequest) -> AnalyzeResponse:
         # Catch-all necessário para erros inesperados do supervisor/LLM
         logger.error("Erro inesperado: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
+@router.post("/analyze/batch", response_model=BatchResponse)
+async def analyze_batch_files(request: BatchRequest) -> BatchResponse:
+    """Analisa vários arquivos, empacotando os pequenos na mesma chamada de agente."""
+    files = [(f.file_path, f.python_code) for f in request.files if f.python_code.strip()]
+    if not files:
+        raise HTTPException(status_code=400, detail="Nenhum arquivo com código")
+
+    try:
+        result = await analyze_batch(
+            files,
+            project_name=request.project_name,
+            parallel=True,
+            use_cache=request.use_cache,
+            grouping=request.grouping,
+            layout=request.layout,
+            gating=request.gating,
+            engine=request.engine,
+            hedging=request.hedging,
+            max_pack_tokens=request.max_pack_tokens,
+        )
+    except (ValueError, KeyError, AttributeError) as e:
+        logger.error("Erro de validação no batch: %s", e, exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Erro de validação: {str(e)}")
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error("Erro inesperado no batch: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+    logger.info(
+        "Batch concluído: %s arquivos, %s smells",
+        len(files),
+        result["total_smells_detected"],
+    )
+    return BatchResponse(**result)
+
+
+def _format_event(event: dict, stream_format: str) -> str:
+    """Serializa um evento como SSE ou como uma linha NDJSON."""
+    data = json.dumps(event, ensure_ascii=False)
+    if stream_format == "ndjson":
+        return f"{data}\n"
+    return f"event: {event['event']}\ndata: {data}\n\n"
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    request: AnalyzeRequest,
+    format: Literal["sse", "ndjson"] = "sse",  # pylint: disable=redefined-builtin
+    x_deadline_seconds: Optional[float] = Header(default=None),
+) -> StreamingResponse:
+    """Analisa código Python emitindo as detecções de cada agente assim que ele termina."""
+    if not request.python_code.strip():
+        raise HTTPException(status_code=400, detail="Código vazio")
+    deadline_seconds = _resolve_deadline(request, x_deadline_seconds)
+    if request.chunked or request.incremental_key:
+        raise HTTPException(
+            status_code=400,
+            detail="chunked e incremental_key não são suportados no streaming",
+        )
+
+    async def events():
+        try:
+            async for event in analyze_code_stream(
+                python_code=request.python_code,
+                file_path=request.file_path or "unknown.py",
+                project_name=request.project_name,
+                use_cache=request.use_cache,
+                grouping=request.grouping,
+                layout=request.layout,
+                gating=request.gating,
+                engine=request.engine,
+                hedging=request.hedging,
+                slicing=request.slicing,
+                deadline_seconds=deadline_seconds,
+            ):
+                yield _format_event(event, format)
+        except (ValueError, KeyError, AttributeError) as e:
+            logger.error("Erro de validação no streaming: %s", e, exc_info=True)
+            yield _format_event({"event": "error", "error": f"Erro de validação: {e}"}, format)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Erro inesperado no streaming: %s", e, exc_info=True)
+            yield _format_event({"event": "error", "error": f"Erro interno: {e}"}, format)
+
+    return StreamingResponse(events(), media_type=STREAM_MEDIA_TYPES[format])
@@ -0,0 +1,47 @@
+"""Endpoint de estimativa de tokens e custo (sem chamar o modelo)."""
+
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+
+from config.logs import logger
+from config.settings import settings
+from core.supervisor import get_supervisor
+from core.utils.cost_estimator import CostEstimator
+from api.models import EstimateRequest, EstimateResponse
+
+router = APIRouter(prefix="/api", tags=["estimate"])
+
+
+@router.post("/estimate", response_model=EstimateResponse)
+async def estimate(request: EstimateRequest) -> EstimateResponse:
+    """Estima chamadas, tokens e custo por arquivo sem chamar o modelo.
+
+    Os tokens de entrada vêm da montagem local dos prompts; os de saída, da
+    razão saída/entrada das execuções em ``TOKEN_USAGE_HISTORY_DIR``.
+    """
+    files = [(f.file_path, f.python_code) for f in request.files if f.python_code.strip()]
+    if not files:
+        raise HTTPException(status_code=400, detail="Nenhum arquivo com código")
+
+    try:
+        supervisor = get_supervisor(
+            prompt_type=request.prompt_type, grouping=request.grouping, engine=request.engine
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    estimator = CostEstimator(
+        request.model or settings.OPENROUTER_API_MODEL,
+        request.prompt_type,
+        Path(settings.TOKEN_USAGE_HISTORY_DIR),
+    )
+    result = estimator.estimate(
+        supervisor.estimate_files(files, gating=request.gating, chunked=request.chunked)
+    )
+    logger.info(
+        "Estimativa: %s arquivos | %s tokens | $%s",
+        len(files),
+        result["total"]["total_tokens"],
+        result["total"]["cost_usd"],
+    )
+    return EstimateResponse(**result)
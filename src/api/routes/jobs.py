@@ -0,0 +1,98 @@
+"""Endpoints de jobs assíncronos de análise."""
+
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from config.logs import logger
+from config.settings import settings
+from core.jobs import job_manager
+from core.supervisor import validate_options
+from api.models import JobRequest, JobResponse, JobSubmitResponse
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+def _read_project_dir(project_dir: str) -> tuple[list[tuple[str, str]], list[str]]:
+    """Arquivos .py de ``project_dir`` (relativo a JOBS_PROJECT_ROOT) e os não lidos.
+
+    Bloqueante: chamado fora do event loop (run_in_threadpool).
+    """
+    if not settings.JOBS_PROJECT_ROOT:
+        raise HTTPException(
+            status_code=400, detail="project_dir desabilitado (configure JOBS_PROJECT_ROOT)"
+        )
+    root = Path(settings.JOBS_PROJECT_ROOT).resolve()
+    directory = (root / project_dir).resolve()
+    if not directory.is_relative_to(root):
+        raise HTTPException(status_code=400, detail="project_dir fora de JOBS_PROJECT_ROOT")
+    if not directory.is_dir():
+        raise HTTPException(status_code=400, detail=f"Diretório não encontrado: {project_dir}")
+
+    files, skipped = [], []
+    for py_file in sorted(directory.rglob("*.py")):
+        file_path = str(py_file.relative_to(directory))
+        # Links simbólicos podem apontar para fora da raiz
+        if not py_file.resolve().is_relative_to(root):
+            skipped.append(file_path)
+            continue
+        try:
+            files.append((file_path, py_file.read_text(encoding="utf-8")))
+        except (UnicodeDecodeError, OSError) as e:
+            logger.warning("Arquivo ignorado em %s: %s (%s)", project_dir, file_path, e)
+            skipped.append(file_path)
+    return files, skipped
+
+
+async def _collect_files(request: JobRequest) -> tuple[list[tuple[str, str]], list[str]]:
+    """Arquivos do job (enviados no corpo ou lidos de ``project_dir``) e os ignorados."""
+    files = [(f.file_path, f.python_code) for f in request.files]
+    skipped = []
+    if request.project_dir:
+        project_files, skipped = await run_in_threadpool(_read_project_dir, request.project_dir)
+        files.extend(project_files)
+    return [(file_path, code) for file_path, code in files if code.strip()], skipped
+
+
+def _validate_options(request: JobRequest) -> None:
+    """Rejeita na submissão opções que só falhariam depois, no worker."""
+    if (request.budget_usd is not None and request.budget_usd < 0) or (
+        request.budget_tokens is not None and request.budget_tokens < 0
+    ):
+        raise HTTPException(status_code=400, detail="Orçamento do job deve ser positivo")
+    try:
+        validate_options(grouping=request.grouping, layout=request.layout, engine=request.engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(request: JobRequest) -> JobSubmitResponse:
+    """Enfileira a análise de vários arquivos e retorna o id do job."""
+    _validate_options(request)
+    files, skipped = await _collect_files(request)
+    if not files:
+        raise HTTPException(status_code=400, detail="Nenhum arquivo com código")
+
+    options = request.model_dump(exclude={"files", "project_dir", "project_name"})
+    job_id, deduplicated = job_manager.submit(files, request.project_name, options)
+    status = job_manager.get_status(job_id, include_results=False)
+
+    logger.info("Job %s recebido: %s arquivos (%s ignorados)", job_id, len(files), len(skipped))
+    return JobSubmitResponse(
+        job_id=job_id,
+        status=status["status"],
+        total_files=status["progress"]["total_files"],
+        deduplicated=deduplicated,
+        skipped_files=skipped,
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, include_results: bool = True) -> JobResponse:
+    """Retorna progresso, resultados parciais, uso de tokens e custo do job."""
+    status = job_manager.get_status(job_id, include_results=include_results)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return JobResponse(**status)
@@ -0,0 +1,25 @@
+"""Endpoint de métricas do processo."""
+
+from fastapi import APIRouter
+
+from core.supervisor.budget import get_budget_governor
+from core.supervisor.hedging import get_hedge_policy
+from core.supervisor.output_budget import get_output_budget
+from core.supervisor.rate_limiter import get_rate_limiter_stats
+from core.utils.metrics import metrics
+from core.utils.response_cache import get_response_cache
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict:
+    """Retorna métricas de agendamento, cache e latência do processo."""
+    return {
+        "metrics": metrics.snapshot(),
+        "rate_limiters": get_rate_limiter_stats(),
+        "hedging": get_hedge_policy().stats(),
+        "output_budget": get_output_budget().stats(),
+        "budget": get_budget_governor().stats(),
+        "response_cache": get_response_cache().stats(),
+    }
@@ -0,0 +1,46 @@
+"""Modelos LLM conhecidos e seus preços."""
+
+from typing import Dict, Optional
+
+# Configurações de modelos disponíveis
+MODELS = {
+    "claude-sonnet": {
+        "id": "anthropic/claude-sonnet-4",
+        "company": "anthropic",
+        "name": "claude-sonnet-4.5",
+        "input_price": 3.00 / 1_000_000,  # $3/M
+        "output_price": 15.00 / 1_000_000,  # $15/M
+    },
+    "gpt-4o-mini": {
+        "id": "openai/gpt-4o-mini",
+        "company": "openai",
+        "name": "gpt-4o-mini",
+        "input_price": 0.15 / 1_000_000,  # $0.15/M
+        "output_price": 0.60 / 1_000_000,  # $0.60/M
+    },
+    "deepseek-v3": {
+        "id": "deepseek/deepseek-v3.2",
+        "company": "deepseek",
+        "name": "deepseek-v3.2",
+        "input_price": 0.224 / 1_000_000,  # $0.224/M
+        "output_price": 0.32 / 1_000_000,  # $0.32/M
+    },
+}
+
+
+def get_model_config(model: str) -> Optional[Dict]:
+    """Busca a configuração pela chave curta ou pelo id do OpenRouter."""
+    if model in MODELS:
+        return MODELS[model]
+    for config in MODELS.values():
+        if config["id"] == model:
+            return config
+    return None
+
+
+def calculate_cost(prompt_tokens, completion_tokens, model_config):
+    """Calcula custo em USD baseado no uso de tokens."""
+    return (
+        prompt_tokens * model_config["input_price"]
+        + completion_tokens * model_config["output_price"]
+    )
@@ -12,5 +12,94 @@ class Settings(BaseSettings):
     OPENROUTER_BASE_URL: str
     OPENROUTER_API_MODEL: str
 
+    # Cache de respostas dos agentes
+    RESPONSE_CACHE_DIR: str = ".cache/responses"
+    RESPONSE_CACHE_MAX_SIZE_MB: float = 512
+    RESPONSE_CACHE_MAX_AGE_HOURS: float = 24 * 7
+
+    # Limites de requisições ao provedor (por modelo, compartilhados no processo)
+    RATE_LIMIT_RPM: int = 300
+    RATE_LIMIT_TPM: int = 2_000_000
+    RATE_LIMIT_MAX_CONCURRENCY: int = 32
+    RATE_LIMIT_MIN_CONCURRENCY: int = 1
+    RATE_LIMIT_TARGET_LATENCY_SECONDS: float = 60.0
+    # Sobrescritas por modelo em JSON, ex: {"openai/gpt-4o-mini": {"requests_per_minute": 500}}
+    RATE_LIMIT_OVERRIDES: dict[str, dict] = {}
+
+    # Novas tentativas de chamadas com falha transitória (429, 5xx, timeout, conexão)
+    RETRY_MAX_ATTEMPTS: int = 4
+    RETRY_BASE_DELAY_SECONDS: float = 1.0
+    RETRY_MAX_DELAY_SECONDS: float = 30.0
+
+    # Hedging: duplica a chamada de um agente que passar do percentil de latência
+    HEDGE_PERCENTILE: float = 95.0
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_MIN_DELAY_SECONDS: float = 2.0
+    # Máximo de hedges em relação às chamadas elegíveis (limita o custo extra)
+    HEDGE_BUDGET_RATIO: float = 0.1
+    # Fração das chamadas com histórico que roda sem hedge (linha de base)
+    HEDGE_CONTROL_RATIO: float = 0.1
+    # Modelo secundário para o hedge (vazio = mesmo modelo)
+    HEDGE_MODEL: str = ""
+
+    # Limite de tokens de saída por chamada de agente
+    OUTPUT_MAX_TOKENS: int = 4096
+    # Orçamento de saída previsto por agente/arquivo a partir dos candidatos
+    # estáticos (literais numéricos, funções com muitos parâmetros...)
+    OUTPUT_BUDGET_ADAPTIVE: bool = False
+    OUTPUT_BUDGET_MIN_TOKENS: int = 512
+    OUTPUT_BUDGET_TOKENS_PER_CANDIDATE: float = 150.0
+    OUTPUT_BUDGET_SAFETY: float = 1.5
+    # Recalibra os tokens por candidato com o histórico do processo; o
+    # max_tokens de uma mesma requisição passa a variar entre execuções
+    OUTPUT_BUDGET_LEARNING: bool = False
+
+    # Lê a resposta dos agentes em streaming e valida cada detecção ao chegar;
+    # respostas cortadas pelo limite de tokens mantêm as detecções completas
+    LLM_STREAMING: bool = True
+    # Níveis de divisão ao meio do código quando um agente passa do limite de saída
+    OVERFLOW_SPLIT_MAX_DEPTH: int = 3
+
+    # Orçamento de custo (USD) e tokens do processo (0 = sem limite). Ao consumir
+    # BUDGET_DEGRADE_RATIO do orçamento as análises passam a usar as opções
+    # BUDGET_DEGRADE_*; esgotado, só a engine estática (sem LLM)
+    BUDGET_MAX_COST_USD: float = 0.0
+    BUDGET_MAX_TOKENS: int = 0
+    BUDGET_DEGRADE_RATIO: float = 0.8
+    BUDGET_DEGRADE_PROMPT_TYPE: str = "simple"
+    BUDGET_DEGRADE_ENGINE: str = "hybrid"
+    # Modelo mais barato ao degradar (vazio = mesmo modelo)
+    BUDGET_DEGRADE_MODEL: str = ""
+
+    # Backend dos agentes: "live" (provedor), "record" (provedor + grava as
+    # respostas em LLM_ARCHIVE_PATH) ou "replay" (reproduz o arquivo, offline)
+    LLM_BACKEND: str = "live"
+    LLM_ARCHIVE_PATH: str = ".cache/llm_archive.jsonl.gz"
+    # Fator aplicado às latências gravadas no replay (0 = sem espera)
+    LLM_REPLAY_LATENCY_SCALE: float = 1.0
+
+    # Pool HTTP compartilhado entre supervisores
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_TIMEOUT_SECONDS: float = 120.0
+
+    # Orçamento de tokens de código por bloco no modo de análise em blocos
+    CHUNK_MAX_TOKENS: int = 4000
+
+    # Orçamento de tokens de código por pacote de arquivos pequenos em /api/analyze/batch
+    BATCH_PACK_MAX_TOKENS: int = 3000
+
+    # Detecções por função/método para reanálise incremental
+    INCREMENTAL_STORE_DIR: str = ".cache/incremental"
+
+    # Resumos token_usage_*.json de execuções passadas (razão saída/entrada em /api/estimate)
+    TOKEN_USAGE_HISTORY_DIR: str = "results"
+
+    # Jobs assíncronos de análise (fila persistente + workers no processo da API)
+    JOBS_DB_PATH: str = ".cache/jobs.sqlite3"
+    JOB_WORKERS: int = 4
+    # Raiz dos diretórios aceitos em project_dir (vazio = project_dir desabilitado)
+    JOBS_PROJECT_ROOT: str = ""
+
 
 settings = Settings()
@@ -0,0 +1,6 @@
+"""Jobs assíncronos de análise com fila persistente."""
+
+from .manager import JobManager, job_manager
+from .store import JobStore
+
+__all__ = ["JobManager", "JobStore", "job_manager"]
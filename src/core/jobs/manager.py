@@ -0,0 +1,219 @@
+"""Fila de jobs de análise e pool de workers assíncronos."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.models import calculate_cost, get_model_config
+from config.settings import settings
+from core.jobs.store import COMPLETED, FAILED, PENDING, RUNNING, JobStore
+from core.supervisor import BudgetGovernor, analyze_code, get_budget_governor
+from core.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens", "cached_prompt_tokens")
+
+
+class JobManager:
+    """Executa jobs de análise em segundo plano.
+
+    Cada arquivo de um job é uma unidade da fila. Um número limitado de
+    workers consome a fila e chama ``analyze_code`` com as opções do job; o
+    resultado de cada arquivo é gravado no ``JobStore`` assim que fica pronto.
+    Ao iniciar, arquivos pendentes ou interrompidos são reenfileirados.
+
+    Jobs com ``budget_usd``/``budget_tokens`` nas opções têm um BudgetGovernor
+    próprio (com o do processo como pai), iniciado com o uso já gravado dos
+    arquivos concluídos, de modo que o limite vale também após um restart.
+    Custo e orçamento usam o modelo gravado em cada resultado. As chamadas
+    ao SQLite feitas pelos workers rodam fora do event loop.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: Optional[int] = None):
+        self.db_path = db_path or settings.JOBS_DB_PATH
+        self.workers = max(1, workers or settings.JOB_WORKERS)
+        self._store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._budgets: Dict[str, BudgetGovernor] = {}
+
+    @property
+    def store(self) -> JobStore:
+        """Store SQLite (aberto sob demanda)."""
+        if self._store is None:
+            self._store = JobStore(self.db_path)
+        return self._store
+
+    async def start(self) -> None:
+        """Cria a fila, retoma trabalho pendente e sobe os workers."""
+        self._queue = asyncio.Queue()
+        recovered = self.store.recover()
+        for item in recovered:
+            self._queue.put_nowait(item)
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        logger.info(
+            "Jobs iniciados: %s workers, %s arquivos retomados", self.workers, len(recovered)
+        )
+
+    async def stop(self) -> None:
+        """Cancela os workers; arquivos em execução são retomados no próximo start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        logger.info("Jobs finalizados")
+
+    def submit(
+        self,
+        files: List[Tuple[str, str]],
+        project_name: str,
+        options: Dict[str, Any],
+    ) -> Tuple[str, bool]:
+        """Registra um job e enfileira seus arquivos pendentes.
+
+        Retorna (job_id, deduplicado). Conteúdo idêntico (arquivos, projeto e
+        opções) reaproveita o job existente.
+        """
+        if self._queue is None:
+            raise RuntimeError("JobManager não iniciado")
+
+        job_id, created = self.store.create(files, project_name, options)
+        pending = self.store.pending_files(job_id)
+        for file_index in pending:
+            self._queue.put_nowait((job_id, file_index))
+
+        metrics.increment("jobs.submitted" if created else "jobs.deduplicated")
+        logger.info(
+            "Job %s %s (%s arquivos enfileirados)",
+            job_id,
+            "criado" if created else "reaproveitado",
+            len(pending),
+        )
+        return job_id, not created
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id, file_index = await self._queue.get()
+            try:
+                await self._run_file(job_id, file_index)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                # Um arquivo com erro não pode derrubar o worker
+                logger.error("Worker %s: erro inesperado em %s: %s", index, job_id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run_file(self, job_id: str, file_index: int) -> None:
+        # claim_file devolve None se o arquivo já foi processado (fila duplicada)
+        item = await asyncio.to_thread(self.store.claim_file, job_id, file_index)
+        if item is None:
+            return
+
+        options = dict(item["options"])
+        budget = await self._budget_for(
+            job_id, options.pop("budget_usd", None), options.pop("budget_tokens", None)
+        )
+        try:
+            result = await analyze_code(
+                python_code=item["code"],
+                file_path=item["file_path"],
+                project_name=item["project_name"],
+                budget=budget,
+                **options,
+            )
+        except asyncio.CancelledError:
+            # Fica como "running" no banco e é retomado no próximo start
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Job %s: falha em %s: %s", job_id, item["file_path"], e)
+            await asyncio.to_thread(self.store.finish_file, job_id, file_index, error=str(e))
+            metrics.increment("jobs.files_failed")
+            return
+
+        await asyncio.to_thread(self.store.finish_file, job_id, file_index, result=result)
+        metrics.increment("jobs.files_completed")
+
+    async def _budget_for(
+        self, job_id: str, max_cost_usd: Optional[float], max_tokens: Optional[int]
+    ) -> Optional[BudgetGovernor]:
+        """Governor do job (None se o job não tem orçamento próprio)."""
+        if not max_cost_usd and not max_tokens:
+            return None
+        if job_id not in self._budgets:
+            usage = await asyncio.to_thread(self.store.usage_by_model, job_id, TOKEN_FIELDS)
+            # Outro worker pode ter criado o governor enquanto o banco era lido
+            if job_id not in self._budgets:
+                governor = BudgetGovernor(
+                    max_cost_usd=max_cost_usd,
+                    max_tokens=max_tokens,
+                    degrade_ratio=settings.BUDGET_DEGRADE_RATIO,
+                    name=f"job.{job_id}",
+                )
+                # Gasto anterior ao restart: conta só no job, o processo é novo
+                for model, token_usage in usage.items():
+                    if token_usage["total_tokens"]:
+                        governor.record(model or settings.OPENROUTER_API_MODEL, token_usage)
+                governor.parent = get_budget_governor()
+                self._budgets[job_id] = governor
+        return self._budgets[job_id]
+
+    def _cost(self, job_id: str) -> Optional[float]:
+        """Custo do job pelo modelo de cada resultado (None se algum não tem preço)."""
+        cost = 0.0
+        for model, token_usage in self.store.usage_by_model(job_id, TOKEN_FIELDS).items():
+            if not token_usage["total_tokens"]:
+                continue
+            model_config = get_model_config(model or settings.OPENROUTER_API_MODEL)
+            if model_config is None:
+                return None
+            cost += calculate_cost(
+                token_usage["prompt_tokens"], token_usage["completion_tokens"], model_config
+            )
+        return cost
+
+    def get_status(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Progresso, resultados parciais, uso de tokens e custo do job."""
+        job = self.store.get(job_id, include_results=include_results)
+        if job is None:
+            return None
+
+        counts = {PENDING: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+        for file in job["files"]:
+            counts[file["status"]] += 1
+        # Totais somados no banco: valem também sem include_results
+        token_usage = self.store.totals(job_id, TOKEN_FIELDS)
+        total_smells = token_usage.pop("total_smells_detected")
+
+        done = counts[COMPLETED] + counts[FAILED]
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "project_name": job["project_name"],
+            "options": job["options"],
+            "progress": {
+                "total_files": job["total_files"],
+                "pending": counts[PENDING],
+                "running": counts[RUNNING],
+                "completed": counts[COMPLETED],
+                "failed": counts[FAILED],
+                "percent": round(100 * done / job["total_files"], 1) if job["total_files"] else 100.0,
+            },
+            "total_smells_detected": total_smells,
+            "token_usage": token_usage,
+            "cost_usd": self._cost(job_id),
+            "budget": self._budgets[job_id].stats() if job_id in self._budgets else None,
+            "files": job["files"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+
+job_manager = JobManager()
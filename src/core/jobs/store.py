@@ -0,0 +1,290 @@
+"""Persistência de jobs de análise em SQLite."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    project_name TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_files INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    file_index INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    code TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, file_index)
+);
+"""
+
+# Estados de um job e de cada arquivo
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class JobStore:
+    """Jobs e resultados por arquivo em um banco SQLite local.
+
+    Todo o estado necessário para retomar um job (código, opções, resultados
+    já obtidos) fica no banco, de modo que o trabalho sobrevive a reinícios
+    do processo. O acesso é serializado por um lock; as operações são
+    pequenas e locais.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def content_hash(
+        files: List[Tuple[str, str]], project_name: str, options: Dict[str, Any]
+    ) -> str:
+        """SHA-256 do conteúdo submetido (arquivos, projeto e opções)."""
+        digest = hashlib.sha256()
+        digest.update(project_name.encode("utf-8"))
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        for file_path, code in sorted(files):
+            digest.update(b"\x00")
+            digest.update(file_path.encode("utf-8"))
+            digest.update(b"\x00")
+            digest.update(code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def create(
+        self, files: List[Tuple[str, str]], project_name: str, options: Dict[str, Any]
+    ) -> Tuple[str, bool]:
+        """Cria o job ou retorna o existente com o mesmo conteúdo.
+
+        Retorna (job_id, criado). Um job repetido que terminou com falhas tem
+        os arquivos que falharam reenfileirados.
+        """
+        content_hash = self.content_hash(files, project_name, options)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE job_files SET status = ?, error = NULL, updated_at = ? "
+                    "WHERE job_id = ? AND status = ?",
+                    (PENDING, now, row["id"], FAILED),
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    (PENDING, now, row["id"], FAILED),
+                )
+                return row["id"], False
+
+            job_id = uuid.uuid4().hex
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    content_hash,
+                    project_name,
+                    json.dumps(options),
+                    PENDING,
+                    len(files),
+                    now,
+                    now,
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_files VALUES (?, ?, ?, ?, ?, NULL, NULL, ?)",
+                [
+                    (job_id, index, file_path, code, PENDING, now)
+                    for index, (file_path, code) in enumerate(files)
+                ],
+            )
+        return job_id, True
+
+    def recover(self) -> List[Tuple[str, int]]:
+        """Devolve à fila arquivos interrompidos e retorna todos os pendentes."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_files SET status = ? WHERE status = ?", (PENDING, RUNNING)
+            )
+            rows = self._conn.execute(
+                "SELECT job_id, file_index FROM job_files WHERE status = ? "
+                "ORDER BY updated_at, job_id, file_index",
+                (PENDING,),
+            ).fetchall()
+        return [(row["job_id"], row["file_index"]) for row in rows]
+
+    def pending_files(self, job_id: str) -> List[int]:
+        """Índices dos arquivos pendentes de um job."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_index FROM job_files WHERE job_id = ? AND status = ? "
+                "ORDER BY file_index",
+                (job_id, PENDING),
+            ).fetchall()
+        return [row["file_index"] for row in rows]
+
+    def claim_file(self, job_id: str, file_index: int) -> Optional[Dict[str, Any]]:
+        """Marca o arquivo como em execução e retorna o que é preciso para analisá-lo."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE job_files SET status = ?, updated_at = ? "
+                "WHERE job_id = ? AND file_index = ? AND status = ?",
+                (RUNNING, now, job_id, file_index, PENDING),
+            )
+            if cursor.rowcount == 0:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, now, job_id),
+            )
+            row = self._conn.execute(
+                "SELECT f.file_path, f.code, j.project_name, j.options "
+                "FROM job_files f JOIN jobs j ON j.id = f.job_id "
+                "WHERE f.job_id = ? AND f.file_index = ?",
+                (job_id, file_index),
+            ).fetchone()
+        return {
+            "file_path": row["file_path"],
+            "code": row["code"],
+            "project_name": row["project_name"],
+            "options": json.loads(row["options"]),
+        }
+
+    def finish_file(
+        self,
+        job_id: str,
+        file_index: int,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Grava o resultado (ou erro) do arquivo e atualiza o estado do job."""
+        now = time.time()
+        status = FAILED if error else COMPLETED
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_files SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE job_id = ? AND file_index = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    error,
+                    now,
+                    job_id,
+                    file_index,
+                ),
+            )
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM job_files WHERE job_id = ? GROUP BY status",
+                    (job_id,),
+                ).fetchall()
+            )
+            if not counts.get(PENDING) and not counts.get(RUNNING):
+                job_status = COMPLETED if counts.get(COMPLETED) else FAILED
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                    (job_status, now, job_id),
+                )
+
+    def totals(self, job_id: str, token_fields: Tuple[str, ...]) -> Dict[str, int]:
+        """Smells e campos de ``token_usage`` somados nos resultados do job.
+
+        A soma é feita no SQLite, sem carregar os resultados (usado também
+        quando o status é consultado sem ``include_results``).
+        """
+        columns = ", ".join(
+            ["SUM(json_extract(result, '$.total_smells_detected'))"]
+            + [f"SUM(json_extract(result, '$.token_usage.{field}'))" for field in token_fields]
+        )
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM job_files WHERE job_id = ? AND result IS NOT NULL",
+                (job_id,),
+            ).fetchone()
+        values = [int(value or 0) for value in row]
+        return {"total_smells_detected": values[0], **dict(zip(token_fields, values[1:]))}
+
+    def usage_by_model(
+        self, job_id: str, token_fields: Tuple[str, ...]
+    ) -> Dict[Optional[str], Dict[str, int]]:
+        """Campos de ``token_usage`` somados por modelo usado (``budget.model``).
+
+        Resultados gravados sem o modelo ficam sob a chave None.
+        """
+        columns = ", ".join(
+            f"SUM(json_extract(result, '$.token_usage.{field}'))" for field in token_fields
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT json_extract(result, '$.budget.model'), {columns} FROM job_files "
+                "WHERE job_id = ? AND result IS NOT NULL GROUP BY 1",
+                (job_id,),
+            ).fetchall()
+        return {
+            row[0]: dict(zip(token_fields, (int(value or 0) for value in row[1:])))
+            for row in rows
+        }
+
+    def get(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Estado do job com os resultados por arquivo já concluídos."""
+        with self._lock:
+            job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            files = self._conn.execute(
+                "SELECT file_index, file_path, status, result, error FROM job_files "
+                "WHERE job_id = ? ORDER BY file_index",
+                (job_id,),
+            ).fetchall()
+
+        return {
+            "id": job["id"],
+            "status": job["status"],
+            "project_name": job["project_name"],
+            "options": json.loads(job["options"]),
+            "total_files": job["total_files"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+            "files": [
+                {
+                    "file_index": row["file_index"],
+                    "file_path": row["file_path"],
+                    "status": row["status"],
+                    "result": (
+                        json.loads(row["result"])
+                        if include_results and row["result"] is not None
+                        else None
+                    ),
+                    "error": row["error"],
+                }
+                for row in files
+            ],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
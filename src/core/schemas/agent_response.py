@@ -50,7 +50,7 @@ class LongMethodDetection(CodeSmellDetection):
 class ComplexConditionalDetection(CodeSmellDetection):
     Smell: str = Field(default="Complex conditional")
     logical_operators: Optional[int] = None
-    threshold: int = Field(default=3)
+    threshold: int = Field(default=2)
 
 
 class LongParameterListDetection(CodeSmellDetection):
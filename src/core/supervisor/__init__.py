@@ -1,5 +1,25 @@
 """Supervisor para coordenação de detecção de code smells."""
 
-from .supervisor import CodeSmellSupervisor, analyze_code, get_supervisor
+from .budget import BudgetGovernor, get_budget_governor
+from .registry import SupervisorRegistry, supervisor_registry
+from .supervisor import (
+    CodeSmellSupervisor,
+    analyze_batch,
+    analyze_code,
+    analyze_code_stream,
+    get_supervisor,
+    validate_options,
+)
 
-__all__ = ["CodeSmellSupervisor", "analyze_code", "get_supervisor"]
+__all__ = [
+    "BudgetGovernor",
+    "CodeSmellSupervisor",
+    "SupervisorRegistry",
+    "analyze_batch",
+    "analyze_code",
+    "analyze_code_stream",
+    "get_budget_governor",
+    "get_supervisor",
+    "supervisor_registry",
+    "validate_options",
+]
@@ -1,5 +1,9 @@
 """Configuração dos agentes especializados."""
 
+from functools import lru_cache
+
+from pydantic import BaseModel, Field, create_model
+
 # Imports para prompts simples
 from core.simple_prompts.complex_conditional_prompt import (
     COMPLEX_CONDITIONAL_AGENT_PROMPT as SIMPLE_COMPLEX_CONDITIONAL_AGENT_PROMPT,
@@ -85,16 +89,122 @@ from core.schemas.agent_response import (
 )
 
 
-def get_agent_configs(prompt_type: str = "simple"):
+# Famílias de smells (mesmas categorias do diagrama do README)
+AGENT_GROUPS = {
+    "complexity": ["long_method", "complex_method", "complex_conditional"],
+    "structure": ["long_parameter_list", "long_message_chain"],
+    "naming": ["long_identifier", "magic_number"],
+    "statements": [
+        "long_statement",
+        "empty_catch_block",
+        "missing_default",
+        "long_lambda_function",
+    ],
+}
+
+GROUPING_MODES = ("none", "families", "single")
+
+GROUP_PROMPT_HEADER = """Você executa várias análises de code smells em uma única passagem sobre o mesmo código.
+Cada seção abaixo define um code smell independente. Aplique as regras, thresholds e exemplos
+de cada seção somente às detecções daquela seção.
+
+## FORMATO DE RESPOSTA:
+Retorne um único objeto JSON com uma chave por seção. O valor de cada chave segue o formato
+de saída descrito na própria seção:
+{keys_example}
+"""
+
+
+@lru_cache(maxsize=None)
+def _build_group_schema(group_name: str, members: tuple) -> type[BaseModel]:
+    """Cria o schema combinado a partir dos Multiple*Response dos membros."""
+    fields = {
+        name: (schema, Field(default_factory=schema)) for name, schema in members
+    }
+    model_name = "".join(part.title() for part in group_name.split("_")) + "Response"
+    return create_model(model_name, **fields)
+
+
+def _build_group_config(group_name: str, configs: dict, names: list) -> dict:
+    """Funde as configurações de vários agentes em uma única chamada."""
+    keys_example = (
+        "{"
+        + ", ".join(f'"{name}": {{"detections": [...], "detected": ...}}' for name in names)
+        + "}"
+    )
+    sections = [GROUP_PROMPT_HEADER.format(keys_example=keys_example)]
+    for name in names:
+        sections.append(f"\n# SEÇÃO `{name}`\n\n{configs[name]['prompt']}")
+
+    members = {name: configs[name]["schema"] for name in names}
+    return {
+        "prompt": "\n".join(sections),
+        "schema": _build_group_schema(group_name, tuple(members.items())),
+        "members": members,
+    }
+
+
+def group_agent_configs(configs: dict, grouping: str = "none") -> dict:
+    """
+    Agrupa as configurações dos agentes para reduzir o número de chamadas.
+
+    Args:
+        configs: Configurações individuais retornadas por get_agent_configs
+        grouping: "none" (11 agentes), "families" (4 famílias) ou "single" (1 chamada)
+
+    Returns:
+        Dict com configurações; agentes fundidos possuem a chave "members"
+    """
+    if grouping not in GROUPING_MODES:
+        raise ValueError(
+            f"grouping inválido: {grouping} (opções: {', '.join(GROUPING_MODES)})"
+        )
+
+    if grouping == "none":
+        return configs
+
+    if grouping == "single":
+        return {"all_smells": _build_group_config("all_smells", configs, list(configs))}
+
+    # Famílias sem nenhum agente disponível (ex: engine híbrida) são omitidas
+    groups = {
+        group: [name for name in names if name in configs]
+        for group, names in AGENT_GROUPS.items()
+    }
+    return {
+        group: _build_group_config(group, configs, names)
+        for group, names in groups.items()
+        if names
+    }
+
+
+def get_agent_configs(
+    prompt_type: str = "simple", grouping: str = "none", exclude: tuple = ()
+):
     """
     Retorna configurações dos agentes baseado no tipo de prompt.
     
     Args:
         prompt_type: "simple" ou "complete"
-    
+        grouping: "none", "families" ou "single" (ver group_agent_configs)
+        exclude: Agentes a remover antes do agrupamento (ex: os resolvidos
+            pela análise estática)
+
     Returns:
         Dict com configurações dos agentes
     """
+    configs = {
+        name: config
+        for name, config in _get_single_agent_configs(prompt_type).items()
+        if name not in exclude
+    }
+    if not configs:
+        return {}
+    return group_agent_configs(configs, grouping)
+
+
+def _get_single_agent_configs(prompt_type: str):
+    """Configurações individuais dos 11 agentes."""
     if prompt_type == "complete":
         return {
             "complex_method": {
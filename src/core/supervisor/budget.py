@@ -0,0 +1,186 @@
+"""Orçamento de custo e tokens de uma execução (processo ou job)."""
+
+import threading
+from typing import Any, Dict, Optional
+
+from config.models import calculate_cost, get_model_config
+from core.utils.metrics import metrics
+
+OK = "ok"
+DEGRADED = "degraded"
+EXHAUSTED = "exhausted"
+STATES = (OK, DEGRADED, EXHAUSTED)
+
+
+class BudgetGovernor:
+    """Acompanha o gasto em tempo real e decide quando degradar ou parar.
+
+    Cada requisição ao provedor é registrada assim que termina (``record``),
+    com o uso de tokens do TokenUsageCallback e os preços de
+    ``config/models.py``. Com ``max_cost_usd`` e/ou ``max_tokens`` definidos,
+    o estado passa a ``degraded`` ao consumir ``degrade_ratio`` do orçamento e
+    a ``exhausted`` ao atingi-lo. Sem limites o estado é sempre ``ok`` e o
+    governor só contabiliza.
+
+    Ao degradar, as próximas análises usam as opções de ``degraded_options``
+    (ex: prompts simples, engine híbrida, gating, modelo mais barato); esgotado,
+    nenhuma nova chamada ao LLM é feita e só os smells estáticos são calculados.
+    Um governor com ``parent`` (ex: o de um job, com o do processo como pai)
+    repassa o gasto ao pai e assume o pior dos dois estados.
+    """
+
+    def __init__(
+        self,
+        max_cost_usd: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        degrade_ratio: float = 0.8,
+        degraded_options: Optional[Dict[str, Any]] = None,
+        name: str = "process",
+        parent: Optional["BudgetGovernor"] = None,
+    ):
+        self.max_cost_usd = max_cost_usd or None
+        self.max_tokens = max_tokens or None
+        self.degrade_ratio = degrade_ratio
+        self.degraded_options = degraded_options or {}
+        self.name = name
+        self.parent = parent
+        self.spent_usd = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.unpriced_calls = 0
+        self.degraded_runs = 0
+        self.skipped_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def record(self, model: str, token_usage: Dict[str, int]) -> None:
+        """Soma o uso de uma requisição (ou de um lote de requisições) ao gasto."""
+        prompt_tokens = token_usage.get("prompt_tokens", 0)
+        completion_tokens = token_usage.get("completion_tokens", 0)
+        model_config = get_model_config(model)
+        cost = (
+            calculate_cost(prompt_tokens, completion_tokens, model_config) if model_config else 0.0
+        )
+        with self._lock:
+            self.calls += 1
+            self.unpriced_calls += model_config is None
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.spent_usd += cost
+        metrics.increment(f"budget.{self.name}.spent_usd", cost)
+        metrics.increment(f"budget.{self.name}.tokens", prompt_tokens + completion_tokens)
+        if self.parent is not None:
+            self.parent.record(model, token_usage)
+
+    def used_ratio(self) -> float:
+        """Fração consumida do limite mais apertado (0 sem limites)."""
+        ratios = []
+        if self.max_cost_usd:
+            ratios.append(self.spent_usd / self.max_cost_usd)
+        if self.max_tokens:
+            ratios.append(self.total_tokens / self.max_tokens)
+        return max(ratios, default=0.0)
+
+    @property
+    def state(self) -> str:
+        ratio = self.used_ratio()
+        if ratio >= 1:
+            state = EXHAUSTED
+        elif ratio >= self.degrade_ratio:
+            state = DEGRADED
+        else:
+            state = OK
+        if self.parent is not None:
+            parent_state = self.parent.state
+            if STATES.index(parent_state) > STATES.index(state):
+                return parent_state
+        return state
+
+    def allows_calls(self) -> bool:
+        """Se ainda é permitido chamar o LLM."""
+        return self.state != EXHAUSTED
+
+    def record_skip(self) -> None:
+        """Conta uma chamada não feita por orçamento esgotado."""
+        with self._lock:
+            self.skipped_calls += 1
+        metrics.increment(f"budget.{self.name}.skipped_calls")
+        if self.parent is not None:
+            self.parent.record_skip()
+
+    def plan(self, **options: Any) -> Dict[str, Any]:
+        """Opções da próxima análise ajustadas ao estado do orçamento."""
+        state = self.state
+        if state == OK:
+            return options
+        with self._lock:
+            self.degraded_runs += 1
+        metrics.increment(f"budget.{self.name}.{state}_runs")
+        if state == EXHAUSTED:
+            return {**options, "engine": "static"}
+        degraded = self.degraded_options
+        if not degraded and self.parent is not None:
+            degraded = self.parent.degraded_options
+        planned = {**options, **degraded}
+        if options.get("engine") == "static":
+            # Já não usa o LLM: degradar só trocaria por uma engine mais cara
+            planned["engine"] = "static"
+        return planned
+
+    def stats(self) -> Dict[str, Any]:
+        """Gasto, limites e estado do orçamento."""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "spent_usd": round(self.spent_usd, 6),
+            "max_cost_usd": self.max_cost_usd,
+            "tokens": {
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.total_tokens,
+            },
+            "max_tokens": self.max_tokens,
+            "used_ratio": round(self.used_ratio(), 4),
+            "degrade_ratio": self.degrade_ratio,
+            "degraded_options": self.degraded_options,
+            "calls": self.calls,
+            "unpriced_calls": self.unpriced_calls,
+            "degraded_runs": self.degraded_runs,
+            "skipped_calls": self.skipped_calls,
+        }
+
+
+def degraded_options_from_settings() -> Dict[str, Any]:
+    """Opções usadas ao degradar, conforme BUDGET_DEGRADE_*."""
+    from config.settings import settings
+
+    options: Dict[str, Any] = {
+        "prompt_type": settings.BUDGET_DEGRADE_PROMPT_TYPE,
+        "engine": settings.BUDGET_DEGRADE_ENGINE,
+        "gating": True,
+    }
+    if settings.BUDGET_DEGRADE_MODEL:
+        options["model"] = settings.BUDGET_DEGRADE_MODEL
+    return options
+
+
+_budget_governor: Optional[BudgetGovernor] = None
+
+
+def get_budget_governor() -> BudgetGovernor:
+    """Retorna o governor de orçamento compartilhado do processo."""
+    global _budget_governor  # pylint: disable=global-statement
+    if _budget_governor is None:
+        from config.settings import settings
+
+        _budget_governor = BudgetGovernor(
+            max_cost_usd=settings.BUDGET_MAX_COST_USD,
+            max_tokens=settings.BUDGET_MAX_TOKENS,
+            degrade_ratio=settings.BUDGET_DEGRADE_RATIO,
+            degraded_options=degraded_options_from_settings(),
+        )
+    return _budget_governor
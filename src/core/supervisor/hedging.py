@@ -0,0 +1,237 @@
+"""Requisições duplicadas ("hedging") para cortar a cauda de latência dos agentes."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from core.utils.metrics import metrics, percentile
+
+logger = logging.getLogger(__name__)
+
+
+class HedgePolicy:
+    """Decide quando duplicar uma chamada lenta e limita o gasto extra.
+
+    O atraso do hedge é o percentil ``pct`` das latências recentes do agente
+    (``llm.agent_latency_seconds.<agente>``); sem ``min_samples`` observações
+    não há hedge. O número de hedges emitidos nunca passa de ``budget_ratio``
+    vezes o número de chamadas elegíveis, o que limita o custo adicional.
+    Uma fração ``control_ratio`` das chamadas com histórico roda sem hedge
+    e forma o grupo de controle da comparação de latências.
+    """
+
+    def __init__(
+        self,
+        pct: float = 95.0,
+        min_samples: int = 20,
+        min_delay: float = 1.0,
+        budget_ratio: float = 0.1,
+        control_ratio: float = 0.1,
+    ):
+        self.pct = pct
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.control_ratio = control_ratio
+        self.calls = 0
+        self.control = 0
+        self.issued = 0
+        self.won = 0
+        self.budget_exhausted = 0
+        self._lock = threading.Lock()
+
+    def delay(self, agent_name: str) -> Optional[float]:
+        """Segundos de espera antes do hedge (None se ainda não há histórico)."""
+        values = metrics.values(f"llm.agent_latency_seconds.{agent_name}")
+        if len(values) < self.min_samples:
+            return None
+        return max(percentile(values, self.pct), self.min_delay)
+
+    def sample_control(self) -> bool:
+        """Sorteia se a chamada (já com histórico) fica no grupo de controle."""
+        if random.random() >= self.control_ratio:
+            return False
+        with self._lock:
+            self.control += 1
+        return True
+
+    def record_call(self) -> None:
+        """Conta uma chamada elegível a hedge (base do orçamento)."""
+        with self._lock:
+            self.calls += 1
+
+    def try_acquire(self) -> bool:
+        """Reserva um hedge se o orçamento permitir."""
+        with self._lock:
+            if self.issued + 1 > self.budget_ratio * self.calls:
+                self.budget_exhausted += 1
+                metrics.increment("hedge.budget_exhausted")
+                return False
+            self.issued += 1
+        metrics.increment("hedge.issued")
+        return True
+
+    def record_result(self, latency: float, control: bool, hedge_won: bool = False) -> None:
+        """Registra a latência efetiva de uma chamada com histórico.
+
+        Chamadas com hedge armado entram em ``hedge.latency_seconds``; as do
+        grupo de controle formam a linha de base em
+        ``hedge.baseline_latency_seconds``. Os dois grupos são sorteados entre
+        as mesmas chamadas, então a diferença nos percentis é o ganho do
+        hedge. A chamada original cancelada não tem latência conhecida, por
+        isso a comparação é entre distribuições e não chamada a chamada.
+        """
+        metrics.observe(
+            "hedge.baseline_latency_seconds" if control else "hedge.latency_seconds", latency
+        )
+        if hedge_won:
+            with self._lock:
+                self.won += 1
+            metrics.increment("hedge.won")
+
+    def stats(self) -> Dict[str, Any]:
+        """Taxa de hedge e latências p50/p95/p99 com e sem hedge."""
+        hedged = metrics.summary("hedge.latency_seconds")
+        baseline = metrics.summary("hedge.baseline_latency_seconds")
+        return {
+            "calls": self.calls,
+            "issued": self.issued,
+            "won": self.won,
+            "budget_exhausted": self.budget_exhausted,
+            "control_calls": self.control,
+            "hedge_rate": round(self.issued / self.calls, 4) if self.calls else 0.0,
+            "budget_ratio": self.budget_ratio,
+            "latency_seconds": {"hedged": hedged, "baseline": baseline},
+            "improvement_seconds": (
+                {key: round(baseline[key] - hedged[key], 4) for key in ("p50", "p95", "p99")}
+                if hedged["count"] and baseline["count"]
+                else None
+            ),
+        }
+
+
+class HedgingMixin:
+    """Métodos do CodeSmellSupervisor que disparam e acompanham os hedges.
+
+    A decisão (atraso, orçamento, grupo de controle) fica na HedgePolicy;
+    aqui ficam a corrida entre a chamada original e o hedge e o resumo por
+    execução.
+    """
+
+    def _get_hedge_structured_model(self, schema: Any, max_tokens: Optional[int] = None) -> Any:
+        """Runnable usado no hedge: o modelo secundário, se configurado, ou o principal."""
+        if self.hedge_model is None:
+            return self._get_structured_model(schema, max_tokens)
+        key = (schema, max_tokens)
+        if key not in self._hedge_structured_models:
+            self._hedge_structured_models[key] = self._build_structured_model(
+                self._with_max_tokens(self.hedge_model, max_tokens), schema
+            )
+        return self._hedge_structured_models[key]
+
+    async def _invoke_hedged(
+        self,
+        agent_name: str,
+        schema: Any,
+        messages: List[Dict[str, Any]],
+        estimated_tokens: int,
+        stats: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[Any, Dict[str, int]]:
+        """Chamada com hedge: duplica a requisição se ela passar do atraso aprendido.
+
+        A primeira resposta válida vence e a outra requisição é cancelada. Sem
+        hedging (ou sem histórico de latência do agente) é uma chamada simples;
+        as chamadas sorteadas para o grupo de controle também, mas têm a
+        latência registrada como linha de base.
+        """
+        started = time.monotonic()
+        delay = self.hedge_policy.delay(agent_name) if self.hedging else None
+        primary = self._invoke_once(
+            agent_name,
+            self._get_structured_model(schema, max_tokens),
+            self.rate_limiter,
+            messages,
+            estimated_tokens,
+            stats,
+        )
+        if delay is None:
+            return await primary
+        if self.hedge_policy.sample_control():
+            self._count(stats, "hedge_control")
+            result = await primary
+            self.hedge_policy.record_result(time.monotonic() - started, control=True)
+            return result
+
+        self.hedge_policy.record_call()
+        self._count(stats, "hedge_armed")
+        tasks = {asyncio.create_task(primary): "primary"}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.hedge_policy.try_acquire():
+                logger.info("[%s] Sem resposta em %.1fs: enviando hedge", agent_name, delay)
+                self._count(stats, "hedges")
+                hedge = self._invoke_once(
+                    agent_name,
+                    self._get_hedge_structured_model(schema, max_tokens),
+                    self.hedge_rate_limiter,
+                    messages,
+                    estimated_tokens,
+                    stats,
+                )
+                tasks[asyncio.create_task(hedge)] = "hedge"
+
+            pending = set(tasks)
+            errors = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    hedge_won = tasks[task] == "hedge"
+                    if hedge_won:
+                        self._count(stats, "hedge_wins")
+                    self.hedge_policy.record_result(
+                        time.monotonic() - started, control=False, hedge_won=hedge_won
+                    )
+                    return task.result()
+            raise errors[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _summarize_hedging(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Hedges emitidos e vencidos na execução corrente."""
+        armed = stats.get("hedge_armed", 0)
+        hedges = stats.get("hedges", 0)
+        return {
+            "armed_calls": armed,
+            "hedges": hedges,
+            "hedge_wins": stats.get("hedge_wins", 0),
+            "control_calls": stats.get("hedge_control", 0),
+            "hedge_rate": round(hedges / armed, 4) if armed else 0.0,
+        }
+
+
+_hedge_policy: Optional[HedgePolicy] = None
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """Retorna a política de hedge compartilhada do processo."""
+    global _hedge_policy  # pylint: disable=global-statement
+    if _hedge_policy is None:
+        from config.settings import settings
+
+        _hedge_policy = HedgePolicy(
+            pct=settings.HEDGE_PERCENTILE,
+            min_samples=settings.HEDGE_MIN_SAMPLES,
+            min_delay=settings.HEDGE_MIN_DELAY_SECONDS,
+            budget_ratio=settings.HEDGE_BUDGET_RATIO,
+            control_ratio=settings.HEDGE_CONTROL_RATIO,
+        )
+    return _hedge_policy
@@ -0,0 +1,139 @@
+"""Reanálise incremental por função com as impressões digitais das unidades."""
+
+from typing import Any, Dict, List, Optional
+
+from core.utils.code_parser import CodeParser
+
+
+class IncrementalMixin:
+    """Métodos do CodeSmellSupervisor para a reanálise incremental.
+
+    O estado de cada arquivo (FingerprintStore) guarda as detecções por
+    unidade (função, método ou o restante do módulo), com as linhas relativas
+    à unidade; só unidades novas ou alteradas voltam ao LLM. O estado vale
+    apenas para a mesma configuração (ver ``_config_signature``).
+    """
+
+    def _config_signature(self, gating: bool, slicing: bool) -> List[Any]:
+        """Configuração que invalida o estado incremental quando muda."""
+        return [
+            self.model.model_name,
+            self.prompt_type,
+            self.grouping,
+            self.layout,
+            self.engine,
+            gating,
+            slicing,
+        ]
+
+    @staticmethod
+    def _line_fields(detection: Dict[str, Any]) -> Dict[str, int]:
+        """Campos de linha numéricos de uma detecção (Line no, start/end_line)."""
+        fields = {}
+        for field in ("Line no", "start_line", "end_line"):
+            try:
+                fields[field] = int(detection.get(field))
+            except (TypeError, ValueError):
+                continue
+        return fields
+
+    def _plan_incremental(
+        self, code: str, file_path: str, incremental_key: str, signature: List[Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Compara as unidades do arquivo com o estado salvo.
+
+        Retorna as unidades novas/alteradas (a reanalisar), as linhas que elas
+        ocupam e as detecções das unidades inalteradas, reancoradas nas novas
+        linhas. None quando o código não tem AST válida.
+        """
+        units = CodeParser(code, file_path).get_fingerprinted_units()
+        if not units:
+            return None
+
+        stored = self.fingerprint_store.load(incremental_key, file_path) or {}
+        known = stored.get("units", {}) if stored.get("config") == signature else {}
+
+        plan = {
+            "units": units,
+            "signature": signature,
+            "known": known,
+            "analyzed": [],
+            "focus": set(),
+            "reused": [],
+        }
+        for unit in units:
+            entries = known.get(unit["fingerprint"])
+            if entries is None:
+                plan["analyzed"].append(unit)
+                plan["focus"].update(unit["lines"])
+                continue
+            for entry in entries:
+                detection = dict(entry["detection"])
+                for field, position in entry["positions"].items():
+                    line = unit["lines"][position]
+                    # Mantém o tipo original (Line no pode vir como texto)
+                    detection[field] = str(line) if isinstance(detection[field], str) else line
+                plan["reused"].append(detection)
+        return plan
+
+    def _save_incremental(
+        self,
+        incremental_key: str,
+        file_path: str,
+        plan: Dict[str, Any],
+        results: List[Dict[str, Any]],
+        persist: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Salva as detecções por unidade e retorna as que pertencem às unidades reanalisadas.
+
+        Detecções ancoradas em unidades inalteradas (ex: um cabeçalho de
+        classe exibido junto com o método alterado) são descartadas, pois a
+        versão reaproveitada já está no resultado. Com ``persist=False`` o
+        resultado é filtrado, mas o estado salvo não muda.
+        """
+        owners = {}
+        for unit in plan["analyzed"]:
+            positions = {line: position for position, line in enumerate(unit["lines"])}
+            for line in unit["lines"]:
+                owners[line] = (unit["fingerprint"], positions)
+
+        entries: Dict[str, List[Dict[str, Any]]] = {
+            unit["fingerprint"]: [] for unit in plan["analyzed"]
+        }
+        kept = []
+        for detection in results:
+            fields = self._line_fields(detection)
+            anchor = fields.get("Line no", fields.get("start_line"))
+            if anchor is None:
+                # Sem linha não há como reancorar: mantém só nesta execução
+                kept.append(detection)
+                continue
+            owner = owners.get(anchor)
+            if owner is None:
+                continue
+            fingerprint, positions = owner
+            entries[fingerprint].append(
+                {
+                    "detection": detection,
+                    "positions": {
+                        field: positions[line]
+                        for field, line in fields.items()
+                        if line in positions
+                    },
+                }
+            )
+            kept.append(detection)
+
+        if not persist:
+            return kept
+
+        units = {}
+        for unit in plan["units"]:
+            fingerprint = unit["fingerprint"]
+            units[fingerprint] = entries.get(fingerprint, plan["known"].get(fingerprint, []))
+        self.fingerprint_store.save(
+            incremental_key,
+            file_path,
+            {"config": plan["signature"], "units": units},
+        )
+        return kept
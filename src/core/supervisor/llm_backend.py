@@ -0,0 +1,285 @@
+"""Backends de modelo: chamada ao provedor, gravação e reprodução de respostas."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import (
+    BaseChatModel,
+    agenerate_from_stream,
+    generate_from_stream,
+)
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from core.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("live", "record", "replay")
+
+
+class ReplayMissError(KeyError):
+    """Requisição sem resposta gravada no arquivo de reprodução."""
+
+
+class ResponseArchive:
+    """Arquivo de respostas gravadas (JSON Lines comprimido com gzip).
+
+    Cada requisição é identificada pelo hash do modelo, do formato de resposta
+    e das mensagens. O ``max_tokens`` fica fora da chave: ele vem do orçamento
+    de saída, que pode mudar entre a gravação e a reprodução, e um corte pelo
+    limite é reproduzido pelo ``finish_reason`` gravado. Cada registro guarda o
+    texto bruto da resposta, o ``finish_reason``, o ``max_tokens`` usado, o uso
+    de tokens e a latência medida. Os registros ficam em memória até
+    ``flush``, que os anexa como um membro gzip independente; uma gravação
+    interrompida perde no máximo os registros ainda pendentes. Requisições
+    repetidas (novas tentativas, hedges) são reproduzidas na ordem em que
+    foram gravadas, repetindo a última quando as gravações acabam.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, int] = {}
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        # Serializa as escritas, que rodam fora do lock das leituras
+        self._write_lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+        except (OSError, EOFError, ValueError) as e:
+            # Gravação interrompida: mantém os registros lidos até o erro
+            logger.warning("Arquivo de respostas %s incompleto: %s", self.path, e)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @staticmethod
+    def request_key(model: str, messages: List[BaseMessage], **kwargs: Any) -> str:
+        """Hash determinístico de uma requisição."""
+        payload = json.dumps(
+            {
+                "model": model,
+                "response_format": kwargs.get("response_format"),
+                "messages": [[message.type, message.content] for message in messages],
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Registra a resposta; a escrita no arquivo fica para ``flush``."""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries.setdefault(entry["key"], []).append(entry)
+            self._pending.append(line)
+
+    def flush(self) -> None:
+        """Anexa ao arquivo os registros pendentes (bloqueante)."""
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write("".join(lines))
+
+    async def aflush(self) -> None:
+        """``flush`` em uma thread, sem bloquear o event loop."""
+        await asyncio.to_thread(self.flush)
+
+    def next(self, key: str) -> Dict[str, Any]:
+        """Próximo registro gravado para a requisição."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise ReplayMissError(f"Requisição sem resposta gravada em {self.path}: {key[:12]}")
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+
+class RecordReplayChatModel(BaseChatModel):
+    """Chat model que grava as respostas de outro modelo ou as reproduz.
+
+    Em ``record`` cada chamada vai ao modelo ``inner`` (normalmente o
+    ChatOpenAI do supervisor) e o texto, o uso de tokens e a latência são
+    gravados no ``archive``. Em ``replay`` nenhuma requisição sai do processo:
+    a resposta gravada é devolvida em streaming depois da latência original
+    multiplicada por ``latency_scale`` (0 = sem espera). Como é um chat model
+    do LangChain, callbacks de uso de tokens, ``bind`` e ``model_copy`` (usado
+    no orçamento de saída) funcionam como no modelo real, tanto na API
+    assíncrona usada pelo supervisor quanto na síncrona.
+    """
+
+    mode: str
+    archive: Any
+    inner: Optional[Any] = None
+    model_name: str
+    max_tokens: Optional[int] = None
+    latency_scale: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return f"{self.mode}-chat"
+
+    def _generate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        return generate_from_stream(
+            self._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        return await agenerate_from_stream(
+            self._astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+    def _stream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        key = ResponseArchive.request_key(self.model_name, messages, **kwargs)
+        if self.mode == "replay":
+            entry = self.archive.next(key)
+            if self.latency_scale > 0:
+                time.sleep(entry["latency_seconds"] * self.latency_scale)
+            yield from self._replay_chunks(entry)
+            return
+        chunks: List[ChatGenerationChunk] = []
+        started = time.monotonic()
+        # run_manager fica com o modelo externo, que já emite os tokens aos callbacks
+        for chunk in self._inner_model()._stream(messages, stop=stop, **kwargs):  # pylint: disable=protected-access
+            chunks.append(chunk)
+            yield chunk
+        self.archive.add(self._recorded_entry(key, chunks, started))
+        self.archive.flush()
+        metrics.increment("llm.record.responses")
+
+    async def _astream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = ResponseArchive.request_key(self.model_name, messages, **kwargs)
+        if self.mode == "replay":
+            entry = self.archive.next(key)
+            if self.latency_scale > 0:
+                await asyncio.sleep(entry["latency_seconds"] * self.latency_scale)
+            for chunk in self._replay_chunks(entry):
+                yield chunk
+            return
+        chunks: List[ChatGenerationChunk] = []
+        started = time.monotonic()
+        async for chunk in self._inner_model()._astream(messages, stop=stop, **kwargs):  # pylint: disable=protected-access
+            chunks.append(chunk)
+            yield chunk
+        self.archive.add(self._recorded_entry(key, chunks, started))
+        await self.archive.aflush()
+        metrics.increment("llm.record.responses")
+
+    @staticmethod
+    def _replay_chunks(entry: Dict[str, Any]) -> List[ChatGenerationChunk]:
+        """Texto gravado e, no último chunk, uso de tokens e finish_reason."""
+        metrics.increment("llm.replay.responses")
+        return [
+            ChatGenerationChunk(message=AIMessageChunk(content=entry["text"])),
+            ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    usage_metadata=entry["usage_metadata"],
+                    response_metadata={
+                        "finish_reason": entry["finish_reason"],
+                        "model_name": entry["model"],
+                    },
+                ),
+                generation_info={"finish_reason": entry["finish_reason"]},
+            ),
+        ]
+
+    def _inner_model(self) -> Any:
+        """Modelo gravado, com o ``max_tokens`` desta cópia (orçamento de saída)."""
+        if self.inner.max_tokens != self.max_tokens:
+            return self.inner.model_copy(update={"max_tokens": self.max_tokens})
+        return self.inner
+
+    def _recorded_entry(
+        self, key: str, chunks: List[ChatGenerationChunk], started: float
+    ) -> Dict[str, Any]:
+        """Registro do arquivo a partir dos chunks recebidos do modelo gravado."""
+        text: List[str] = []
+        usage_metadata = None
+        finish_reason = None
+        for chunk in chunks:
+            if isinstance(chunk.message.content, str):
+                text.append(chunk.message.content)
+            usage_metadata = getattr(chunk.message, "usage_metadata", None) or usage_metadata
+            finish_reason = (
+                (chunk.message.response_metadata or {}).get("finish_reason")
+                or (chunk.generation_info or {}).get("finish_reason")
+                or finish_reason
+            )
+        return {
+            "key": key,
+            "model": self.model_name,
+            "max_tokens": self.max_tokens,
+            "text": "".join(text),
+            "finish_reason": finish_reason,
+            "usage_metadata": usage_metadata,
+            "latency_seconds": round(time.monotonic() - started, 4),
+        }
+
+    def with_structured_output(self, schema: Any, *, method: str = "json_mode", **kwargs: Any):
+        """Structured output em modo JSON, como ``ChatOpenAI(method="json_mode")``."""
+        if method != "json_mode":
+            raise ValueError(f"method não suportado em {self.mode}: {method}")
+        return self.bind(response_format={"type": "json_object"}) | PydanticOutputParser(
+            pydantic_object=schema
+        )
+
+
+_archives: Dict[str, ResponseArchive] = {}
+
+
+def get_response_archive(path: str) -> ResponseArchive:
+    """Arquivo de respostas compartilhado do processo (um por caminho)."""
+    if path not in _archives:
+        _archives[path] = ResponseArchive(path)
+    return _archives[path]
+
+
+def wrap_chat_model(model: Any, backend: Optional[str] = None) -> Any:
+    """Aplica o backend configurado (LLM_BACKEND) ao chat model do supervisor."""
+    from config.settings import settings
+
+    backend = backend or settings.LLM_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"LLM_BACKEND inválido: {backend} (opções: {', '.join(BACKENDS)})")
+    if backend == "live":
+        return model
+    return RecordReplayChatModel(
+        mode=backend,
+        archive=get_response_archive(settings.LLM_ARCHIVE_PATH),
+        inner=model if backend == "record" else None,
+        model_name=model.model_name,
+        max_tokens=model.max_tokens,
+        latency_scale=settings.LLM_REPLAY_LATENCY_SCALE,
+    )
@@ -0,0 +1,131 @@
+"""Orçamento de tokens de saída por agente e por arquivo."""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from core.utils.metrics import metrics, percentile
+
+
+class OutputBudgetPolicy:
+    """Prevê o ``max_tokens`` de cada chamada a partir dos candidatos estáticos.
+
+    A previsão é ``(overhead + tokens_por_candidato * candidatos) * safety``,
+    arredondada para cima em potências de 2 entre ``min_tokens`` e
+    ``max_tokens``. ``tokens_por_candidato`` é ``default_per_candidate``, de
+    modo que a previsão depende só do código. Com ``learn``, depois de
+    ``min_samples`` chamadas do agente ele passa a ser o percentil ``pct`` das
+    razões observadas (tokens de saída reais / candidatos) e o modelo se
+    recalibra com o histórico do processo, e o orçamento deixa de ser
+    reproduzível entre execuções. Respostas cortadas não entram na
+    calibração (o valor real é desconhecido) e contam como subestimativa; o
+    supervisor as repete com o limite cheio, ao custo de uma chamada extra.
+    """
+
+    def __init__(
+        self,
+        min_tokens: int = 512,
+        max_tokens: int = 4096,
+        overhead: int = 64,
+        default_per_candidate: float = 150.0,
+        safety: float = 1.5,
+        pct: float = 90.0,
+        min_samples: int = 10,
+        learn: bool = False,
+    ):
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.overhead = overhead
+        self.default_per_candidate = default_per_candidate
+        self.safety = safety
+        self.pct = pct
+        self.min_samples = min_samples
+        self.learn = learn
+        self.underpredicted: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def tokens_per_candidate(self, agent_name: str) -> float:
+        """Tokens de saída por candidato usados na previsão para o agente."""
+        if not self.learn:
+            return self.default_per_candidate
+        values = metrics.values(f"output_budget.tokens_per_candidate.{agent_name}")
+        if len(values) < self.min_samples:
+            return self.default_per_candidate
+        return percentile(values, self.pct)
+
+    def predict(self, agent_name: str, candidates: int) -> int:
+        """``max_tokens`` para uma chamada do agente com ``candidates`` candidatos."""
+        estimate = (
+            self.overhead + self.tokens_per_candidate(agent_name) * candidates
+        ) * self.safety
+        budget = self.min_tokens
+        while budget < estimate and budget < self.max_tokens:
+            budget *= 2
+        return min(budget, self.max_tokens)
+
+    @staticmethod
+    def candidates_for(counts: Dict[str, int], names: Iterable[str]) -> int:
+        """Candidatos de um agente (ou da soma dos membros de um agente fundido)."""
+        return sum(counts.get(name, 0) for name in names)
+
+    def record(
+        self,
+        agent_name: str,
+        candidates: int,
+        predicted: int,
+        completion_tokens: Optional[int],
+        truncated: bool = False,
+    ) -> None:
+        """Registra previsto vs real para recalibrar e para /api/metrics."""
+        metrics.observe(f"output_budget.predicted_tokens.{agent_name}", predicted)
+        if truncated:
+            with self._lock:
+                self.underpredicted[agent_name] = self.underpredicted.get(agent_name, 0) + 1
+            metrics.increment(f"output_budget.underpredicted.{agent_name}")
+            return
+        if not completion_tokens:
+            return
+        metrics.observe(f"output_budget.completion_tokens.{agent_name}", completion_tokens)
+        metrics.observe(
+            f"output_budget.tokens_per_candidate.{agent_name}",
+            max(completion_tokens - self.overhead, 0) / max(candidates, 1),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Previsto vs real (p50/p95) e subestimativas por agente."""
+        prefix = "output_budget.predicted_tokens."
+        agents = sorted(
+            name[len(prefix):]
+            for name in metrics.snapshot()["observations"]
+            if name.startswith(prefix)
+        )
+        result = {}
+        for agent_name in agents:
+            predicted = metrics.summary(f"{prefix}{agent_name}")
+            actual = metrics.summary(f"output_budget.completion_tokens.{agent_name}")
+            result[agent_name] = {
+                "calls": predicted["count"],
+                "predicted_tokens": {"p50": predicted["p50"], "p95": predicted["p95"]},
+                "completion_tokens": {"p50": actual["p50"], "p95": actual["p95"]},
+                "tokens_per_candidate": round(self.tokens_per_candidate(agent_name), 2),
+                "underpredicted": self.underpredicted.get(agent_name, 0),
+            }
+        return {"max_tokens": self.max_tokens, "agents": result}
+
+
+_output_budget: Optional[OutputBudgetPolicy] = None
+
+
+def get_output_budget() -> OutputBudgetPolicy:
+    """Retorna a política de orçamento de saída compartilhada do processo."""
+    global _output_budget  # pylint: disable=global-statement
+    if _output_budget is None:
+        from config.settings import settings
+
+        _output_budget = OutputBudgetPolicy(
+            min_tokens=settings.OUTPUT_BUDGET_MIN_TOKENS,
+            max_tokens=settings.OUTPUT_MAX_TOKENS,
+            default_per_candidate=settings.OUTPUT_BUDGET_TOKENS_PER_CANDIDATE,
+            safety=settings.OUTPUT_BUDGET_SAFETY,
+            learn=settings.OUTPUT_BUDGET_LEARNING,
+        )
+    return _output_budget
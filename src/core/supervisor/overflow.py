@@ -0,0 +1,172 @@
+"""Divisão e reexecução de chamadas cortadas pelo limite de tokens de saída."""
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from config.settings import settings
+from core.supervisor.streaming import detection_type_of
+from core.utils.file_packer import FILE_HEADER_LINE
+from core.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Número da linha no início de uma linha de código numerado ("  12 | ...")
+NUMBERED_LINE = re.compile(r"^\s*(\d+) \| ")
+
+
+class OverflowSplitMixin:
+    """Métodos do CodeSmellSupervisor que dividem o código de um agente cortado.
+
+    Quando a resposta passa do ``max_tokens``, só o agente afetado é
+    reexecutado em metades do código, cortadas em fronteiras da AST (ou entre
+    arquivos, em pacotes), sem repetir os agentes que terminaram.
+    """
+
+    def _bisect_numbered_code(
+        self, code: str, numbered_code: str, start_line: int = 1
+    ) -> Optional[tuple[str, str]]:
+        """Divide o código numerado em duas metades numa fronteira de unidade da AST.
+
+        Procura o corte mais próximo do meio (em caracteres) entre os inícios
+        de statements de módulo; só se não houver nenhum desce para membros de
+        classes e depois para statements dentro de funções. Pacotes de arquivos
+        são cortados entre arquivos. Retorna None se o trecho for uma única
+        unidade indivisível.
+        """
+        lines = numbered_code.split("\n")
+        numbers = []
+        for line in lines:
+            match = NUMBERED_LINE.match(line)
+            numbers.append(int(match.group(1)) if match else None)
+        offsets = [0]
+        for line in lines:
+            offsets.append(offsets[-1] + len(line) + 1)
+        middle = offsets[-1] / 2
+
+        # Pacote: corta entre arquivos; com um só arquivo, divide o código dele
+        # (remontado das linhas numeradas), repetindo o cabeçalho na 2ª metade
+        headers = [i for i, line in enumerate(lines) if FILE_HEADER_LINE.match(line)]
+        if len(headers) > 1:
+            index = min(headers[1:], key=lambda i: abs(offsets[i] - middle))
+            return "\n".join(lines[:index]).rstrip("\n"), "\n".join(lines[index:])
+        prefix: List[str] = []
+        if headers:
+            prefix = [lines[headers[0]]]
+            numbered = [n for n in numbers if n is not None]
+            if not numbered:
+                return None
+            start_line = numbered[0]
+            code = "\n".join(
+                NUMBERED_LINE.sub("", line, count=1) for line in lines if NUMBERED_LINE.match(line)
+            )
+
+        starts: Set[int] = set()
+        for level in self.chunker.boundary_levels(code, start_line):
+            starts.update(level)
+            candidates = [
+                index
+                for index in range(1, len(lines))
+                if numbers[index] in starts and numbers[index] != start_line
+            ]
+            if candidates:
+                index = min(candidates, key=lambda i: abs(offsets[i] - middle))
+                return "\n".join(lines[:index]), "\n".join(prefix + lines[index:])
+        return None
+
+    def _response_from_detections(self, config: Dict, detections: List[Any]) -> Any:
+        """Monta a resposta no schema do agente a partir de detecções já validadas."""
+        members = config.get("members")
+        if not members:
+            return config["schema"](detections=detections, detected=bool(detections))
+        sections = {}
+        for name, member_schema in members.items():
+            detection_type = detection_type_of(member_schema)
+            own = [d for d in detections if type(d) is detection_type]
+            sections[name] = member_schema(detections=own, detected=bool(own))
+        return config["schema"](**sections)
+
+    async def _split_overflow(
+        self,
+        agent_name: str,
+        config: Dict,
+        code: str,
+        numbered_code: str,
+        partial: List[Any],
+        token_usage: Dict[str, int],
+        cache_key: Optional[str],
+        use_cache: bool,
+        stats: Optional[Dict[str, Any]],
+        start_line: int,
+        deadline: Optional[float],
+        depth: int,
+    ) -> tuple[List[Any], Dict[str, int]]:
+        """Reexecuta só o agente que passou do limite de saída, em duas metades.
+
+        O código é cortado numa fronteira de unidade da AST e cada metade vai
+        para _call_agent, que pode dividi-la de novo até
+        ``OVERFLOW_SPLIT_MAX_DEPTH`` níveis. As detecções das metades são
+        mescladas às detecções completas da resposta cortada. Se não for
+        possível dividir, ficam as detecções parciais e o agente entra em
+        ``truncated_agents``.
+        """
+        halves = None
+        if depth < settings.OVERFLOW_SPLIT_MAX_DEPTH:
+            halves = self._bisect_numbered_code(code, numbered_code, start_line)
+        if halves is None:
+            self._mark_truncated(stats, agent_name)
+            logger.warning(
+                "[%s] Sem divisão possível: retornando %s detecções parciais",
+                agent_name,
+                len(partial),
+            )
+            return partial, token_usage
+
+        self._count(stats, "overflow_splits")
+        metrics.increment(f"llm.overflow_splits.{agent_name}")
+        logger.info("[%s] Reexecutando em duas metades (nível %s)", agent_name, depth + 1)
+        results = await asyncio.gather(
+            *[
+                self._call_agent(
+                    agent_name,
+                    config,
+                    code,
+                    use_cache,
+                    stats,
+                    start_line,
+                    half,
+                    deadline,
+                    depth + 1,
+                )
+                for half in halves
+            ]
+        )
+
+        total_token_usage = self._create_empty_token_usage()
+        self._aggregate_token_usage(total_token_usage, token_usage)
+        merged = {self._detection_key(d): d for d in partial}
+        for detections, usage in results:
+            merged.update((self._detection_key(d), d) for d in detections)
+            self._aggregate_token_usage(total_token_usage, usage)
+        detections = list(merged.values())
+
+        # Resultado completo (nenhuma metade cortada ou com falha) vai para o
+        # cache com a chave original, evitando a chamada cortada na próxima vez
+        complete = stats is not None and not any(
+            agent_name in stats.get(key, ())
+            for key in ("truncated_agents", "failed_agents", "incomplete_agents")
+        )
+        if cache_key is not None and complete:
+            self.response_cache.set(
+                cache_key,
+                {
+                    "agent": agent_name,
+                    "model": self.model.model_name,
+                    "response": self._response_from_detections(config, detections).model_dump(
+                        mode="json"
+                    ),
+                    "token_usage": total_token_usage,
+                },
+            )
+        return detections, total_token_usage
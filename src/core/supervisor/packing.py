@@ -0,0 +1,316 @@
+"""Análise em lote com empacotamento de arquivos pequenos na mesma chamada."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from core.supervisor.budget import BudgetGovernor
+from core.utils.file_packer import FILE_HEADER, FilePack, FilePacker
+from core.utils.metrics import metrics
+from core.utils.static_gate import StaticGate
+from core.utils.token_estimator import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Acrescentado ao prompt dos agentes quando vários arquivos vão na mesma chamada
+BATCH_INSTRUCTION = (
+    "\n\nATENÇÃO: o código abaixo contém vários arquivos. Cada arquivo começa com "
+    "uma linha '### FILE: <caminho> ###' e tem numeração de linhas própria, a partir "
+    "de 1. Em cada detecção preencha File com o caminho exato do cabeçalho do arquivo "
+    "onde o smell está e use em Line_no a numeração desse arquivo."
+)
+
+# Contadores somados entre os arquivos e pacotes de um batch
+BATCH_COUNTERS = (
+    "cache_hits",
+    "cache_misses",
+    "retries",
+    "overflow_splits",
+    "unattributed_detections",
+    "hedge_armed",
+    "hedges",
+    "hedge_wins",
+    "hedge_control",
+)
+
+
+class BatchAnalysisMixin:
+    """Métodos do CodeSmellSupervisor para analisar vários arquivos de uma vez.
+
+    Arquivos pequenos são agrupados (FilePacker) e cada agente recebe o
+    pacote inteiro, economizando as instruções repetidas por arquivo; as
+    detecções voltam ao arquivo de origem pelo cabeçalho (FilePack.locate).
+    """
+
+    def _format_pack(self, pack: FilePack) -> str:
+        """Concatena os arquivos do pacote, cada um com cabeçalho e numeração própria."""
+        return "\n\n".join(
+            f"{FILE_HEADER.format(file_path=packed.file_path)}\n"
+            f"{self._format_code_with_line_numbers(packed.code)}"
+            for packed in pack.files
+        )
+
+    def _select_pack_configs(
+        self, pack: FilePack, gating: bool, stats: Dict[str, Any]
+    ) -> Dict[str, Dict]:
+        """Agentes do pacote: com gating, pula só os descartados em todos os arquivos."""
+        if not gating:
+            return self.agent_configs
+        skippable = [StaticGate(packed.code).skippable_agents() for packed in pack.files]
+        selected = {}
+        for name, config in self.agent_configs.items():
+            members = config.get("members") or {name: config["schema"]}
+            if all(member in skip for skip in skippable for member in members):
+                metrics.increment(f"gate.skipped.{name}")
+                skipped = stats.setdefault("skipped_agents", {})
+                skipped[name] = skipped.get(name, 0) + 1
+                continue
+            selected[name] = config
+        return selected
+
+    async def _analyze_pack(
+        self,
+        pack: FilePack,
+        project: str,
+        use_cache: bool = True,
+        stats: Optional[Dict[str, Any]] = None,
+        gating: bool = False,
+    ) -> tuple[Dict[int, List[Any]], Dict[str, int]]:
+        """Analisa vários arquivos pequenos em uma chamada por agente.
+
+        As detecções são atribuídas de volta ao arquivo de origem (ver
+        FilePack.locate) e recebem Module/Package/File do CodeParser desse
+        arquivo. Retorna (detecções por índice do arquivo, token_usage).
+        """
+        stats = stats if stats is not None else {}
+        numbered_code = self._format_pack(pack)
+        configs = self._select_pack_configs(pack, gating, stats)
+        results = await asyncio.gather(
+            *[
+                self._call_agent(
+                    name,
+                    {**config, "prompt": config["prompt"] + BATCH_INSTRUCTION},
+                    pack.source,
+                    use_cache,
+                    stats,
+                    numbered_code=numbered_code,
+                )
+                for name, config in configs.items()
+            ],
+            return_exceptions=True,
+        )
+        self._count(stats, "llm_calls", len(configs))
+
+        by_file: Dict[int, List[Any]] = {packed.index: [] for packed in pack.files}
+        total_token_usage = self._create_empty_token_usage()
+        for name, result in zip(configs, results):
+            if isinstance(result, Exception):
+                logger.error("[%s] Falhou: %s", name, result)
+                continue
+            detections, token_usage = result
+            self._aggregate_token_usage(total_token_usage, token_usage)
+            for d in detections:
+                packed = pack.locate(d)
+                if packed is None:
+                    logger.warning(
+                        "[%s] Detecção sem arquivo identificável (File=%r, linha %s)",
+                        name,
+                        d.File,
+                        d.Line_no,
+                    )
+                    self._count(stats, "unattributed_detections")
+                    continue
+                by_file[packed.index].append(d)
+
+        for packed in pack.files:
+            by_file[packed.index] = self._add_metadata(
+                by_file[packed.index], packed.code, packed.file_path, project, packed.parser
+            )
+        return by_file, total_token_usage
+
+    def _estimate_packing_savings(
+        self, packs: List[FilePack], numbered_tokens: List[int]
+    ) -> Dict[str, Any]:
+        """Tokens de entrada estimados dos pacotes vs. uma chamada por arquivo."""
+        batch_configs = {
+            name: {**config, "prompt": config["prompt"] + BATCH_INSTRUCTION}
+            for name, config in self.agent_configs.items()
+        }
+        baseline = sum(
+            self._estimate_call_tokens(config, tokens)
+            for tokens in numbered_tokens
+            for config in self.agent_configs.values()
+        )
+        estimated = 0
+        for pack in packs:
+            if len(pack.files) == 1:
+                configs, tokens = self.agent_configs, numbered_tokens[pack.files[0].index]
+            else:
+                configs, tokens = batch_configs, estimate_tokens(self._format_pack(pack))
+            estimated += sum(self._estimate_call_tokens(c, tokens) for c in configs.values())
+        return {
+            "packs": len(packs),
+            "packed_files": sum(len(p.files) for p in packs if len(p.files) > 1),
+            "llm_calls_per_file": len(self.agent_configs) * len(numbered_tokens),
+            "llm_calls_packed": len(self.agent_configs) * len(packs),
+            "estimated_prompt_tokens": estimated,
+            "estimated_baseline_prompt_tokens": baseline,
+            "estimated_prompt_tokens_saved": baseline - estimated,
+        }
+
+    @staticmethod
+    def _stats_of_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Contadores de ``stats`` reconstituídos do resultado de analyze_code."""
+        cache = result.get("cache") or {}
+        agent_calls = result.get("agent_calls") or {}
+        hedging = result.get("hedging") or {}
+        return {
+            "cache_hits": cache.get("hits", 0),
+            "cache_misses": cache.get("misses", 0),
+            "attempts": agent_calls.get("attempts", {}),
+            "retries": agent_calls.get("retries", 0),
+            "overflow_splits": agent_calls.get("overflow_splits", 0),
+            "hedge_armed": hedging.get("armed_calls", 0),
+            "hedges": hedging.get("hedges", 0),
+            "hedge_wins": hedging.get("hedge_wins", 0),
+            "hedge_control": hedging.get("control_calls", 0),
+            "skipped_agents": (result.get("gating") or {}).get("skipped_agents", {}),
+        }
+
+    @staticmethod
+    def _merge_batch_stats(total: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        """Soma os contadores de um arquivo ou pacote aos do batch."""
+        for key in BATCH_COUNTERS:
+            total[key] = total.get(key, 0) + stats.get(key, 0)
+        for key in ("attempts", "skipped_agents"):
+            merged = total.setdefault(key, {})
+            for agent, count in stats.get(key, {}).items():
+                merged[agent] = merged.get(agent, 0) + count
+
+    async def analyze_batch(
+        self,
+        files: List[tuple],
+        project_name: str = "Code",
+        use_cache: bool = True,
+        gating: bool = False,
+        max_pack_tokens: Optional[int] = None,
+        budget: Optional[BudgetGovernor] = None,
+    ) -> Dict[str, Any]:
+        """Analisa vários arquivos empacotando os pequenos na mesma chamada.
+
+        ``files`` é uma lista de (file_path, código). Arquivos cujo código
+        numerado cabe em ``max_pack_tokens`` (padrão BATCH_PACK_MAX_TOKENS)
+        são agrupados e cada agente recebe o pacote inteiro, com um cabeçalho
+        por arquivo; arquivos maiores (ou que ficaram sozinhos no pacote)
+        seguem por analyze_code normalmente. Retorna o resultado por arquivo,
+        o uso total de tokens e a economia estimada de tokens de prompt.
+        """
+        stats = {"cache_hits": 0, "cache_misses": 0, "skipped_agents": {}}
+        file_results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        valid_files = []
+        for index, (file_path, code) in enumerate(files):
+            valid, error = self._validate_code_size(code, chunked=not self.agent_configs)
+            if not valid:
+                logger.warning("Arquivo rejeitado no batch: %s (%s)", file_path, error)
+                file_results[index] = {
+                    "file_path": file_path,
+                    "total_smells_detected": 0,
+                    "code_smells": [],
+                    "error": error,
+                }
+                continue
+            valid_files.append((index, file_path, code))
+
+        numbered_tokens = [
+            estimate_tokens(self._format_code_with_line_numbers(code))
+            for _, _, code in valid_files
+        ]
+        # Sem agentes LLM não há prompt a economizar: um "pacote" por arquivo
+        packer = FilePacker(
+            (max_pack_tokens or settings.BATCH_PACK_MAX_TOKENS) if self.agent_configs else 0
+        )
+        packs = packer.pack([(path, code) for _, path, code in valid_files], numbered_tokens)
+
+        async def _run(pack: FilePack) -> tuple:
+            if len(pack.files) == 1:
+                packed = pack.files[0]
+                result = await self.analyze_code(
+                    packed.code, packed.file_path, project_name, use_cache, gating=gating, budget=budget
+                )
+                return pack, result
+            pack_stats: Dict[str, Any] = {"budget": budget}
+            outcome = await self._analyze_pack(
+                pack, project_name, use_cache, pack_stats, gating
+            )
+            return pack, (*outcome, pack_stats)
+
+        total_token_usage = self._create_empty_token_usage()
+        for pack, outcome in await asyncio.gather(*[_run(pack) for pack in packs]):
+            if len(pack.files) == 1:
+                packed = pack.files[0]
+                self._aggregate_token_usage(total_token_usage, outcome["token_usage"])
+                self._merge_batch_stats(stats, self._stats_of_result(outcome))
+                agent_calls = outcome.get("agent_calls") or {}
+                file_results[valid_files[packed.index][0]] = {
+                    "file_path": packed.file_path,
+                    "total_smells_detected": outcome["total_smells_detected"],
+                    "code_smells": outcome["code_smells"],
+                    "packed": False,
+                    "failed_agents": agent_calls.get("failed_agents", {}),
+                    "truncated_agents": agent_calls.get("truncated_agents", []),
+                    **({"error": outcome["error"]} if "error" in outcome else {}),
+                }
+                continue
+
+            by_file, token_usage, pack_stats = outcome
+            self._aggregate_token_usage(total_token_usage, token_usage)
+            self._merge_batch_stats(stats, pack_stats)
+            for packed in pack.files:
+                detections = by_file[packed.index] + self._analyze_static(
+                    packed.code, packed.file_path, project_name
+                )
+                file_results[valid_files[packed.index][0]] = {
+                    "file_path": packed.file_path,
+                    "total_smells_detected": len(detections),
+                    "code_smells": [self._to_result(d) for d in detections],
+                    "packed": True,
+                    "failed_agents": pack_stats.get("failed_agents", {}),
+                    "truncated_agents": pack_stats.get("truncated_agents", []),
+                }
+
+        packing = self._estimate_packing_savings(packs, numbered_tokens)
+        packing["unattributed_detections"] = stats.get("unattributed_detections", 0)
+        metrics.increment("batch.files", len(files))
+        metrics.increment("batch.prompt_tokens_saved", packing["estimated_prompt_tokens_saved"])
+        logger.info(
+            "Batch: %s arquivos em %s pacotes | Tokens de prompt economizados (est.): %s",
+            len(files),
+            packing["packs"],
+            packing["estimated_prompt_tokens_saved"],
+        )
+
+        result = {
+            "total_smells_detected": sum(r["total_smells_detected"] for r in file_results),
+            "files": file_results,
+            "agents_executed": self.smell_agent_count,
+            "token_usage": total_token_usage,
+            "prompt_cache": self._summarize_prompt_cache(total_token_usage),
+            "cache": {
+                "enabled": use_cache,
+                "hits": stats["cache_hits"],
+                "misses": stats["cache_misses"],
+            },
+            "packing": packing,
+        }
+        if self.agent_configs:
+            result["agent_calls"] = {
+                "attempts": stats.get("attempts", {}),
+                "retries": stats.get("retries", 0),
+                "overflow_splits": stats.get("overflow_splits", 0),
+            }
+        if self.hedging:
+            result["hedging"] = self._summarize_hedging(stats)
+        if gating:
+            result["gating"] = {"skipped_agents": stats["skipped_agents"]}
+        return result
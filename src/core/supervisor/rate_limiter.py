@@ -0,0 +1,292 @@
+"""Agendador global de chamadas ao provedor com limites por modelo."""
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+import openai
+
+from core.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 429 informado só no corpo do erro (ex.: erro do provedor no meio do stream)
+_RATE_LIMIT_MESSAGE = re.compile(
+    r"\b(?:http|status|error|code)\W{0,3}429\b|\brate[ _-]limit|\btoo many requests\b",
+    re.IGNORECASE,
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Indica se a exceção corresponde a um HTTP 429 do provedor.
+
+    Decide pelo status HTTP; o texto só é consultado em erros da API sem
+    status, nunca em erros de parsing ou validação, cujas mensagens citam
+    trechos da resposta do modelo (números de linha, constantes).
+    """
+    if isinstance(error, openai.RateLimitError):
+        return True
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    if isinstance(error, openai.APIError) and not isinstance(error, openai.APIStatusError):
+        return bool(_RATE_LIMIT_MESSAGE.search(str(error)))
+    return False
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Lê o cabeçalho Retry-After (em segundos) da resposta de erro, se houver."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitTicket:
+    """Reserva de capacidade para uma chamada."""
+
+    estimated_tokens: int
+    queue_wait_seconds: float = 0.0
+    actual_tokens: Optional[int] = None
+    # Tokens descontados do orçamento de TPM (estimativa limitada ao TPM)
+    reserved_tokens: int = 0
+
+
+class ProviderRateLimiter:
+    """Limita chamadas de um modelo por RPM, TPM e concorrência adaptativa.
+
+    A concorrência segue AIMD: cresce em 1 a cada janela de chamadas bem
+    sucedidas abaixo da latência alvo e cai pela metade a cada 429. Um 429
+    também pausa novas chamadas pelo Retry-After informado pelo provedor.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        target_latency_seconds: float = 60.0,
+    ):
+        self.model = model
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max(max_concurrency, 1)
+        self.min_concurrency = max(min(min_concurrency, self.max_concurrency), 1)
+        self.target_latency_seconds = target_latency_seconds
+
+        self.concurrency = max(self.max_concurrency // 2, self.min_concurrency)
+        self.in_flight = 0
+        self.rate_limited_count = 0
+        self.completed_count = 0
+        self._successes_since_increase = 0
+        self._paused_until = 0.0
+
+        now = time.monotonic()
+        self._request_budget = float(requests_per_minute)
+        self._token_budget = float(tokens_per_minute)
+        self._last_refill = now
+
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Primitivas asyncio ficam presas ao loop do primeiro uso; scripts
+        # podem chamar asyncio.run várias vezes no mesmo processo.
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_budget = min(
+                float(self.requests_per_minute),
+                self._request_budget + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute:
+            self._token_budget = min(
+                float(self.tokens_per_minute),
+                self._token_budget + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _seconds_until_available(self, tokens: int, now: float) -> float:
+        """Tempo até haver orçamento para a chamada (0 se já houver)."""
+        waits = [self._paused_until - now]
+        if self.requests_per_minute and self._request_budget < 1:
+            waits.append((1 - self._request_budget) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute and self._token_budget < tokens:
+            waits.append((tokens - self._token_budget) * 60 / self.tokens_per_minute)
+        return max(max(waits), 0.0)
+
+    async def _acquire(self, estimated_tokens: int) -> tuple[float, int]:
+        """Aguarda capacidade e reserva um slot.
+
+        Retorna o tempo de espera e os tokens descontados do orçamento de TPM.
+        """
+        condition = self._get_condition()
+        tokens = (
+            min(estimated_tokens, self.tokens_per_minute)
+            if self.tokens_per_minute
+            else estimated_tokens
+        )
+        started = time.monotonic()
+
+        async with condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._seconds_until_available(tokens, now)
+                if self.in_flight < self.concurrency and delay <= 0:
+                    break
+                timeout = delay if self.in_flight < self.concurrency else None
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            self.in_flight += 1
+            if self.requests_per_minute:
+                self._request_budget -= 1
+            if self.tokens_per_minute:
+                self._token_budget -= tokens
+
+        return time.monotonic() - started, tokens
+
+    async def _release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(self.in_flight - 1, 0)
+            condition.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        self.completed_count += 1
+        metrics.observe(f"llm.latency_seconds.{self.model}", latency)
+
+        if latency > self.target_latency_seconds:
+            if self.concurrency > self.min_concurrency:
+                self.concurrency -= 1
+                logger.info(
+                    "[rate-limit] %s: latência %.1fs acima do alvo, concorrência -> %s",
+                    self.model,
+                    latency,
+                    self.concurrency,
+                )
+            self._successes_since_increase = 0
+            return
+
+        self._successes_since_increase += 1
+        if (
+            self._successes_since_increase >= self.concurrency
+            and self.concurrency < self.max_concurrency
+        ):
+            self.concurrency += 1
+            self._successes_since_increase = 0
+
+    def _on_rate_limited(self, retry_after: Optional[float]) -> None:
+        self.rate_limited_count += 1
+        metrics.increment(f"llm.rate_limited.{self.model}")
+        self.concurrency = max(self.concurrency // 2, self.min_concurrency)
+        self._successes_since_increase = 0
+        pause = retry_after if retry_after is not None else 1.0
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        logger.warning(
+            "[rate-limit] %s: 429 recebido, concorrência -> %s, pausa de %.1fs",
+            self.model,
+            self.concurrency,
+            pause,
+        )
+
+    def _reconcile_tokens(self, ticket: RateLimitTicket) -> None:
+        """Ajusta o orçamento de tokens com o uso real da chamada."""
+        if not self.tokens_per_minute or ticket.actual_tokens is None:
+            return
+        self._token_budget = min(
+            float(self.tokens_per_minute),
+            self._token_budget + ticket.reserved_tokens - ticket.actual_tokens,
+        )
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[RateLimitTicket]:
+        """Reserva capacidade para uma chamada ao modelo.
+
+        O chamador pode preencher ``ticket.actual_tokens`` com o uso real
+        para que o orçamento de TPM seja corrigido ao final.
+        """
+        wait, reserved = await self._acquire(estimated_tokens)
+        metrics.observe("llm.queue_wait_seconds", wait)
+        metrics.observe(f"llm.queue_wait_seconds.{self.model}", wait)
+
+        ticket = RateLimitTicket(
+            estimated_tokens=estimated_tokens, queue_wait_seconds=wait, reserved_tokens=reserved
+        )
+        started = time.monotonic()
+        try:
+            yield ticket
+        except BaseException as e:
+            if is_rate_limit_error(e):
+                self._on_rate_limited(get_retry_after(e))
+            raise
+        else:
+            self._on_success(time.monotonic() - started)
+            self._reconcile_tokens(ticket)
+        finally:
+            await self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado atual do limitador."""
+        return {
+            "model": self.model,
+            "concurrency": self.concurrency,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "completed": self.completed_count,
+            "rate_limited": self.rate_limited_count,
+            "queue_wait_seconds": metrics.summary(f"llm.queue_wait_seconds.{self.model}"),
+        }
+
+
+_rate_limiters: Dict[str, ProviderRateLimiter] = {}
+
+
+def get_rate_limiter(model: str) -> ProviderRateLimiter:
+    """Retorna o limitador compartilhado do processo para o modelo."""
+    if model not in _rate_limiters:
+        from config.settings import settings
+
+        options = {
+            "requests_per_minute": settings.RATE_LIMIT_RPM,
+            "tokens_per_minute": settings.RATE_LIMIT_TPM,
+            "max_concurrency": settings.RATE_LIMIT_MAX_CONCURRENCY,
+            "min_concurrency": settings.RATE_LIMIT_MIN_CONCURRENCY,
+            "target_latency_seconds": settings.RATE_LIMIT_TARGET_LATENCY_SECONDS,
+        }
+        options.update(settings.RATE_LIMIT_OVERRIDES.get(model, {}))
+        _rate_limiters[model] = ProviderRateLimiter(model, **options)
+    return _rate_limiters[model]
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Estado de todos os limitadores criados no processo."""
+    return {model: limiter.stats() for model, limiter in _rate_limiters.items()}
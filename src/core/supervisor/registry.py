@@ -0,0 +1,125 @@
+"""Registro de supervisores com ciclo de vida do processo."""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+import httpx
+
+from config.settings import settings
+from core.supervisor.supervisor import CodeSmellSupervisor
+
+logger = logging.getLogger(__name__)
+
+
+class SupervisorRegistry:
+    """Mantém supervisores reutilizáveis e um pool HTTP compartilhado.
+
+    Os supervisores são indexados por (modelo, prompt_type, parallel,
+    grouping, layout, engine, hedging) e todos usam o mesmo
+    ``httpx.AsyncClient``, de modo que conexões e sessões TLS com o provedor são reaproveitadas entre
+    requisições e entre agentes.
+    """
+
+    def __init__(self):
+        self._supervisors: Dict[Tuple, CodeSmellSupervisor] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Fechamentos de pools antigos em andamento (referência evita o GC da task)
+        self._closing: Set[asyncio.Task] = set()
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS),
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartilhado (criado sob demanda)."""
+        if self._http_client is None:
+            self._http_client = self._create_http_client()
+        return self._http_client
+
+    async def start(self) -> None:
+        """Inicializa o pool HTTP no loop corrente."""
+        self._ensure_loop()
+        logger.info("Registro de supervisores iniciado")
+
+    async def stop(self) -> None:
+        """Fecha o pool HTTP e descarta os supervisores."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._supervisors.clear()
+        self._loop = None
+        logger.info("Registro de supervisores finalizado")
+
+    @staticmethod
+    async def _close_http_client(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Falha ao fechar pool HTTP antigo: %s", e)
+
+    def _ensure_loop(self) -> None:
+        # Conexões httpx pertencem ao loop em que foram abertas; se o processo
+        # trocar de loop (várias chamadas a asyncio.run), fecha o pool antigo
+        # (no loop corrente) e cria outro.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is not None and self._loop is not loop:
+            if self._http_client is not None:
+                task = loop.create_task(self._close_http_client(self._http_client))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            self._http_client = None
+            self._supervisors.clear()
+        self._loop = loop
+        _ = self.http_client
+
+    def get(
+        self,
+        parallel: bool = True,
+        prompt_type: str = "simple",
+        grouping: str = "none",
+        layout: str = "prompt_first",
+        engine: str = "llm",
+        hedging: bool = False,
+        model: Optional[str] = None,
+    ) -> CodeSmellSupervisor:
+        """Retorna o supervisor da configuração, criando-o na primeira vez."""
+        self._ensure_loop()
+        model = model or settings.OPENROUTER_API_MODEL
+        key = (
+            model,
+            prompt_type,
+            parallel,
+            grouping,
+            layout,
+            engine,
+            hedging,
+        )
+        if key not in self._supervisors:
+            self._supervisors[key] = CodeSmellSupervisor(
+                parallel=parallel,
+                prompt_type=prompt_type,
+                grouping=grouping,
+                layout=layout,
+                http_async_client=self.http_client,
+                engine=engine,
+                hedging=hedging,
+                model=model,
+            )
+        return self._supervisors[key]
+
+    def __len__(self) -> int:
+        return len(self._supervisors)
+
+
+supervisor_registry = SupervisorRegistry()
@@ -0,0 +1,90 @@
+"""Classificação de erros do provedor e política de novas tentativas."""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import httpx
+import openai
+from langchain_core.exceptions import OutputParserException
+from pydantic import ValidationError
+
+from core.supervisor.llm_backend import ReplayMissError
+from core.supervisor.rate_limiter import get_retry_after, is_rate_limit_error
+from core.supervisor.streaming import TruncatedResponseError
+
+# Status HTTP que indicam falha transitória do provedor
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429}
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(error: BaseException) -> Tuple[bool, str]:
+    """Classifica a falha de uma chamada ao agente. Retorna (retentável, motivo).
+
+    Retentáveis: rate limit, 5xx, timeout e falhas de conexão. Terminais:
+    resposta fora do schema, erro de parsing, limite de tokens de saída e
+    demais erros do cliente (4xx), que se repetiriam na nova tentativa. Uma
+    requisição sem resposta gravada no replay tem motivo próprio
+    (``replay_miss``), para não se confundir com uma resposta fora do schema.
+    """
+    if isinstance(error, ReplayMissError):
+        return False, "replay_miss"
+    if isinstance(error, (openai.LengthFinishReasonError, TruncatedResponseError)):
+        return False, "length_limit"
+    # Antes do rate limit: mensagens de parsing citam a resposta do modelo
+    if isinstance(error, OutputParserException):
+        return False, "parsing"
+    if isinstance(error, (ValidationError, ValueError, KeyError, AttributeError)):
+        return False, "schema"
+    if isinstance(error, (openai.APITimeoutError, httpx.TimeoutException, asyncio.TimeoutError)):
+        return True, "timeout"
+    if isinstance(
+        error, (openai.APIConnectionError, httpx.TransportError, ConnectionError)
+    ):
+        return True, "connection"
+    if is_rate_limit_error(error):
+        return True, "rate_limit"
+
+    status = _status_code(error)
+    if status is not None:
+        if status >= 500:
+            return True, "server_error"
+        if status in RETRYABLE_STATUS_CODES:
+            return True, f"http_{status}"
+        return False, f"http_{status}"
+
+    message = str(error).lower()
+    if "parsing" in message or "output_parsing_failure" in message:
+        return False, "parsing"
+    if "length limit was reached" in message:
+        return False, "length_limit"
+    return False, "unknown"
+
+
+@dataclass
+class RetryPolicy:
+    """Backoff exponencial limitado com jitter ("full jitter").
+
+    A espera da tentativa n é sorteada em [0, min(max_delay, base_delay * 2^(n-1))];
+    se o provedor enviar Retry-After, espera pelo menos esse tempo.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Segundos até a próxima tentativa, após a tentativa ``attempt`` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        retry_after = get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
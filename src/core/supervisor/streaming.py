@@ -0,0 +1,151 @@
+"""Consumo em streaming das respostas dos agentes, com recuperação parcial."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import openai
+from langchain_core.exceptions import OutputParserException
+from pydantic import BaseModel, ValidationError
+
+from core.utils.incremental_json import IncrementalJSONParser, JSONPath
+from core.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TruncatedResponseError(Exception):
+    """A resposta atingiu o limite de tokens de saída.
+
+    ``response`` traz as detecções completas recebidas antes do corte, no
+    schema do agente; ``token_usage`` vem do provedor quando o corte interrompe
+    o stream antes dos callbacks, e senão é preenchido por quem fez a chamada.
+    """
+
+    def __init__(self, response: BaseModel, detections: int):
+        super().__init__(
+            f"Resposta cortada pelo limite de tokens após {detections} detecções completas"
+        )
+        self.response = response
+        self.detections = detections
+        self.token_usage: Optional[Dict[str, int]] = None
+
+
+def _usage_of(error: openai.LengthFinishReasonError) -> Optional[Dict[str, int]]:
+    """Uso de tokens informado na resposta cortada (formato de TokenUsageCallback)."""
+    usage = getattr(getattr(error, "completion", None), "usage", None)
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "completion_tokens": usage.completion_tokens or 0,
+        "total_tokens": usage.total_tokens or 0,
+        "cached_prompt_tokens": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+def detection_type_of(schema: Any) -> Optional[type]:
+    """Tipo de detecção de um Multiple*Response (None se não for uma lista de detecções)."""
+    field = getattr(schema, "model_fields", {}).get("detections")
+    args = getattr(field.annotation, "__args__", None) if field is not None else None
+    return args[0] if args else None
+
+
+class StreamingStructuredModel:
+    """Substituto de ``with_structured_output(schema, method="json_mode")`` em streaming.
+
+    Os tokens são lidos conforme chegam e passados a um IncrementalJSONParser;
+    cada detecção completa é validada isoladamente no modelo de detecção do
+    agente (ou do membro, em agentes fundidos). Assim uma detecção inválida é
+    descartada sem perder as demais, um array "solto" ou com outra chave no
+    lugar de ``detections`` é aproveitado, e uma resposta cortada pelo limite de
+    tokens ainda entrega tudo o que chegou completo (TruncatedResponseError).
+
+    Com ``response_format`` o ChatOpenAI lê o stream pela API beta do SDK, que
+    lança LengthFinishReasonError no corte antes do último chunk; o erro é
+    convertido em TruncatedResponseError com as detecções já recebidas.
+    """
+
+    def __init__(self, model: Any, schema: Any):
+        self.schema = schema
+        self.runnable = model.bind(response_format={"type": "json_object"})
+        self.detection_type = detection_type_of(schema)
+        # Agente fundido: uma seção (Multiple*Response) por membro
+        self.members: Dict[str, tuple] = {}
+        if self.detection_type is None:
+            for name, field in schema.model_fields.items():
+                self.members[name] = (field.annotation, detection_type_of(field.annotation))
+
+    @staticmethod
+    def supports(schema: Any) -> bool:
+        """Se o schema tem o formato {detections, detected} (direto ou por membro)."""
+        if detection_type_of(schema) is not None:
+            return True
+        fields = getattr(schema, "model_fields", {})
+        return bool(fields) and all(
+            detection_type_of(field.annotation) is not None for field in fields.values()
+        )
+
+    def _route(self, path: JSONPath) -> tuple:
+        """Seção e tipo de detecção de um objeto, pelo caminho do array que o contém."""
+        if not self.members:
+            # {"detections": [...]}, outra chave qualquer no topo ou array na raiz
+            return (None, self.detection_type) if len(path) <= 1 else (None, None)
+        if path and path[0] in self.members and path[1:] in ((), ("detections",)):
+            return path[0], self.members[path[0]][1]
+        return None, None
+
+    def _build(self, collected: Dict[Optional[str], List[Any]]) -> BaseModel:
+        if not self.members:
+            detections = collected.get(None, [])
+            return self.schema(detections=detections, detected=bool(detections))
+        sections = {}
+        for name, (member_schema, _) in self.members.items():
+            detections = collected.get(name, [])
+            sections[name] = member_schema(detections=detections, detected=bool(detections))
+        return self.schema(**sections)
+
+    async def ainvoke(self, messages: Any, config: Optional[Dict[str, Any]] = None) -> BaseModel:
+        """Consome o stream e devolve a resposta no schema do agente."""
+        parser = IncrementalJSONParser()
+        collected: Dict[Optional[str], List[Any]] = {}
+        count = 0
+        finish_reason = None
+        usage = None
+        try:
+            async for chunk in self.runnable.astream(messages, config=config):
+                content = chunk.content if isinstance(chunk.content, str) else ""
+                for path, item in parser.feed(content):
+                    section, detection_type = self._route(path)
+                    if detection_type is None:
+                        continue
+                    try:
+                        detection = detection_type.model_validate(item)
+                    except ValidationError as e:
+                        # Ex: LongIdentifier com length <= threshold
+                        metrics.increment("llm.stream.invalid_detections")
+                        logger.debug("Detecção inválida descartada: %s", e)
+                        continue
+                    collected.setdefault(section, []).append(detection)
+                    count += 1
+                finish_reason = (
+                    (chunk.response_metadata or {}).get("finish_reason") or finish_reason
+                )
+        except openai.LengthFinishReasonError as e:
+            finish_reason = "length"
+            usage = _usage_of(e)
+
+        response = self._build(collected)
+        if finish_reason == "length":
+            metrics.increment("llm.stream.truncated_responses")
+            error = TruncatedResponseError(response, count)
+            error.token_usage = usage
+            raise error
+        if not parser.complete:
+            if not count:
+                raise OutputParserException(
+                    f"Resposta sem JSON válido: {parser.text[:200]!r}"
+                )
+            metrics.increment("llm.stream.recovered_responses")
+            logger.warning("JSON incompleto: mantidas %s detecções completas", count)
+        return response
@@ -2,42 +2,199 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
 from langchain_core.exceptions import LangChainException
 from langchain_openai import ChatOpenAI
+from pydantic import ValidationError
 
 from config.settings import settings
-from core.supervisor.agent_config import get_agent_configs
+from core.supervisor.agent_config import GROUPING_MODES, get_agent_configs
+from core.supervisor.budget import BudgetGovernor, get_budget_governor
+from core.supervisor.hedging import HedgingMixin, get_hedge_policy
+from core.supervisor.incremental import IncrementalMixin
+from core.supervisor.llm_backend import ReplayMissError, wrap_chat_model
+from core.supervisor.output_budget import get_output_budget
+from core.supervisor.overflow import OverflowSplitMixin
+from core.supervisor.packing import BatchAnalysisMixin
+from core.supervisor.rate_limiter import get_rate_limiter
+from core.supervisor.retry_policy import RetryPolicy, classify_error
+from core.supervisor.streaming import StreamingStructuredModel, TruncatedResponseError
+from core.utils.code_chunker import CodeChunker
 from core.utils.code_parser import CodeParser
+from core.utils.code_slicer import CodeSlicer
+from core.utils.file_packer import FILE_HEADER_LINE
+from core.utils.fingerprint_store import get_fingerprint_store
+from core.utils.metrics import metrics
+from core.utils.response_cache import ResponseCache, get_response_cache
+from core.utils.static_detector import StaticSmellDetector
+from core.utils.static_gate import StaticGate
+from core.utils.token_estimator import (
+    estimate_prompt_tokens,
+    estimate_tokens,
+    estimate_tokens_for_length,
+)
 from core.utils.token_tracker import TokenUsageCallback
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_MESSAGE = (
+    "You are a code smell detector. "
+    "ALWAYS respond with valid JSON only. "
+    "Never respond with explanations or questions. "
+    "If no smells are found, return {\"detections\": [], \"detected\": false}. "
+    "If smells are found, return {\"detections\": [...], \"detected\": true}."
+)
 
-class CodeSmellSupervisor:
-    """Coordena 11 agentes especializados para detectar code smells."""
+GROUP_SYSTEM_MESSAGE = (
+    "You are a code smell detector. "
+    "ALWAYS respond with valid JSON only. "
+    "Never respond with explanations or questions. "
+    "Return one JSON object with one key per requested section. "
+    "For each section, use {\"detections\": [], \"detected\": false} if no smells are found "
+    "or {\"detections\": [...], \"detected\": true} if smells are found."
+)
+
+# "prompt_first": instruções do agente antes do código (layout original).
+# "code_first": mensagem de sistema + código numerado primeiro e instruções do
+# agente por último, de modo que as chamadas de um mesmo arquivo compartilhem
+# o prefixo e o cache de prompt do provedor possa ser aproveitado.
+MESSAGE_LAYOUTS = ("prompt_first", "code_first")
+
+# "llm": os 11 agentes via LLM (padrão).
+# "static": só os smells baseados em métricas, calculados pela AST, sem LLM.
+# "hybrid": smells de métricas pela AST e LLM apenas para os semânticos.
+ENGINES = ("llm", "static", "hybrid")
+
+
+def validate_options(grouping: str = "none", layout: str = "prompt_first", engine: str = "llm"):
+    """Levanta ValueError para opções de supervisor inválidas, sem criá-lo."""
+    if grouping not in GROUPING_MODES:
+        raise ValueError(
+            f"grouping inválido: {grouping} (opções: {', '.join(GROUPING_MODES)})"
+        )
+    if layout not in MESSAGE_LAYOUTS:
+        raise ValueError(f"layout inválido: {layout} (opções: {', '.join(MESSAGE_LAYOUTS)})")
+    if engine not in ENGINES:
+        raise ValueError(f"engine inválida: {engine} (opções: {', '.join(ENGINES)})")
+
+
+@lru_cache(maxsize=32)
+def _candidate_counts(code: str) -> Dict[str, int]:
+    """Candidatos estáticos por agente, calculados uma vez por trecho de código.
+
+    Em pacotes (FilePack.source), soma os candidatos de cada arquivo.
+    """
+    totals: Dict[str, int] = {}
+    for segment in FILE_HEADER_LINE.split(code):
+        for name, count in StaticGate(segment).candidate_counts().items():
+            totals[name] = totals.get(name, 0) + count
+    return totals
+
+
+class CodeSmellSupervisor(
+    OverflowSplitMixin, HedgingMixin, IncrementalMixin, BatchAnalysisMixin
+):
+    """Coordena 11 agentes especializados para detectar code smells.
+
+    Divisão de respostas cortadas, hedging, reanálise incremental e análise
+    em lote ficam nos mixins dos módulos vizinhos.
+    """
 
     MAX_FILE_LINES = 3000
     MAX_FILE_SIZE_KB = 500
+    MAX_CHUNKED_FILE_SIZE_KB = 5000
 
-    def __init__(self, parallel: bool = True, prompt_type: str = "simple"):
+    def __init__(
+        self,
+        parallel: bool = True,
+        prompt_type: str = "simple",
+        grouping: str = "none",
+        layout: str = "prompt_first",
+        http_async_client: Optional[Any] = None,
+        engine: str = "llm",
+        hedging: bool = False,
+        model: Optional[str] = None,
+    ):
+        validate_options(grouping=grouping, layout=layout, engine=engine)
         self.parallel = parallel
+        self.layout = layout
         self.prompt_type = prompt_type
-        self.agent_configs = get_agent_configs(prompt_type)
-        self.model = ChatOpenAI(
-            model=settings.OPENROUTER_API_MODEL,
+        self.grouping = grouping
+        self.engine = engine
+        self.static_agents = () if engine == "llm" else StaticSmellDetector.SUPPORTED_AGENTS
+        if engine == "static":
+            self.agent_configs = {}
+        else:
+            self.agent_configs = get_agent_configs(
+                prompt_type, grouping, exclude=self.static_agents
+            )
+        self.smell_agent_count = len(self.static_agents) + sum(
+            len(cfg.get("members", ())) or 1 for cfg in self.agent_configs.values()
+        )
+        chat_model = ChatOpenAI(
+            model=model or settings.OPENROUTER_API_MODEL,
             api_key=settings.OPENROUTER_API_KEY,
             base_url=settings.OPENROUTER_BASE_URL,
             temperature=0,
-            max_tokens=4096,  # Limite de tokens de resposta
+            max_tokens=settings.OUTPUT_MAX_TOKENS,  # Limite de tokens de resposta
+            max_retries=0,  # Novas tentativas ficam a cargo de self.retry_policy
+            stream_usage=True,  # Uso de tokens no último chunk do stream
+            http_async_client=http_async_client,
+        )
+        # LLM_BACKEND: chamada direta, gravação ou reprodução das respostas
+        self.model = wrap_chat_model(chat_model)
+        self._structured_models: Dict[Any, Any] = {}
+        # max_tokens previsto por agente e arquivo (ver OutputBudgetPolicy)
+        self.output_budget = get_output_budget()
+        # Hedging: chamadas lentas são duplicadas (opcionalmente em outro modelo)
+        self.hedging = hedging
+        self.hedge_policy = get_hedge_policy()
+        self.hedge_model = None
+        if hedging and settings.HEDGE_MODEL:
+            hedge_chat_model = ChatOpenAI(
+                model=settings.HEDGE_MODEL,
+                api_key=settings.OPENROUTER_API_KEY,
+                base_url=settings.OPENROUTER_BASE_URL,
+                temperature=0,
+                max_tokens=settings.OUTPUT_MAX_TOKENS,
+                max_retries=0,
+                stream_usage=True,
+                http_async_client=http_async_client,
+            )
+            self.hedge_model = wrap_chat_model(hedge_chat_model)
+        self._hedge_structured_models: Dict[Any, Any] = {}
+        self.chunker = CodeChunker(max_tokens=settings.CHUNK_MAX_TOKENS)
+        self.response_cache = get_response_cache()
+        self.fingerprint_store = get_fingerprint_store()
+        self.rate_limiter = get_rate_limiter(self.model.model_name)
+        self.hedge_rate_limiter = (
+            get_rate_limiter(settings.HEDGE_MODEL) if self.hedge_model else self.rate_limiter
         )
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            base_delay=settings.RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+        )
+        # Marcadores explícitos de cache só são aceitos por modelos Anthropic
+        model_id = self.model.model_name.lower()
+        self.use_cache_control = model_id.startswith("anthropic/") or "claude" in model_id
 
-    def _validate_code_size(self, code: str) -> tuple[bool, str]:
-        """Valida tamanho do código."""
+    def _validate_code_size(self, code: str, chunked: bool = False) -> tuple[bool, str]:
+        """Valida tamanho do código (limites maiores no modo em blocos)."""
         lines = code.split("\n")
         size_kb = len(code.encode("utf-8")) / 1024
 
+        if chunked:
+            if size_kb > self.MAX_CHUNKED_FILE_SIZE_KB:
+                return (
+                    False,
+                    f"Arquivo muito grande: {size_kb:.1f}KB (max: {self.MAX_CHUNKED_FILE_SIZE_KB}KB)",
+                )
+            return True, ""
+
         if len(lines) > self.MAX_FILE_LINES:
             return (
                 False,
@@ -52,32 +209,92 @@ class CodeSmellSupervisor:
 
         return True, ""
 
-    def _format_code_with_line_numbers(self, code: str) -> str:
+    def _format_code_with_line_numbers(self, code: str, start_line: int = 1) -> str:
         """Formata código com numeração de linhas para facilitar identificação."""
         lines = code.split("\n")
         numbered_lines = []
-        for i, line in enumerate(lines, start=1):
+        for i, line in enumerate(lines, start=start_line):
             numbered_lines.append(f"{i:4d} | {line}")
         return "\n".join(numbered_lines)
 
-    def _build_agent_message(self, prompt: str, code: str) -> str:
-        """Constrói mensagem completa para o agente."""
-        numbered_code = self._format_code_with_line_numbers(code)
+    def _format_sliced_code(
+        self, code: str, ranges: List[tuple], start_line: int = 1
+    ) -> str:
+        """Numera só os intervalos recortados, marcando as linhas omitidas."""
+        lines = code.split("\n")
+        parts = []
+        for index, (first, last) in enumerate(ranges):
+            if index or first > 1:
+                parts.append("   ... | (linhas omitidas)")
+            parts.append(
+                self._format_code_with_line_numbers(
+                    "\n".join(lines[first - 1 : last]), start_line + first - 1
+                )
+            )
+        if ranges and ranges[-1][1] < len(lines):
+            parts.append("   ... | (linhas omitidas)")
+        return "\n".join(parts)
+
+    def _build_code_section(self, numbered_code: str) -> str:
+        """Constrói a seção com o código numerado."""
         return (
-            f"{prompt}\n\n"
             f"## CODE (com numeração de linhas):\n"
             f"```python\n{numbered_code}\n```\n\n"
             "IMPORTANTE: Use o número da linha à esquerda (ex: '  7 |') "
             "para identificar a linha correta no campo Line_no."
         )
 
+    def _build_agent_message(self, prompt: str, numbered_code: str) -> str:
+        """Constrói mensagem completa para o agente."""
+        return f"{prompt}\n\n{self._build_code_section(numbered_code)}"
+
+    def _build_messages(self, config: Dict, numbered_code: str) -> List[Dict[str, Any]]:
+        """Monta as mensagens do agente conforme o layout configurado."""
+        system_message = self._system_message(config)
+
+        if self.layout == "prompt_first":
+            return [
+                {"role": "system", "content": system_message},
+                {
+                    "role": "user",
+                    "content": self._build_agent_message(config["prompt"], numbered_code),
+                },
+            ]
+
+        # code_first: prefixo idêntico para todos os agentes do mesmo arquivo
+        shared_prefix = f"{system_message}\n\n{self._build_code_section(numbered_code)}"
+        system_content: Any = shared_prefix
+        if self.use_cache_control:
+            system_content = [
+                {
+                    "type": "text",
+                    "text": shared_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        return [
+            {"role": "system", "content": system_content},
+            {
+                "role": "user",
+                "content": (
+                    f"{config['prompt']}\n\n"
+                    "Analise o código Python numerado fornecido na mensagem de sistema."
+                ),
+            },
+        ]
+
     def _add_metadata(
-        self, detections: List[Any], code: str, file_path: str, project: str
+        self,
+        detections: List[Any],
+        code: str,
+        file_path: str,
+        project: str,
+        parser: Optional[CodeParser] = None,
     ) -> List[Any]:
         """Adiciona metadados básicos às detecções e filtra falsos positivos."""
         from ..utils.detection_validator import DetectionValidator
 
-        parser = CodeParser(code, file_path)
+        parser = parser or CodeParser(code, file_path)
         valid = []
         validator = DetectionValidator()
 
@@ -110,8 +327,17 @@ class CodeSmellSupervisor:
 
         return valid
 
-    def _extract_detections(self, response: Any) -> List[Any]:
+    def _extract_detections(self, response: Any, config: Optional[Dict] = None) -> List[Any]:
         """Extrai lista de detecções da resposta do agente."""
+        # Agente fundido: separar as detecções de cada smell membro
+        if config is not None and "members" in config:
+            detections = []
+            for member in config["members"]:
+                detections.extend(
+                    self._extract_detections(getattr(response, member, None))
+                )
+            return detections
+
         # Se for um Multiple*Response, extrair a lista de detecções
         if hasattr(response, "detections") and response.detected:
             return response.detections
@@ -197,50 +423,194 @@ class CodeSmellSupervisor:
         except (json.JSONDecodeError, ValueError, TypeError):
             return []
 
+    @staticmethod
+    def _build_structured_model(model: ChatOpenAI, schema: Any) -> Any:
+        """Streaming com parsing incremental (LLM_STREAMING) ou structured output."""
+        if settings.LLM_STREAMING and StreamingStructuredModel.supports(schema):
+            return StreamingStructuredModel(model, schema)
+        return model.with_structured_output(schema, method="json_mode")
+
+    @staticmethod
+    def _with_max_tokens(model: ChatOpenAI, max_tokens: Optional[int]) -> ChatOpenAI:
+        """Cópia do modelo com outro limite de saída (mesmos clientes HTTP)."""
+        if max_tokens is None or max_tokens == model.max_tokens:
+            return model
+        return model.model_copy(update={"max_tokens": max_tokens})
+
+    def _get_structured_model(self, schema: Any, max_tokens: Optional[int] = None) -> Any:
+        """Runnable com structured output por schema e limite de saída (criado uma única vez)."""
+        key = (schema, max_tokens)
+        if key not in self._structured_models:
+            self._structured_models[key] = self._build_structured_model(
+                self._with_max_tokens(self.model, max_tokens), schema
+            )
+        return self._structured_models[key]
+
+    @staticmethod
+    def _system_message(config: Dict) -> str:
+        """Mensagem de sistema adequada ao formato de resposta do agente."""
+        return GROUP_SYSTEM_MESSAGE if "members" in config else SYSTEM_MESSAGE
+
+    def _get_cached_response(self, cache_key: str, schema: Any) -> Any:
+        """Reconstrói a resposta do agente a partir do cache, se existir."""
+        payload = self.response_cache.get(cache_key)
+        if payload is None:
+            return None
+        try:
+            return schema.model_validate(payload["response"])
+        except (ValidationError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _count(stats: Optional[Dict[str, Any]], key: str, amount: float = 1) -> None:
+        """Incrementa um contador da execução corrente, se houver."""
+        if stats is not None:
+            stats[key] = stats.get(key, 0) + amount
+
+    @staticmethod
+    def _messages_text(messages: List[Dict[str, Any]]) -> str:
+        """Concatena o texto das mensagens (para estimativa de tokens)."""
+        parts = []
+        for message in messages:
+            content = message["content"]
+            if isinstance(content, list):
+                parts.extend(block.get("text", "") for block in content)
+            else:
+                parts.append(content)
+        return "\n".join(parts)
+
     async def _call_agent(
-        self, agent_name: str, config: Dict, code: str
+        self,
+        agent_name: str,
+        config: Dict,
+        code: str,
+        use_cache: bool = True,
+        stats: Optional[Dict[str, Any]] = None,
+        start_line: int = 1,
+        numbered_code: Optional[str] = None,
+        deadline: Optional[float] = None,
+        depth: int = 0,
     ) -> tuple[List[Any], Dict[str, int]]:
-        """Executa um agente individual. Retorna (detections, token_usage)."""
-        token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        """Executa um agente individual. Retorna (detections, token_usage).
+
+        ``numbered_code`` substitui o código inteiro numerado quando o agente
+        recebe apenas um recorte (ver _slice_inputs). ``deadline`` é um
+        instante de ``time.monotonic()``: ao ser atingido, a chamada (com as
+        novas tentativas pendentes) é cancelada e o agente entra em
+        ``incomplete_agents``. Se a resposta passar do limite de tokens de
+        saída, o código é dividido ao meio (ver _split_overflow); ``depth`` é
+        o nível dessa divisão.
+        """
+        token_usage = self._create_empty_token_usage()
+        if numbered_code is None:
+            numbered_code = self._format_code_with_line_numbers(code, start_line)
+
+        cache_key = None
+        if use_cache:
+            cache_key = ResponseCache.make_key(
+                self.model.model_name,
+                self.prompt_type,
+                agent_name,
+                config["prompt"],
+                config["schema"],
+                numbered_code,
+            )
+            response = self._get_cached_response(cache_key, config["schema"])
+            if response is not None:
+                self._count(stats, "cache_hits")
+                detections = self._extract_detections(response, config)
+                logger.info("[%s] %s detecções | Cache", agent_name, len(detections))
+                return detections, token_usage
+            self._count(stats, "cache_misses")
+
+        budget = stats.get("budget") if stats is not None else None
+        if budget is not None and not budget.allows_calls():
+            logger.warning("[%s] Orçamento esgotado: chamada não realizada", agent_name)
+            budget.record_skip()
+            skipped = stats.setdefault("budget_skipped_agents", [])
+            if agent_name not in skipped:
+                skipped.append(agent_name)
+            return [], token_usage
+
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                logger.warning("[%s] Deadline atingido antes da chamada", agent_name)
+                self._mark_incomplete(stats, agent_name)
+                return [], token_usage
 
         try:
             token_callback = TokenUsageCallback()
-            structured_model = self.model.with_structured_output(
-                config["schema"], method="json_mode"
-            )
-            message = self._build_agent_message(config["prompt"], code)
+            messages = self._build_messages(config, numbered_code)
 
             logger.info("[%s] Executando...", agent_name)
 
-            response = await structured_model.ainvoke(
-                [
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a code smell detector. "
-                            "ALWAYS respond with valid JSON only. "
-                            "Never respond with explanations or questions. "
-                            "If no smells are found, return {\"detections\": [], \"detected\": false}. "
-                            "If smells are found, return {\"detections\": [...], \"detected\": true}."
-                        ),
-                    },
-                    {"role": "user", "content": message},
-                ],
-                config={"callbacks": [token_callback]},
+            response = await asyncio.wait_for(
+                self._invoke_with_budget(
+                    agent_name, config, code, messages, token_callback, stats, depth
+                ),
+                timeout,
             )
 
-            detections = self._extract_detections(response)
+            detections = self._extract_detections(response, config)
             token_usage = token_callback.token_usage
 
+            if cache_key is not None and hasattr(response, "model_dump"):
+                self.response_cache.set(
+                    cache_key,
+                    {
+                        "agent": agent_name,
+                        "model": self.model.model_name,
+                        "response": response.model_dump(mode="json"),
+                        "token_usage": token_usage,
+                    },
+                )
+
             logger.info(
-                "[%s] %s detecções | Tokens: %s",
+                "[%s] %s detecções | Tokens: %s (cache: %s)",
                 agent_name,
                 len(detections),
                 token_usage.get("total_tokens", 0),
+                token_usage.get("cached_prompt_tokens", 0),
             )
 
             return detections, token_usage
 
+        except asyncio.TimeoutError as e:
+            if deadline is None or time.monotonic() < deadline:
+                logger.error("[%s] Timeout: %s", agent_name, e)
+                self._record_failure(stats, agent_name, e)
+                return [], token_usage
+            logger.warning("[%s] Deadline atingido: chamada cancelada", agent_name)
+            self._mark_incomplete(stats, agent_name)
+            return [], token_usage
+        except TruncatedResponseError as e:
+            # Streaming: as detecções completas antes do corte são aproveitadas
+            logger.warning(
+                "[%s] Limite de tokens de resposta atingido (%s) com %s detecções completas",
+                agent_name,
+                settings.OUTPUT_MAX_TOKENS,
+                e.detections,
+            )
+            return await self._split_overflow(
+                agent_name,
+                config,
+                code,
+                numbered_code,
+                self._extract_detections(e.response, config),
+                e.token_usage or token_usage,
+                cache_key,
+                use_cache,
+                stats,
+                start_line,
+                deadline,
+                depth,
+            )
+        except ReplayMissError as e:
+            logger.error("[%s] Replay sem resposta gravada: %s", agent_name, e)
+            self._record_failure(stats, agent_name, e)
+            return [], token_usage
         except (ValueError, AttributeError, KeyError) as e:
             error_msg = str(e)
             # Tentar extrair detecções se o LLM retornou array diretamente
@@ -250,6 +620,7 @@ class CodeSmellSupervisor:
                     logger.info("[%s] Recuperado %s detecções de resposta em array", agent_name, len(detections))
                     return detections, token_usage
             logger.error("[%s] Erro de validação/atributo: %s", agent_name, e)
+            self._record_failure(stats, agent_name, e)
             return [], token_usage
         except LangChainException as e:
             error_msg = str(e)
@@ -268,25 +639,263 @@ class CodeSmellSupervisor:
                 )
             else:
                 logger.error("[%s] Erro do LangChain: %s", agent_name, e)
+            self._record_failure(stats, agent_name, e)
             return [], token_usage
         except Exception as e:  # pylint: disable=broad-except
             error_msg = str(e)
             # Tratar especificamente erro de limite de tokens
             if "length limit was reached" in error_msg or "LengthFinishReasonError" in error_msg:
+                # Sem streaming (LLM_STREAMING=false) o texto parcial não é recuperável
                 logger.warning(
-                    "[%s] Limite de tokens de resposta atingido (4096). "
-                    "Arquivo muito grande ou muitas detecções. Retornando detecções parciais.",
+                    "[%s] Limite de tokens de resposta atingido (%s). "
+                    "Arquivo muito grande ou muitas detecções.",
                     agent_name,
+                    settings.OUTPUT_MAX_TOKENS,
                 )
-                # Tentar extrair detecções parciais se possível
-                # Por enquanto, retornar vazio para evitar dados incompletos
-                return [], token_usage
+                return await self._split_overflow(
+                    agent_name,
+                    config,
+                    code,
+                    numbered_code,
+                    [],
+                    token_usage,
+                    cache_key,
+                    use_cache,
+                    stats,
+                    start_line,
+                    deadline,
+                    depth,
+                )
+            self._record_failure(stats, agent_name, e)
             logger.error("[%s] Erro inesperado: %s", agent_name, e, exc_info=True)
             return [], token_usage
 
+    async def _invoke_once(
+        self,
+        agent_name: str,
+        structured_model: Any,
+        rate_limiter: Any,
+        messages: List[Dict[str, Any]],
+        estimated_tokens: int,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> tuple[Any, Dict[str, int]]:
+        """Uma requisição ao modelo dentro do rate limiter. Retorna (resposta, token_usage)."""
+        token_callback = TokenUsageCallback()
+        async with rate_limiter.slot(estimated_tokens) as ticket:
+            self._count(stats, "queue_wait_seconds", ticket.queue_wait_seconds)
+            started = time.monotonic()
+            try:
+                response = await structured_model.ainvoke(
+                    messages,
+                    config={"callbacks": [token_callback]},
+                )
+            except TruncatedResponseError as e:
+                if e.token_usage is not None and not token_callback.token_usage["total_tokens"]:
+                    # Stream interrompido antes dos callbacks: uso informado no erro
+                    token_callback.token_usage = e.token_usage
+                e.token_usage = token_callback.token_usage
+                ticket.actual_tokens = token_callback.token_usage.get("total_tokens")
+                raise
+            finally:
+                # Gasto contabilizado por requisição, inclusive cortadas e hedges
+                budget = stats.get("budget") if stats is not None else None
+                if budget is not None:
+                    budget.record(rate_limiter.model, token_callback.token_usage)
+            ticket.actual_tokens = token_callback.token_usage.get("total_tokens")
+        metrics.observe(f"llm.agent_latency_seconds.{agent_name}", time.monotonic() - started)
+        return response, token_callback.token_usage
+
+    async def _invoke_with_budget(
+        self,
+        agent_name: str,
+        config: Dict,
+        code: str,
+        messages: List[Dict[str, Any]],
+        token_callback: TokenUsageCallback,
+        stats: Optional[Dict[str, Any]] = None,
+        depth: int = 0,
+    ) -> Any:
+        """Chama o agente com o ``max_tokens`` previsto para ele neste código.
+
+        O orçamento vem dos candidatos estáticos do agente (ver
+        StaticGate.candidate_counts e OutputBudgetPolicy). Se a resposta for
+        cortada por um orçamento menor que OUTPUT_MAX_TOKENS, a chamada é
+        repetida com o limite cheio; só um corte no limite cheio chega a
+        _call_agent (que então divide o código). Metades de uma divisão já
+        usam o limite cheio.
+        """
+        schema = config["schema"]
+        if not settings.OUTPUT_BUDGET_ADAPTIVE or depth:
+            return await self._invoke_with_retry(
+                agent_name, schema, messages, token_callback, stats
+            )
+
+        candidates = self.output_budget.candidates_for(
+            _candidate_counts(code), config.get("members") or [agent_name]
+        )
+        budget = self.output_budget.predict(agent_name, candidates)
+        agent_budget = None
+        if stats is not None:
+            agent_budget = stats.setdefault("output_budget", {}).setdefault(
+                agent_name,
+                {
+                    "calls": 0,
+                    "candidates": 0,
+                    "max_tokens": 0,
+                    "budgets": [],
+                    "completion_tokens": 0,
+                    "escalations": 0,
+                },
+            )
+            agent_budget["calls"] += 1
+            agent_budget["candidates"] += candidates
+            agent_budget["max_tokens"] += budget
+            # max_tokens de cada chamada, para reproduzir a requisição
+            agent_budget["budgets"].append(budget)
+
+        try:
+            response = await self._invoke_with_retry(
+                agent_name, schema, messages, token_callback, stats, budget
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            if classify_error(e)[1] != "length_limit":
+                raise
+            self.output_budget.record(agent_name, candidates, budget, None, truncated=True)
+            if budget >= settings.OUTPUT_MAX_TOKENS:
+                raise
+            spent = getattr(e, "token_usage", None) or self._create_empty_token_usage()
+            self._count(stats, "budget_escalations")
+            if agent_budget is not None:
+                agent_budget["escalations"] += 1
+            logger.warning(
+                "[%s] Orçamento de saída de %s tokens insuficiente (%s candidatos): "
+                "repetindo com %s",
+                agent_name,
+                budget,
+                candidates,
+                settings.OUTPUT_MAX_TOKENS,
+            )
+            try:
+                response = await self._invoke_with_retry(
+                    agent_name, schema, messages, token_callback, stats
+                )
+            except TruncatedResponseError as overflow:
+                usage = self._create_empty_token_usage()
+                self._aggregate_token_usage(usage, spent)
+                self._aggregate_token_usage(usage, overflow.token_usage or {})
+                overflow.token_usage = usage
+                raise
+            usage = self._create_empty_token_usage()
+            self._aggregate_token_usage(usage, spent)
+            self._aggregate_token_usage(usage, token_callback.token_usage)
+            token_callback.token_usage = usage
+            return response
+
+        completion_tokens = token_callback.token_usage.get("completion_tokens", 0)
+        self.output_budget.record(agent_name, candidates, budget, completion_tokens)
+        if agent_budget is not None:
+            agent_budget["completion_tokens"] += completion_tokens
+        return response
+
+    async def _invoke_with_retry(
+        self,
+        agent_name: str,
+        schema: Any,
+        messages: List[Dict[str, Any]],
+        token_callback: TokenUsageCallback,
+        stats: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Any:
+        """Chama o modelo repetindo falhas transitórias (ver RetryPolicy).
+
+        Cada tentativa passa pelo rate limiter (e pelo hedge, se ativo). Erros
+        terminais, ou o último erro retentável depois de esgotadas as
+        tentativas, são relançados para o tratamento de _call_agent.
+        """
+        estimated_tokens = estimate_tokens(self._messages_text(messages))
+        attempt = 0
+        while True:
+            attempt += 1
+            if stats is not None:
+                attempts = stats.setdefault("attempts", {})
+                attempts[agent_name] = attempts.get(agent_name, 0) + 1
+            try:
+                response, token_callback.token_usage = await self._invoke_hedged(
+                    agent_name, schema, messages, estimated_tokens, stats, max_tokens
+                )
+                return response
+            except Exception as e:  # pylint: disable=broad-except
+                retryable, reason = classify_error(e)
+                if reason == "rate_limit":
+                    self._count(stats, "rate_limited")
+                if not retryable or attempt >= self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                self._count(stats, "retries")
+                metrics.increment(f"llm.retries.{reason}")
+                logger.warning(
+                    "[%s] Falha transitória (%s): %s. Tentativa %s/%s em %.1fs",
+                    agent_name,
+                    reason,
+                    e,
+                    attempt + 1,
+                    self.retry_policy.max_attempts,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _record_failure(
+        stats: Optional[Dict[str, Any]], agent_name: str, error: BaseException
+    ) -> None:
+        """Registra o motivo final da falha de um agente (ver _summarize_agent_calls)."""
+        _, reason = classify_error(error)
+        metrics.increment(f"llm.failures.{reason}")
+        if stats is not None:
+            stats.setdefault("failed_agents", {})[agent_name] = {
+                "reason": reason,
+                "error": str(error)[:500],
+                "attempts": stats.get("attempts", {}).get(agent_name, 0),
+            }
+
+    @staticmethod
+    def _mark_incomplete(stats: Optional[Dict[str, Any]], agent_name: str) -> None:
+        """Registra um agente interrompido pelo deadline da requisição."""
+        metrics.increment("deadline.incomplete_agents")
+        if stats is not None:
+            incomplete = stats.setdefault("incomplete_agents", [])
+            if agent_name not in incomplete:
+                incomplete.append(agent_name)
+
+    @staticmethod
+    def _mark_truncated(stats: Optional[Dict[str, Any]], agent_name: str) -> None:
+        """Registra um agente cuja resposta foi cortada pelo limite de tokens."""
+        metrics.increment("llm.truncated_agents")
+        if stats is not None:
+            truncated = stats.setdefault("truncated_agents", [])
+            if agent_name not in truncated:
+                truncated.append(agent_name)
+
+    @staticmethod
+    def _summarize_agent_calls(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Tentativas por agente, total de retries e agentes que falharam ou foram cortados."""
+        return {
+            "attempts": stats.get("attempts", {}),
+            "retries": stats.get("retries", 0),
+            "failed_agents": stats.get("failed_agents", {}),
+            "truncated_agents": stats.get("truncated_agents", []),
+            "overflow_splits": stats.get("overflow_splits", 0),
+            "budget_skipped_agents": stats.get("budget_skipped_agents", []),
+        }
+
     def _create_empty_token_usage(self) -> Dict[str, int]:
         """Cria dicionário vazio para uso de tokens."""
-        return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        return {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "cached_prompt_tokens": 0,
+        }
 
     def _aggregate_token_usage(
         self, total: Dict[str, int], usage: Dict[str, int]
@@ -295,23 +904,287 @@ class CodeSmellSupervisor:
         total["prompt_tokens"] += usage.get("prompt_tokens", 0)
         total["completion_tokens"] += usage.get("completion_tokens", 0)
         total["total_tokens"] += usage.get("total_tokens", 0)
+        total["cached_prompt_tokens"] += usage.get("cached_prompt_tokens", 0)
+
+    @staticmethod
+    def _summarize_prompt_cache(token_usage: Dict[str, int]) -> Dict[str, Any]:
+        """Resume tokens de entrada servidos pelo cache de prompt do provedor."""
+        prompt_tokens = token_usage.get("prompt_tokens", 0)
+        cached = token_usage.get("cached_prompt_tokens", 0)
+        return {
+            "cached_prompt_tokens": cached,
+            "uncached_prompt_tokens": max(prompt_tokens - cached, 0),
+            "cached_ratio": round(cached / prompt_tokens, 4) if prompt_tokens else 0.0,
+        }
+
+    def _estimate_grouping_savings(self, code: str) -> Dict[str, Any]:
+        """Estima tokens de entrada do agrupamento atual vs. os 11 agentes."""
+        code_tokens = estimate_tokens(self._format_code_with_line_numbers(code))
+
+        def _prompt_tokens(configs: Dict) -> int:
+            return sum(
+                self._estimate_call_tokens(cfg, code_tokens) for cfg in configs.values()
+            )
+
+        baseline_configs = get_agent_configs(self.prompt_type)
+        estimated = _prompt_tokens(self.agent_configs)
+        baseline = _prompt_tokens(baseline_configs)
+        return {
+            "mode": self.grouping,
+            "llm_calls": len(self.agent_configs),
+            "baseline_llm_calls": len(baseline_configs),
+            "estimated_prompt_tokens": estimated,
+            "estimated_baseline_prompt_tokens": baseline,
+            "estimated_prompt_tokens_saved": baseline - estimated,
+        }
+
+    def _estimate_call_tokens(self, config: Dict, code_tokens: int) -> int:
+        """Estima os tokens de entrada de uma chamada de agente."""
+        return (
+            estimate_prompt_tokens(self._system_message(config))
+            + estimate_prompt_tokens(config["prompt"])
+            + estimate_prompt_tokens(self._build_agent_message("", ""))
+            + code_tokens
+        )
+
+    def estimate_files(
+        self, files: List[tuple[str, str]], gating: bool = False, chunked: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Estima chamadas e tokens de entrada por arquivo, sem chamar o modelo.
+
+        Usa a mesma montagem de prompt da análise (estimativa local de tokens);
+        com ``gating``, os agentes que a pré-análise estática pularia não
+        contam. Arquivos que analyze_code recusaria vêm com ``error``.
+        """
+        estimates = []
+        for file_path, code in files:
+            valid, error = self._validate_code_size(code, chunked)
+            if not valid:
+                estimates.append(
+                    {"file_path": file_path, "llm_calls": 0, "prompt_tokens": 0, "error": error}
+                )
+                continue
+            configs = self._select_configs(code, 1, gating) if self.agent_configs else {}
+            if chunked:
+                code_tokens = estimate_tokens(self._format_code_with_line_numbers(code))
+                calls_per_agent = len(self.chunker.split(code))
+            else:
+                # Até 9999 linhas o prefixo "%4d | " tem 7 caracteres: mesmo
+                # tamanho do código numerado sem montá-lo
+                numbered_length = len(code) + 7 * (code.count("\n") + 1)
+                code_tokens = estimate_tokens_for_length(numbered_length)
+                calls_per_agent = 1
+            estimates.append(
+                {
+                    "file_path": file_path,
+                    "llm_calls": len(configs) * calls_per_agent,
+                    "prompt_tokens": sum(
+                        self._estimate_call_tokens(cfg, 0) * calls_per_agent + code_tokens
+                        for cfg in configs.values()
+                    ),
+                }
+            )
+        return estimates
+
+    def _select_configs(
+        self,
+        code: str,
+        start_line: int = 1,
+        gating: bool = False,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Dict]:
+        """Remove agentes que a pré-análise estática garante que não disparam."""
+        if not gating:
+            return self.agent_configs
+
+        skippable = StaticGate(code).skippable_agents()
+        selected = {}
+        code_tokens = None
+
+        for name, config in self.agent_configs.items():
+            members = config.get("members") or {name: config["schema"]}
+            if not all(member in skippable for member in members):
+                selected[name] = config
+                continue
+
+            if code_tokens is None:
+                code_tokens = estimate_tokens(
+                    self._format_code_with_line_numbers(code, start_line)
+                )
+            saved = self._estimate_call_tokens(config, code_tokens)
+            metrics.increment(f"gate.skipped.{name}")
+            metrics.increment("gate.prompt_tokens_saved", saved)
+            if stats is not None:
+                skipped = stats.setdefault("skipped_agents", {})
+                skipped[name] = skipped.get(name, 0) + 1
+                self._count(stats, "gate_prompt_tokens_saved", saved)
+            logger.info(
+                "[%s] Pulado pela pré-análise: %s",
+                name,
+                "; ".join(skippable[member] for member in members),
+            )
+
+        return selected
+
+    def _slice_inputs(
+        self,
+        code: str,
+        configs: Dict[str, Dict],
+        start_line: int = 1,
+        stats: Optional[Dict[str, Any]] = None,
+        slicing: bool = True,
+        focus: Optional[Set[int]] = None,
+    ) -> tuple[Dict[str, Dict], Dict[str, str]]:
+        """Recorta o código de cada agente. Retorna (configs, código numerado por agente).
+
+        Com ``slicing``, cada agente recebe só as regiões que lhe interessam;
+        ``focus`` restringe o código às linhas informadas (análise
+        incremental). Agentes cujo recorte é vazio (ex: nenhum ``try`` para
+        Empty Catch Block) não têm o que analisar e são removidos.
+        """
+        slicer = CodeSlicer(code)
+        full_numbered = self._format_code_with_line_numbers(code, start_line)
+        full_tokens = estimate_tokens(full_numbered)
+        selected: Dict[str, Dict] = {}
+        inputs: Dict[str, str] = {}
+
+        for name, config in configs.items():
+            if slicing:
+                lines = slicer.lines_for(config.get("members") or [name], focus)
+            else:
+                lines = slicer.with_headers(focus)
+            if lines is None:
+                numbered = full_numbered
+            elif not lines:
+                numbered = ""
+            else:
+                numbered = self._format_sliced_code(
+                    code, CodeSlicer.to_ranges(lines), start_line
+                )
+            sliced_tokens = estimate_tokens(numbered)
+
+            if slicing:
+                metrics.increment("slicing.code_tokens_saved", full_tokens - sliced_tokens)
+            if slicing and stats is not None:
+                agent_stats = stats.setdefault("slicing", {}).setdefault(
+                    name, {"full_code_tokens": 0, "sliced_code_tokens": 0, "skipped": 0}
+                )
+                agent_stats["full_code_tokens"] += full_tokens
+                agent_stats["sliced_code_tokens"] += sliced_tokens
+                agent_stats["skipped"] += not numbered
+
+            if not numbered:
+                logger.info("[%s] Pulado: recorte sem regiões relevantes", name)
+                continue
+            selected[name] = config
+            inputs[name] = numbered
+
+        return selected, inputs
+
+    @staticmethod
+    def _summarize_slicing(slicing: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+        """Redução estimada de tokens de código por agente."""
+        agents = {}
+        for name, agent_stats in slicing.items():
+            full = agent_stats["full_code_tokens"]
+            sliced = agent_stats["sliced_code_tokens"]
+            agents[name] = {
+                **agent_stats,
+                "reduction_pct": round((full - sliced) / full * 100, 2) if full else 0.0,
+            }
+        full_total = sum(a["full_code_tokens"] for a in slicing.values())
+        sliced_total = sum(a["sliced_code_tokens"] for a in slicing.values())
+        return {
+            "agents": agents,
+            "estimated_code_tokens_saved": full_total - sliced_total,
+            "reduction_pct": (
+                round((full_total - sliced_total) / full_total * 100, 2) if full_total else 0.0
+            ),
+        }
+
+    def _prepare_calls(
+        self,
+        code: str,
+        start_line: int = 1,
+        gating: bool = False,
+        slicing: bool = False,
+        focus: Optional[Set[int]] = None,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> tuple[Dict[str, Dict], Dict[str, str]]:
+        """Agentes a chamar e, se houver recorte, o código numerado de cada um."""
+        configs = self._select_configs(code, start_line, gating, stats)
+        if not slicing and focus is None:
+            return configs, {}
+        return self._slice_inputs(code, configs, start_line, stats, slicing, focus)
+
+    def _analyze_static(self, code: str, file_path: str, project: str) -> List[Any]:
+        """Detecta os smells de métricas pela AST, sem chamadas ao LLM."""
+        if not self.static_agents:
+            return []
+        parser = CodeParser(code, file_path)
+        detections = StaticSmellDetector(code, parser.tree).detect(self.static_agents)
+        all_detections = []
+        for name, agent_detections in detections.items():
+            metrics.increment(f"static.detections.{name}", len(agent_detections))
+            all_detections.extend(agent_detections)
+        return self._add_metadata(all_detections, code, file_path, project, parser)
 
     async def _analyze_parallel(
-        self, code: str, file_path: str, project: str
+        self,
+        code: str,
+        file_path: str,
+        project: str,
+        use_cache: bool = True,
+        stats: Optional[Dict[str, Any]] = None,
+        start_line: int = 1,
+        gating: bool = False,
+        slicing: bool = False,
+        focus: Optional[Set[int]] = None,
+        deadline: Optional[float] = None,
     ) -> tuple[List[Any], Dict[str, int]]:
         """Executa agentes em paralelo. Retorna (detections, total_token_usage)."""
+        configs, inputs = self._prepare_calls(
+            code, start_line, gating, slicing, focus, stats
+        )
+        items = list(configs.items())
+        results = []
+
+        if self.layout == "code_first" and not slicing and len(items) > 1:
+            # Primeira chamada isolada grava o prefixo no cache do provedor;
+            # as demais, disparadas em seguida, passam a reaproveitá-lo.
+            # (Com recorte cada agente recebe um código diferente.)
+            name, cfg = items[0]
+            results.extend(
+                await asyncio.gather(
+                    self._call_agent(
+                        name,
+                        cfg,
+                        code,
+                        use_cache,
+                        stats,
+                        start_line,
+                        inputs.get(name),
+                        deadline,
+                    ),
+                    return_exceptions=True,
+                )
+            )
+            items = items[1:]
+
         tasks = [
-            self._call_agent(name, cfg, code)
-            for name, cfg in self.agent_configs.items()
+            self._call_agent(
+                name, cfg, code, use_cache, stats, start_line, inputs.get(name), deadline
+            )
+            for name, cfg in items
         ]
 
-        logger.info("Executando %s agentes em PARALELO...", len(tasks))
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Executando %s agentes em PARALELO...", len(tasks) + len(results))
+        results.extend(await asyncio.gather(*tasks, return_exceptions=True))
 
         all_detections = []
         total_token_usage = self._create_empty_token_usage()
 
-        for (name, _), result in zip(self.agent_configs.items(), results):
+        for (name, _), result in zip(configs.items(), results):
             if isinstance(result, Exception):
                 logger.error("[%s] Falhou: %s", name, result)
                 continue
@@ -325,14 +1198,30 @@ class CodeSmellSupervisor:
         return all_detections, total_token_usage
 
     async def _analyze_sequential(
-        self, code: str, file_path: str, project: str
+        self,
+        code: str,
+        file_path: str,
+        project: str,
+        use_cache: bool = True,
+        stats: Optional[Dict[str, Any]] = None,
+        start_line: int = 1,
+        gating: bool = False,
+        slicing: bool = False,
+        focus: Optional[Set[int]] = None,
+        deadline: Optional[float] = None,
     ) -> tuple[List[Any], Dict[str, int]]:
         """Executa agentes sequencialmente. Retorna (detections, total_token_usage)."""
         all_detections = []
         total_token_usage = self._create_empty_token_usage()
 
-        for name, config in self.agent_configs.items():
-            detections, token_usage = await self._call_agent(name, config, code)
+        configs, inputs = self._prepare_calls(
+            code, start_line, gating, slicing, focus, stats
+        )
+
+        for name, config in configs.items():
+            detections, token_usage = await self._call_agent(
+                name, config, code, use_cache, stats, start_line, inputs.get(name), deadline
+            )
             all_detections.extend(
                 self._add_metadata(detections, code, file_path, project)
             )
@@ -341,14 +1230,134 @@ class CodeSmellSupervisor:
 
         return all_detections, total_token_usage
 
+    @staticmethod
+    def _detection_key(detection: Any) -> tuple:
+        """Chave para identificar a mesma detecção reportada por blocos diferentes."""
+        return (
+            (detection.Smell or "").strip().lower(),
+            str(detection.Line_no).strip(),
+            (detection.Method or "").strip(),
+        )
+
+    async def _analyze_chunked(
+        self,
+        code: str,
+        file_path: str,
+        project: str,
+        use_cache: bool = True,
+        stats: Optional[Dict[str, Any]] = None,
+        gating: bool = False,
+        slicing: bool = False,
+        focus: Optional[Set[int]] = None,
+        deadline: Optional[float] = None,
+    ) -> tuple[List[Any], Dict[str, int]]:
+        """Analisa um arquivo grande em blocos concorrentes e mescla as detecções."""
+        chunks = self.chunker.split(code, CodeParser(code, file_path))
+        logger.info("Arquivo dividido em %s blocos", len(chunks))
+
+        chunk_focus: List[Optional[Set[int]]] = []
+        for chunk in chunks:
+            if focus is None:
+                chunk_focus.append(None)
+                continue
+            # Linhas absolutas -> linhas relativas ao bloco
+            local = {
+                line - chunk.start_line + 1
+                for line in focus
+                if chunk.start_line <= line <= chunk.end_line
+            }
+            chunk_focus.append(local)
+        chunks = [c for c, f in zip(chunks, chunk_focus) if f is None or f]
+        chunk_focus = [f for f in chunk_focus if f is None or f]
+        self._count(stats, "chunks", len(chunks))
+
+        analyze = self._analyze_parallel if self.parallel else self._analyze_sequential
+        results = await asyncio.gather(
+            *[
+                analyze(
+                    chunk.code,
+                    file_path,
+                    project,
+                    use_cache,
+                    stats,
+                    chunk.start_line,
+                    gating,
+                    slicing,
+                    local_focus,
+                    deadline,
+                )
+                for chunk, local_focus in zip(chunks, chunk_focus)
+            ]
+        )
+
+        all_detections = []
+        total_token_usage = self._create_empty_token_usage()
+        seen: Dict[tuple, int] = {}
+
+        for index, (detections, token_usage) in enumerate(results):
+            self._aggregate_token_usage(total_token_usage, token_usage)
+            for d in detections:
+                # Detecções repetidas dentro de um bloco são legítimas (ex: dois
+                # magic numbers na mesma linha); só descarta repetição entre blocos.
+                key = self._detection_key(d)
+                if seen.setdefault(key, index) != index:
+                    continue
+                all_detections.append(d)
+
+        return all_detections, total_token_usage
+
+    @staticmethod
+    def _to_result(detection: Any) -> Dict[str, Any]:
+        """Converte uma detecção no formato de saída (campo "Line no")."""
+        data = detection.model_dump()
+        data["Line no"] = data.pop("Line_no", "")
+        return data
+
     async def analyze_code(
         self,
         python_code: str,
         file_path: str = "unknown.py",
         project_name: str = "Code",
+        use_cache: bool = True,
+        chunked: bool = False,
+        gating: bool = False,
+        slicing: bool = False,
+        incremental_key: Optional[str] = None,
+        deadline_seconds: Optional[float] = None,
+        budget: Optional[BudgetGovernor] = None,
     ) -> Dict[str, Any]:
-        """Analisa código e retorna code smells detectados."""
-        valid, error = self._validate_code_size(python_code)
+        """Analisa código e retorna code smells detectados.
+
+        Com ``chunked=True``, arquivos acima do orçamento de tokens por bloco
+        (inclusive os que excedem MAX_FILE_LINES) são divididos em blocos nas
+        fronteiras de def/class em vez de rejeitados. Com ``gating=True``, uma
+        pré-análise estática pula agentes que não têm como disparar no código.
+        Com ``slicing=True``, cada agente recebe só as regiões do código que
+        lhe interessam (assinaturas, blocos try, condicionais...), com a
+        numeração original das linhas. Com ``incremental_key`` (ex: nome do
+        projeto ou do repositório), as detecções são guardadas por
+        função/método e, nas execuções seguintes do mesmo arquivo, só as
+        unidades novas ou alteradas vão para o LLM; as demais têm as detecções
+        anteriores reancoradas nas novas linhas. Com ``deadline_seconds``, as
+        chamadas ainda pendentes quando o prazo vence são canceladas e o
+        resultado traz as detecções já concluídas, com os agentes
+        interrompidos em ``incomplete_agents``. Com ``budget``, o gasto de
+        cada requisição é registrado no BudgetGovernor e, com o orçamento
+        esgotado, os agentes restantes não são chamados
+        (``agent_calls.budget_skipped_agents``).
+        """
+        deadline = (
+            time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        )
+        use_chunks = (
+            chunked
+            and bool(self.agent_configs)
+            and estimate_tokens(python_code) > self.chunker.max_tokens
+        )
+        # Sem agentes LLM não há janela de contexto a respeitar
+        valid, error = self._validate_code_size(
+            python_code, chunked=use_chunks or not self.agent_configs
+        )
         if not valid:
             logger.warning("Arquivo rejeitado: %s", error)
             return {
@@ -357,33 +1366,298 @@ class CodeSmellSupervisor:
                 "agents_executed": 0,
                 "error": error,
                 "token_usage": self._create_empty_token_usage(),
+                "cache": {"enabled": use_cache, "hits": 0, "misses": 0},
             }
 
-        detections, token_usage = await (
-            self._analyze_parallel(python_code, file_path, project_name)
-            if self.parallel
-            else self._analyze_sequential(python_code, file_path, project_name)
-        )
+        stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "queue_wait_seconds": 0.0,
+            "rate_limited": 0,
+            "chunks": 0,
+            "skipped_agents": {},
+            "gate_prompt_tokens_saved": 0,
+            "slicing": {},
+            "budget": budget,
+        }
+        plan = None
+        if incremental_key and self.agent_configs:
+            plan = self._plan_incremental(
+                python_code,
+                file_path,
+                incremental_key,
+                self._config_signature(gating, slicing),
+            )
+        # Sem nada conhecido, o arquivo inteiro é analisado sem recorte
+        focus = plan["focus"] if plan and len(plan["analyzed"]) < len(plan["units"]) else None
 
-        results = []
-        for d in detections:
-            data = d.model_dump()
-            data["Line no"] = data.pop("Line_no", "")
-            results.append(data)
+        if use_chunks:
+            analyze = self._analyze_chunked
+        elif self.parallel:
+            analyze = self._analyze_parallel
+        else:
+            analyze = self._analyze_sequential
 
-        return {
+        if not self.agent_configs or (plan is not None and not plan["analyzed"]):
+            detections, token_usage = [], self._create_empty_token_usage()
+        else:
+            detections, token_usage = await analyze(
+                python_code,
+                file_path,
+                project_name,
+                use_cache,
+                stats,
+                gating=gating,
+                slicing=slicing,
+                focus=focus,
+                deadline=deadline,
+            )
+
+        results = [self._to_result(d) for d in detections]
+        if plan is not None:
+            if plan["analyzed"]:
+                # Agentes interrompidos, com falha ou cortados deixariam unidades sem detecções
+                persist = not any(
+                    stats.get(key)
+                    for key in (
+                        "incomplete_agents",
+                        "failed_agents",
+                        "truncated_agents",
+                        "budget_skipped_agents",
+                    )
+                )
+                results = self._save_incremental(
+                    incremental_key, file_path, plan, results, persist
+                )
+            results.extend(plan["reused"])
+        results.extend(
+            self._to_result(d)
+            for d in self._analyze_static(python_code, file_path, project_name)
+        )
+
+        result = {
             "total_smells_detected": len(results),
             "code_smells": results,
-            "agents_executed": len(self.agent_configs),
+            "agents_executed": self.smell_agent_count,
             "token_usage": token_usage,
+            "prompt_cache": self._summarize_prompt_cache(token_usage),
+            "incomplete_agents": stats.get("incomplete_agents", []),
+            "cache": {
+                "enabled": use_cache,
+                "hits": stats["cache_hits"],
+                "misses": stats["cache_misses"],
+            },
+            "scheduling": {
+                "queue_wait_seconds": round(stats["queue_wait_seconds"], 3),
+                "rate_limited": stats["rate_limited"],
+                "concurrency": self.rate_limiter.concurrency,
+            },
+        }
+        if self.agent_configs:
+            result["agent_calls"] = self._summarize_agent_calls(stats)
+            if stats.get("output_budget"):
+                result["output_budget"] = stats["output_budget"]
+        if self.hedging:
+            result["hedging"] = self._summarize_hedging(stats)
+        if use_chunks:
+            result["chunks"] = stats["chunks"]
+        if gating:
+            result["gating"] = {
+                "skipped_agents": stats["skipped_agents"],
+                "estimated_prompt_tokens_saved": stats["gate_prompt_tokens_saved"],
+            }
+        if slicing:
+            result["slicing"] = self._summarize_slicing(stats["slicing"])
+        if plan is not None:
+            result["incremental"] = {
+                "units": len(plan["units"]),
+                "analyzed_units": len(plan["analyzed"]),
+                "reused_units": len(plan["units"]) - len(plan["analyzed"]),
+                "reused_detections": len(plan["reused"]),
+            }
+        if self.engine != "llm":
+            result["engine"] = {
+                "mode": self.engine,
+                "static_agents": list(self.static_agents),
+                "llm_agents": self.smell_agent_count - len(self.static_agents),
+            }
+        if self.grouping != "none" and self.agent_configs:
+            result["grouping"] = self._estimate_grouping_savings(python_code)
+        return result
+
+    async def analyze_code_stream(
+        self,
+        python_code: str,
+        file_path: str = "unknown.py",
+        project_name: str = "Code",
+        use_cache: bool = True,
+        gating: bool = False,
+        slicing: bool = False,
+        deadline_seconds: Optional[float] = None,
+        budget: Optional[BudgetGovernor] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Analisa código emitindo as detecções de cada agente assim que ele termina.
+
+        Gera um evento ``{"event": "agent", ...}`` por agente, na ordem de
+        conclusão (``asyncio.as_completed``), e um evento final
+        ``{"event": "summary", ...}`` com totais e uso de tokens. As detecções
+        da engine estática, quando ativa, saem primeiro como agente "static".
+        Arquivos acima dos limites geram um único evento ``"error"``. Se o
+        consumidor abandonar o gerador, os agentes pendentes são cancelados;
+        com ``deadline_seconds``, os que não terminarem no prazo também, e
+        aparecem em ``incomplete_agents`` no resumo.
+        """
+        started = time.perf_counter()
+        deadline = (
+            time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        )
+        valid, error = self._validate_code_size(python_code, chunked=not self.agent_configs)
+        if not valid:
+            logger.warning("Arquivo rejeitado: %s", error)
+            yield {"event": "error", "error": error}
+            return
+
+        stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "queue_wait_seconds": 0.0,
+            "rate_limited": 0,
+            "skipped_agents": {},
+            "gate_prompt_tokens_saved": 0,
+            "slicing": {},
+            "budget": budget,
+        }
+        total_token_usage = self._create_empty_token_usage()
+        total_smells = 0
+        first_result_seconds = None
+
+        def _agent_event(agent: str, detections: List[Any], token_usage: Dict[str, int]):
+            nonlocal total_smells, first_result_seconds
+            elapsed = time.perf_counter() - started
+            if first_result_seconds is None:
+                first_result_seconds = elapsed
+                metrics.observe("stream.time_to_first_result_seconds", elapsed)
+            results = [self._to_result(d) for d in detections]
+            total_smells += len(results)
+            return {
+                "event": "agent",
+                "agent": agent,
+                "detections": results,
+                "token_usage": token_usage,
+                "elapsed_seconds": round(elapsed, 3),
+            }
+
+        if self.static_agents:
+            yield _agent_event(
+                "static",
+                self._analyze_static(python_code, file_path, project_name),
+                self._create_empty_token_usage(),
+            )
+
+        configs, inputs = self._prepare_calls(
+            python_code, gating=gating, slicing=slicing, stats=stats
+        )
+
+        async def _run(name: str, config: Dict) -> tuple:
+            detections, token_usage = await self._call_agent(
+                name, config, python_code, use_cache, stats, 1, inputs.get(name), deadline
+            )
+            return name, detections, token_usage
+
+        tasks = [asyncio.create_task(_run(name, cfg)) for name, cfg in configs.items()]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                try:
+                    name, detections, token_usage = await next_result
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error("Agente falhou no streaming: %s", e)
+                    continue
+                self._aggregate_token_usage(total_token_usage, token_usage)
+                yield _agent_event(
+                    name,
+                    self._add_metadata(detections, python_code, file_path, project_name),
+                    token_usage,
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        elapsed = time.perf_counter() - started
+        metrics.observe("stream.total_seconds", elapsed)
+        summary = {
+            "event": "summary",
+            "total_smells_detected": total_smells,
+            "agents_executed": self.smell_agent_count,
+            "token_usage": total_token_usage,
+            "prompt_cache": self._summarize_prompt_cache(total_token_usage),
+            "incomplete_agents": stats.get("incomplete_agents", []),
+            "cache": {
+                "enabled": use_cache,
+                "hits": stats["cache_hits"],
+                "misses": stats["cache_misses"],
+            },
+            "elapsed_seconds": round(elapsed, 3),
+            "time_to_first_result_seconds": (
+                round(first_result_seconds, 3) if first_result_seconds is not None else None
+            ),
         }
+        if self.agent_configs:
+            summary["agent_calls"] = self._summarize_agent_calls(stats)
+        if self.hedging:
+            summary["hedging"] = self._summarize_hedging(stats)
+        if gating:
+            summary["gating"] = {
+                "skipped_agents": stats["skipped_agents"],
+                "estimated_prompt_tokens_saved": stats["gate_prompt_tokens_saved"],
+            }
+        if slicing:
+            summary["slicing"] = self._summarize_slicing(stats["slicing"])
+        if budget is not None:
+            summary["budget"] = budget.stats()
+        yield summary
 
 
 def get_supervisor(
-    parallel: bool = True, prompt_type: str = "simple"
+    parallel: bool = True,
+    prompt_type: str = "simple",
+    grouping: str = "none",
+    layout: str = "prompt_first",
+    engine: str = "llm",
+    hedging: bool = False,
+    model: Optional[str] = None,
 ) -> CodeSmellSupervisor:
-    """Factory para criar supervisor."""
-    return CodeSmellSupervisor(parallel=parallel, prompt_type=prompt_type)
+    """Retorna o supervisor compartilhado do processo para a configuração."""
+    from core.supervisor.registry import supervisor_registry
+
+    return supervisor_registry.get(
+        parallel=parallel,
+        prompt_type=prompt_type,
+        grouping=grouping,
+        layout=layout,
+        engine=engine,
+        hedging=hedging,
+        model=model,
+    )
+
+
+def _budget_plan(
+    budget: Optional[BudgetGovernor], model: Optional[str] = None, **options: Any
+) -> tuple[BudgetGovernor, Dict[str, Any]]:
+    """Governor da execução (o do processo, se nenhum for informado) e opções ajustadas."""
+    governor = budget or get_budget_governor()
+    return governor, governor.plan(model=model, **options)
+
+
+def _budget_summary(governor: BudgetGovernor, requested: Dict[str, Any], plan: Dict[str, Any]):
+    """Estado do orçamento e opções trocadas por ele nesta análise."""
+    return {
+        **governor.stats(),
+        # Modelo efetivamente usado (custo dos jobs e retomada do orçamento)
+        "model": plan.get("model") or settings.OPENROUTER_API_MODEL,
+        "applied_options": {
+            key: value for key, value in plan.items() if requested.get(key) != value
+        },
+    }
 
 
 async def analyze_code(
@@ -392,6 +1666,18 @@ async def analyze_code(
     project_name: str = "Code",
     parallel: bool = True,
     prompt_type: str = "simple",
+    use_cache: bool = True,
+    grouping: str = "none",
+    layout: str = "prompt_first",
+    chunked: bool = False,
+    gating: bool = False,
+    engine: str = "llm",
+    hedging: bool = False,
+    slicing: bool = False,
+    incremental_key: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    budget: Optional[BudgetGovernor] = None,
+    model: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Analisa código Python e retorna code smells.
 
@@ -401,7 +1687,136 @@ async def analyze_code(
         project_name: Nome do projeto
         parallel: Se True, executa agentes em paralelo
         prompt_type: "simple" ou "complete" - tipo de prompt a usar
+        use_cache: Se True, reutiliza respostas em cache para chamadas idênticas
+        grouping: "none" (11 agentes), "families" (4 chamadas) ou "single" (1 chamada)
+        layout: "prompt_first" ou "code_first" (código primeiro, favorece cache de prompt)
+        chunked: Se True, divide arquivos grandes em blocos em vez de rejeitá-los
+        gating: Se True, pula agentes que a pré-análise estática descarta
+        engine: "llm", "static" (só AST, sem LLM) ou "hybrid" (AST + LLM para
+            os smells semânticos)
+        hedging: Se True, duplica chamadas que demoram mais que o percentil
+            aprendido de latência do agente (ver HedgePolicy)
+        slicing: Se True, envia a cada agente só as regiões relevantes do código
+        incremental_key: Chave do projeto para reanálise incremental por função
+        deadline_seconds: Prazo da análise; agentes pendentes ao fim do prazo
+            são cancelados e listados em incomplete_agents
+        budget: Orçamento da execução (padrão: o do processo, BUDGET_*); perto
+            do limite a análise usa as opções degradadas e, esgotado, só a
+            engine estática
+        model: Id do modelo no OpenRouter (padrão: OPENROUTER_API_MODEL)
+    """
+    requested = {"prompt_type": prompt_type, "engine": engine, "gating": gating, "model": model}
+    governor, plan = _budget_plan(budget, **requested)
+    result = await get_supervisor(
+        parallel=parallel,
+        prompt_type=plan["prompt_type"],
+        grouping=grouping,
+        layout=layout,
+        engine=plan["engine"],
+        hedging=hedging,
+        model=plan["model"],
+    ).analyze_code(
+        python_code,
+        file_path,
+        project_name,
+        use_cache=use_cache,
+        chunked=chunked,
+        gating=plan["gating"],
+        slicing=slicing,
+        incremental_key=incremental_key,
+        deadline_seconds=deadline_seconds,
+        budget=governor,
+    )
+    result["budget"] = _budget_summary(governor, requested, plan)
+    return result
+
+
+async def analyze_batch(
+    files: List[tuple],
+    project_name: str = "Code",
+    parallel: bool = True,
+    prompt_type: str = "simple",
+    use_cache: bool = True,
+    grouping: str = "none",
+    layout: str = "prompt_first",
+    gating: bool = False,
+    engine: str = "llm",
+    hedging: bool = False,
+    max_pack_tokens: Optional[int] = None,
+    budget: Optional[BudgetGovernor] = None,
+) -> Dict[str, Any]:
+    """Analisa vários arquivos, empacotando os pequenos na mesma chamada de agente.
+
+    Args:
+        files: Lista de (file_path, código)
+        project_name: Nome do projeto
+        max_pack_tokens: Orçamento de tokens de código por pacote
+            (padrão BATCH_PACK_MAX_TOKENS)
+
+    As demais opções são as mesmas de analyze_code.
+    """
+    requested = {"prompt_type": prompt_type, "engine": engine, "gating": gating}
+    governor, plan = _budget_plan(budget, **requested)
+    result = await get_supervisor(
+        parallel=parallel,
+        prompt_type=plan["prompt_type"],
+        grouping=grouping,
+        layout=layout,
+        engine=plan["engine"],
+        hedging=hedging,
+        model=plan["model"],
+    ).analyze_batch(
+        files,
+        project_name,
+        use_cache,
+        gating=plan["gating"],
+        max_pack_tokens=max_pack_tokens,
+        budget=governor,
+    )
+    result["budget"] = _budget_summary(governor, requested, plan)
+    return result
+
+
+async def analyze_code_stream(
+    python_code: str,
+    file_path: str = "unknown.py",
+    project_name: str = "Code",
+    prompt_type: str = "simple",
+    use_cache: bool = True,
+    grouping: str = "none",
+    layout: str = "prompt_first",
+    gating: bool = False,
+    engine: str = "llm",
+    hedging: bool = False,
+    slicing: bool = False,
+    deadline_seconds: Optional[float] = None,
+    budget: Optional[BudgetGovernor] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Versão em streaming de analyze_code: gera um evento por agente concluído.
+
+    Ver CodeSmellSupervisor.analyze_code_stream para o formato dos eventos.
     """
-    return await get_supervisor(
-        parallel=parallel, prompt_type=prompt_type
-    ).analyze_code(python_code, file_path, project_name)
+    requested = {"prompt_type": prompt_type, "engine": engine, "gating": gating}
+    governor, plan = _budget_plan(budget, **requested)
+    supervisor = get_supervisor(
+        parallel=True,
+        prompt_type=plan["prompt_type"],
+        grouping=grouping,
+        layout=layout,
+        engine=plan["engine"],
+        hedging=hedging,
+        model=plan["model"],
+    )
+    async for event in supervisor.analyze_code_stream(
+        python_code,
+        file_path,
+        project_name,
+        use_cache=use_cache,
+        gating=plan["gating"],
+        slicing=slicing,
+        deadline_seconds=deadline_seconds,
+        budget=governor,
+    ):
+        if "budget" in event:
+            event["budget"] = _budget_summary(governor, requested, plan)
+        yield event
@@ -0,0 +1,122 @@
+"""Divisão de arquivos grandes em blocos nas fronteiras de def/class."""
+
+import ast
+import textwrap
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .code_parser import CodeParser
+from .token_estimator import estimate_tokens
+
+
+@dataclass
+class CodeChunk:
+    """Trecho contíguo do arquivo com a numeração original."""
+
+    start_line: int
+    end_line: int
+    code: str
+
+
+class CodeChunker:
+    """Divide código Python em blocos limitados por tokens.
+
+    Os cortes acontecem no início de statements de nível de módulo (def,
+    class, atribuições...). Uma classe maior que o orçamento é dividida entre
+    seus membros; uma função maior que o orçamento fica inteira em um bloco,
+    para não quebrar a análise de Long Method/Complex Method.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+
+    def _split_points(self, lines: List[str], parser: CodeParser) -> List[int]:
+        """Linhas (1-based) onde um novo bloco pode começar."""
+        points = []
+        for unit in parser.get_top_level_units():
+            points.append(unit["lineno"])
+            unit_text = "\n".join(lines[unit["lineno"] - 1 : unit["end_lineno"]])
+            if unit["children"] and estimate_tokens(unit_text) > self.max_tokens:
+                # O cabeçalho da classe acompanha o primeiro membro
+                points.extend(child["lineno"] for child in unit["children"][1:])
+        return sorted(set(points))
+
+    def _line_split_points(self, lines: List[str]) -> List[int]:
+        """Fallback para código sem AST válida: cortes por orçamento de linhas."""
+        points = [1]
+        tokens = 0
+        for number, line in enumerate(lines, start=1):
+            line_tokens = estimate_tokens(line) + 1
+            if tokens and tokens + line_tokens > self.max_tokens:
+                points.append(number)
+                tokens = 0
+            tokens += line_tokens
+        return points
+
+    def split(self, code: str, parser: Optional[CodeParser] = None) -> List[CodeChunk]:
+        """Divide o código em blocos contíguos preservando a numeração de linhas."""
+        lines = code.split("\n")
+        if estimate_tokens(code) <= self.max_tokens:
+            return [CodeChunk(1, len(lines), code)]
+
+        parser = parser or CodeParser(code)
+        points = (
+            self._split_points(lines, parser)
+            if parser.tree
+            else self._line_split_points(lines)
+        )
+        # Comentários/linhas antes do primeiro statement ficam no primeiro bloco
+        points = [1] + [p for p in points if p > 1]
+
+        segments = [
+            (start, end - 1)
+            for start, end in zip(points, points[1:] + [len(lines) + 1])
+        ]
+
+        chunks: List[CodeChunk] = []
+        chunk_start, chunk_end, chunk_tokens = None, None, 0
+        for start, end in segments:
+            segment_tokens = estimate_tokens("\n".join(lines[start - 1 : end])) + 1
+            if chunk_start is not None and chunk_tokens + segment_tokens > self.max_tokens:
+                chunks.append(self._make_chunk(lines, chunk_start, chunk_end))
+                chunk_start, chunk_tokens = None, 0
+            if chunk_start is None:
+                chunk_start = start
+            chunk_end = end
+            chunk_tokens += segment_tokens
+
+        if chunk_start is not None:
+            chunks.append(self._make_chunk(lines, chunk_start, chunk_end))
+        return chunks
+
+    @staticmethod
+    def boundary_levels(code: str, start_line: int = 1) -> List[List[int]]:
+        """Linhas onde começam statements, do nível mais grosso ao mais fino.
+
+        Nível 0: statements de módulo; nível 1: membros de classes; nível 2:
+        statements do corpo de funções. Usa a numeração original (a partir de
+        ``start_line``); blocos indentados, como membros de uma classe dividida,
+        são analisados sem a indentação comum. Sem AST válida retorna [].
+        """
+        parser = CodeParser(textwrap.dedent(code))
+        if not parser.tree:
+            return []
+        offset = start_line - 1
+        levels: List[List[int]] = [[], [], []]
+        functions = []
+        for node in parser.tree.body:
+            levels[0].append(CodeParser._node_span(node)[0] + offset)
+            if isinstance(node, ast.ClassDef):
+                for child in node.body:
+                    levels[1].append(CodeParser._node_span(child)[0] + offset)
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        functions.append(child)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.append(node)
+        for function in functions:
+            levels[2].extend(stmt.lineno + offset for stmt in function.body)
+        return levels
+
+    @staticmethod
+    def _make_chunk(lines: List[str], start: int, end: int) -> CodeChunk:
+        return CodeChunk(start, end, "\n".join(lines[start - 1 : end]))
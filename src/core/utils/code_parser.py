@@ -1,7 +1,9 @@
 """Parser AST para extrair metadados de código Python."""
 
 import ast
+import hashlib
 import logging
+import textwrap
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -60,6 +62,119 @@ class CodeParser:
                 )
         return methods
 
+    @staticmethod
+    def _node_span(node: ast.AST) -> tuple[int, int]:
+        """Linhas (início, fim) de um nó, incluindo decorators."""
+        start = node.lineno
+        for decorator in getattr(node, "decorator_list", []):
+            start = min(start, decorator.lineno)
+        return start, node.end_lineno or node.lineno
+
+    def get_top_level_units(self) -> List[Dict]:
+        """Retorna os statements de nível de módulo com seus intervalos de linhas.
+
+        Classes incluem os intervalos de seus membros em "children", permitindo
+        dividir uma classe grande entre métodos.
+        """
+        if not self.tree:
+            return []
+
+        units = []
+        for node in self.tree.body:
+            start, end = self._node_span(node)
+            unit = {
+                "name": getattr(node, "name", ""),
+                "type": type(node).__name__,
+                "lineno": start,
+                "end_lineno": end,
+                "children": [],
+            }
+            if isinstance(node, ast.ClassDef):
+                for child in node.body:
+                    child_start, child_end = self._node_span(child)
+                    unit["children"].append(
+                        {
+                            "name": getattr(child, "name", ""),
+                            "type": type(child).__name__,
+                            "lineno": child_start,
+                            "end_lineno": child_end,
+                        }
+                    )
+            units.append(unit)
+        return units
+
+    @staticmethod
+    def _fingerprint(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_fingerprinted_units(self) -> List[Dict]:
+        """Divide o módulo em unidades com impressão digital do conteúdo.
+
+        Funções de nível de módulo e métodos de classe são unidades próprias;
+        a impressão digital é o SHA-256 do nome qualificado (Classe.método),
+        do ordinal entre as unidades com esse nome (funções redefinidas) e do
+        código normalizado (sem indentação comum nem espaços finais),
+        preservando as linhas em branco e, com elas, os deslocamentos
+        relativos. Unidades idênticas têm assim impressões distintas. O restante do módulo
+        (imports, cabeçalhos de classe, atributos...) forma a unidade
+        "<module>", considerando só as linhas não vazias.
+
+        Cada unidade traz "lines": as linhas absolutas, em ordem, usadas para
+        reancorar detecções quando a unidade muda de posição no arquivo.
+        """
+        if not self.tree:
+            return []
+
+        source_lines = self.code.split("\n")
+        function_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+        nodes = []
+        for node in self.tree.body:
+            if isinstance(node, function_types):
+                nodes.append(("", node))
+            elif isinstance(node, ast.ClassDef):
+                nodes.extend(
+                    (node.name, child)
+                    for child in node.body
+                    if isinstance(child, function_types)
+                )
+
+        units = []
+        covered = set()
+        ordinals: Dict[str, int] = {}
+        for class_name, node in nodes:
+            start, end = self._node_span(node)
+            # A classe dona faz parte da identidade do método (campo Class)
+            qualname = f"{class_name}.{node.name}" if class_name else node.name
+            ordinal = ordinals.get(qualname, 0)
+            ordinals[qualname] = ordinal + 1
+            text = f"{qualname}#{ordinal}\n" + textwrap.dedent(
+                "\n".join(line.rstrip() for line in source_lines[start - 1 : end])
+            )
+            units.append(
+                {
+                    "name": node.name,
+                    "lines": list(range(start, end + 1)),
+                    "fingerprint": self._fingerprint(text),
+                }
+            )
+            covered.update(range(start, end + 1))
+
+        rest = [
+            number
+            for number, line in enumerate(source_lines, start=1)
+            if number not in covered and line.strip()
+        ]
+        units.append(
+            {
+                "name": "<module>",
+                "lines": rest,
+                "fingerprint": self._fingerprint(
+                    "\n".join(source_lines[number - 1].rstrip() for number in rest)
+                ),
+            }
+        )
+        return units
+
     def find_identifier_line(self, identifier_name: str) -> Optional[int]:
         """Encontra a linha onde um identificador é definido."""
         if not self.tree:
@@ -0,0 +1,183 @@
+"""Recorte do código por agente: só as regiões que cada smell precisa ver."""
+
+import ast
+import io
+import logging
+import tokenize
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.schemas.agent_response import LongIdentifierDetection, LongStatementDetection
+
+logger = logging.getLogger(__name__)
+
+# Valores que o agente de Magic Number considera triviais
+TRIVIAL_NUMBERS = {0, 1, 2, 10, 100}
+
+
+class CodeSlicer:
+    """Extrai, via AST, as linhas relevantes para cada agente.
+
+    As linhas mantêm a numeração original do arquivo e são acompanhadas das
+    linhas de cabeçalho (``class``/``def``) que as envolvem, para que o agente
+    continue preenchendo Class, Method e Line_no corretamente. Agentes que
+    precisam do corpo inteiro das funções (Long Method, Complex Method) não são
+    recortados.
+    """
+
+    FULL_CODE_AGENTS = ("long_method", "complex_method")
+
+    LONG_STATEMENT_THRESHOLD = LongStatementDetection.model_fields["threshold"].default
+    LONG_IDENTIFIER_THRESHOLD = LongIdentifierDetection.model_fields["threshold"].default
+
+    def __init__(self, code: str, tree: Optional[ast.AST] = None):
+        self.code = code
+        self._lines = code.split("\n")
+        self.tree = tree
+        if self.tree is None:
+            try:
+                self.tree = ast.parse(code)
+            except SyntaxError as e:
+                logger.debug("Recorte desativado (erro de sintaxe): %s", e)
+        self._regions: Optional[Dict[str, Set[int]]] = None
+        self._scopes: List[Tuple[int, int]] = []
+
+    @staticmethod
+    def _span(node: ast.AST) -> range:
+        return range(node.lineno, (node.end_lineno or node.lineno) + 1)
+
+    def _statement_span(self, node: ast.AST, parents: Dict[ast.AST, ast.AST]) -> range:
+        """Statement simples que contém o nó (ou o próprio nó, em cabeçalhos)."""
+        current = node
+        while current in parents and not isinstance(current, ast.stmt):
+            current = parents[current]
+        if isinstance(current, ast.stmt) and not hasattr(current, "body"):
+            return self._span(current)
+        return self._span(node)
+
+    @staticmethod
+    def _call_chain_length(node: ast.Call) -> int:
+        """Quantidade de chamadas encadeadas em obj.a().b().c()."""
+        length = 0
+        current: ast.AST = node
+        while True:
+            if isinstance(current, ast.Call):
+                length += 1
+                current = current.func
+            elif isinstance(current, ast.Attribute):
+                current = current.value
+            else:
+                return length
+
+    def _is_magic_number(self, node: ast.Constant) -> bool:
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+            return False
+        return abs(value) not in TRIVIAL_NUMBERS
+
+    def _collect(self) -> Dict[str, Set[int]]:
+        """Percorre a AST uma vez e agrupa as linhas de interesse por agente."""
+        regions: Dict[str, Set[int]] = {
+            "long_parameter_list": set(),
+            "empty_catch_block": set(),
+            "missing_default": set(),
+            "complex_conditional": set(),
+            "long_lambda_function": set(),
+            "long_message_chain": set(),
+            "magic_number": set(),
+            "long_statement": set(),
+            "long_identifier": set(),
+        }
+
+        for number, line in enumerate(self._lines, start=1):
+            if len(line.rstrip()) > self.LONG_STATEMENT_THRESHOLD:
+                regions["long_statement"].add(number)
+
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(self.code).readline):
+                if token.type == tokenize.NAME and len(token.string) > self.LONG_IDENTIFIER_THRESHOLD:
+                    regions["long_identifier"].update(range(token.start[0], token.end[0] + 1))
+        except (tokenize.TokenError, SyntaxError) as e:
+            logger.debug("Tokenize falhou no recorte de long_identifier: %s", e)
+            regions.pop("long_identifier")
+
+        parents: Dict[ast.AST, ast.AST] = {}
+        for node in ast.walk(self.tree):
+            for child in ast.iter_child_nodes(node):
+                parents[child] = node
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._scopes.append((node.lineno, node.end_lineno or node.lineno))
+                # Assinatura: do def até a linha anterior ao corpo
+                end = max(node.body[0].lineno - 1, node.lineno)
+                while end > node.lineno and (
+                    not self._lines[end - 1].strip()
+                    or self._lines[end - 1].lstrip().startswith("#")
+                ):
+                    end -= 1
+                regions["long_parameter_list"].update(range(node.lineno, end + 1))
+            elif isinstance(node, ast.ClassDef):
+                self._scopes.append((node.lineno, node.end_lineno or node.lineno))
+            elif isinstance(node, (ast.Try, ast.TryStar)) and node.handlers:
+                regions["empty_catch_block"].add(node.lineno)
+                for handler in node.handlers:
+                    regions["empty_catch_block"].update(self._span(handler))
+            elif isinstance(node, ast.Match):
+                regions["missing_default"].update(self._span(node))
+            elif isinstance(node, (ast.If, ast.While, ast.IfExp)):
+                regions["complex_conditional"].update(self._span(node.test))
+            elif isinstance(node, ast.Lambda):
+                regions["long_lambda_function"].update(self._statement_span(node, parents))
+            elif isinstance(node, ast.Call) and self._call_chain_length(node) >= 2:
+                regions["long_message_chain"].update(self._statement_span(node, parents))
+            elif isinstance(node, ast.Constant) and self._is_magic_number(node):
+                regions["magic_number"].update(self._statement_span(node, parents))
+
+        return regions
+
+    def _ensure_collected(self) -> Dict[str, Set[int]]:
+        if self._regions is None:
+            self._regions = self._collect() if self.tree is not None else {}
+        return self._regions
+
+    def with_headers(self, lines: Iterable[int]) -> Set[int]:
+        """Acrescenta as linhas de class/def que envolvem cada linha."""
+        self._ensure_collected()
+        selected = set(lines)
+        for line in list(selected):
+            for start, end in self._scopes:
+                if start <= line <= end:
+                    selected.add(start)
+        return selected
+
+    def lines_for(
+        self, agent_names: Iterable[str], focus: Optional[Set[int]] = None
+    ) -> Optional[Set[int]]:
+        """Linhas (1-based) que os agentes precisam ver; None = código inteiro.
+
+        ``focus`` restringe o recorte a um subconjunto de linhas (ex: só as
+        funções alteradas na análise incremental).
+        """
+        regions = self._ensure_collected()
+        selected: Optional[Set[int]] = set()
+        for name in agent_names:
+            if name in self.FULL_CODE_AGENTS or name not in regions:
+                selected = None
+                break
+            selected |= regions[name]
+
+        if focus is not None:
+            selected = set(focus) if selected is None else selected & focus
+        elif selected is None:
+            return None
+        return self.with_headers(selected)
+
+    @staticmethod
+    def to_ranges(lines: Set[int]) -> List[Tuple[int, int]]:
+        """Converte um conjunto de linhas em intervalos contíguos (inclusivos)."""
+        ranges: List[Tuple[int, int]] = []
+        for line in sorted(lines):
+            if ranges and line == ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], line)
+            else:
+                ranges.append((line, line))
+        return ranges
@@ -0,0 +1,131 @@
+"""Estimativa de custo de uma execução antes de chamar o provedor."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.models import calculate_cost, get_model_config
+
+logger = logging.getLogger(__name__)
+
+# Razão tokens de saída / tokens de entrada quando não há histórico
+DEFAULT_COMPLETION_RATIO = 0.04
+
+
+def load_completion_ratio(
+    history_dir: Path, model: Optional[str] = None, prompt_type: Optional[str] = None
+) -> Tuple[float, Dict[str, Any]]:
+    """Razão saída/entrada observada nos ``token_usage_*.json`` de execuções passadas.
+
+    Prefere os resumos do mesmo modelo e tipo de prompt; na falta deles, do
+    mesmo modelo, do mesmo tipo de prompt e, por fim, qualquer resumo. O
+    modelo é reconhecido pelo campo ``model`` ou pela pasta
+    ``results/<empresa>/<modelo>/``. Retorna (razão, origem).
+    """
+    model_config = get_model_config(model) if model else None
+    model_names = {model} - {None}
+    if model_config:
+        model_names |= {model_config["id"], model_config["name"]}
+    summaries = []
+    for path in sorted(Path(history_dir).rglob("token_usage_*.json")):
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+            usage = summary["token_usage"]
+            prompt_tokens = int(usage["prompt_tokens"])
+            completion_tokens = int(usage["completion_tokens"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("Resumo ignorado %s: %s", path, e)
+            continue
+        if prompt_tokens <= 0:
+            continue
+        summaries.append(
+            {
+                "path": str(path),
+                "same_model": summary.get("model") in model_names
+                or path.parent.name in model_names,
+                "same_prompt": summary.get("prompt_type") == prompt_type,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            }
+        )
+
+    for match, rule in (
+        (lambda s: s["same_model"] and s["same_prompt"], "model+prompt_type"),
+        (lambda s: s["same_model"], "model"),
+        (lambda s: s["same_prompt"], "prompt_type"),
+        (lambda s: True, "all"),
+    ):
+        selected = [s for s in summaries if match(s)]
+        if selected:
+            prompt_tokens = sum(s["prompt_tokens"] for s in selected)
+            completion_tokens = sum(s["completion_tokens"] for s in selected)
+            return completion_tokens / prompt_tokens, {
+                "match": rule,
+                "runs": [s["path"] for s in selected],
+            }
+    return DEFAULT_COMPLETION_RATIO, {"match": "default", "runs": []}
+
+
+class CostEstimator:
+    """Converte a estimativa de tokens de entrada por arquivo em tokens e custo."""
+
+    def __init__(
+        self,
+        model: str,
+        prompt_type: Optional[str] = None,
+        history_dir: Optional[Path] = None,
+        completion_ratio: Optional[float] = None,
+    ):
+        self.model = model
+        self.model_config = get_model_config(model)
+        if completion_ratio is not None:
+            self.completion_ratio, self.ratio_source = completion_ratio, {"match": "fixed"}
+        elif history_dir is not None:
+            self.completion_ratio, self.ratio_source = load_completion_ratio(
+                history_dir, model, prompt_type
+            )
+        else:
+            self.completion_ratio = DEFAULT_COMPLETION_RATIO
+            self.ratio_source = {"match": "default", "runs": []}
+
+    def _cost(self, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        if self.model_config is None:
+            return None
+        return round(calculate_cost(prompt_tokens, completion_tokens, self.model_config), 6)
+
+    def estimate(self, file_estimates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Completa as estimativas por arquivo (de CodeSmellSupervisor.estimate_files)."""
+        files = []
+        total = {"files": 0, "skipped_files": 0, "llm_calls": 0, "prompt_tokens": 0}
+        for estimate in file_estimates:
+            completion_tokens = round(estimate["prompt_tokens"] * self.completion_ratio)
+            files.append(
+                {
+                    **estimate,
+                    "completion_tokens": completion_tokens,
+                    "cost_usd": self._cost(estimate["prompt_tokens"], completion_tokens),
+                }
+            )
+            total["files"] += 1
+            total["skipped_files"] += "error" in estimate
+            total["llm_calls"] += estimate["llm_calls"]
+            total["prompt_tokens"] += estimate["prompt_tokens"]
+        total["completion_tokens"] = round(total["prompt_tokens"] * self.completion_ratio)
+        total["total_tokens"] = total["prompt_tokens"] + total["completion_tokens"]
+        total["cost_usd"] = self._cost(total["prompt_tokens"], total["completion_tokens"])
+        return {
+            "model": self.model,
+            "pricing": (
+                {
+                    "input_per_million": self.model_config["input_price"] * 1_000_000,
+                    "output_per_million": self.model_config["output_price"] * 1_000_000,
+                }
+                if self.model_config
+                else None
+            ),
+            "completion_ratio": round(self.completion_ratio, 6),
+            "completion_ratio_source": self.ratio_source,
+            "files": files,
+            "total": total,
+        }
@@ -0,0 +1,105 @@
+"""Empacotamento de arquivos pequenos em uma única chamada de agente."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from .code_parser import CodeParser
+from .token_estimator import estimate_tokens
+
+FILE_HEADER = "### FILE: {file_path} ###"
+# Linha de FILE_HEADER dentro de um pacote já montado
+FILE_HEADER_LINE = re.compile(r"^### FILE: .+ ###$", re.MULTILINE)
+
+
+@dataclass
+class PackedFile:
+    """Arquivo dentro de um pacote, com numeração própria a partir de 1."""
+
+    index: int
+    file_path: str
+    code: str
+    parser: CodeParser
+
+    @property
+    def line_count(self) -> int:
+        return len(self.code.split("\n"))
+
+
+@dataclass
+class FilePack:
+    """Conjunto de arquivos enviados juntos a cada agente."""
+
+    files: List[PackedFile] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def source(self) -> str:
+        """Código dos arquivos, cada um após o seu cabeçalho, sem numeração."""
+        return "\n\n".join(
+            f"{FILE_HEADER.format(file_path=packed.file_path)}\n{packed.code}"
+            for packed in self.files
+        )
+
+    def locate(self, detection: Any) -> Optional[PackedFile]:
+        """Arquivo do pacote a que a detecção pertence.
+
+        Usa o campo File preenchido pelo agente; na falta dele (ou se não bater
+        com nenhum cabeçalho), procura os arquivos em que a linha existe e, se
+        houver mais de um, o que define o método citado.
+        """
+        reported = (detection.File or "").strip()
+        for packed in self.files:
+            if reported and reported == packed.file_path:
+                return packed
+
+        try:
+            line = int(detection.Line_no or getattr(detection, "start_line", 0) or 0)
+        except (TypeError, ValueError):
+            line = 0
+        candidates = [f for f in self.files if not line or line <= f.line_count]
+        if reported:
+            named = [
+                f
+                for f in candidates
+                if f.file_path.endswith(reported) or reported.endswith(f.file_path)
+            ]
+            candidates = named or candidates
+        if len(candidates) > 1:
+            method = (detection.Method or "").split(".")[-1].strip()
+            if method:
+                candidates = [
+                    f for f in candidates if f.parser.find_function_by_name(method)
+                ] or candidates
+        return candidates[0] if len(candidates) == 1 else None
+
+
+class FilePacker:
+    """Agrupa arquivos pequenos em pacotes limitados por tokens.
+
+    Cada arquivo entra no pacote com um cabeçalho ``### FILE: ... ###`` e a sua
+    própria numeração de linhas, de modo que Line_no continua local ao
+    arquivo. Arquivos maiores que o orçamento ficam sozinhos.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+
+    def pack(
+        self, files: List[Tuple[str, str]], numbered_tokens: List[int]
+    ) -> List[FilePack]:
+        """Distribui os arquivos (first-fit, na ordem recebida) em pacotes."""
+        packs: List[FilePack] = []
+        for index, ((file_path, code), tokens) in enumerate(zip(files, numbered_tokens)):
+            tokens += estimate_tokens(FILE_HEADER.format(file_path=file_path))
+            packed = PackedFile(index, file_path, code, CodeParser(code, file_path))
+            # Arquivo maior que o orçamento nunca cabe em pacote: fica sozinho
+            target = next(
+                (p for p in packs if p.tokens + tokens <= self.max_tokens), None
+            )
+            if target is None:
+                target = FilePack()
+                packs.append(target)
+            target.files.append(packed)
+            target.tokens += tokens
+        return packs
@@ -0,0 +1,89 @@
+"""Armazenamento das detecções por unidade de código para análise incremental."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FingerprintStore:
+    """Guarda, por (chave de projeto, arquivo), as detecções de cada unidade.
+
+    Cada arquivo JSON contém a assinatura da configuração do supervisor e um
+    mapa ``{impressão digital da unidade: [detecções]}``, com as linhas das
+    detecções guardadas como posições relativas dentro da unidade.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = Path(store_dir)
+
+    @staticmethod
+    def make_key(incremental_key: str, file_path: str) -> str:
+        """Gera a chave SHA-256 de um arquivo dentro de um projeto."""
+        digest = hashlib.sha256()
+        for part in (incremental_key, file_path):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.store_dir / key[:2] / f"{key}.json"
+
+    def load(self, incremental_key: str, file_path: str) -> Optional[Dict[str, Any]]:
+        """Retorna o estado salvo do arquivo ou None se ausente/corrompido."""
+        path = self._path(self.make_key(incremental_key, file_path))
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Estado incremental corrompido %s: %s", path.name, e)
+            return None
+
+    def save(self, incremental_key: str, file_path: str, payload: Dict[str, Any]) -> None:
+        """Grava o estado do arquivo de forma atômica.
+
+        Falhas (disco ou detecção não serializável) só são registradas no log:
+        a análise segue sem o estado incremental deste arquivo.
+        """
+        path = self._path(self.make_key(incremental_key, file_path))
+        try:
+            data = json.dumps(payload, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning("Estado incremental não serializável %s: %s", path.name, e)
+            return
+
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, path)
+            tmp_name = None
+        except OSError as e:
+            logger.warning("Falha ao gravar estado incremental %s: %s", path.name, e)
+        finally:
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+
+_fingerprint_store: Optional[FingerprintStore] = None
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    """Retorna a instância compartilhada pelo processo."""
+    global _fingerprint_store  # pylint: disable=global-statement
+    if _fingerprint_store is None:
+        from config.settings import settings
+
+        _fingerprint_store = FingerprintStore(settings.INCREMENTAL_STORE_DIR)
+    return _fingerprint_store
@@ -0,0 +1,86 @@
+"""Parser JSON incremental para respostas recebidas em streaming."""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Caminho de um objeto dentro do documento: chaves dos contêineres que o
+# envolvem, da raiz até o array pai (None para elementos de array).
+JSONPath = Tuple[Optional[str], ...]
+
+
+class IncrementalJSONParser:
+    """Emite cada objeto JSON completo que seja elemento de um array.
+
+    O texto chega em pedaços arbitrários (``feed``); o parser acompanha
+    strings, escapes e a pilha de contêineres, e devolve os objetos assim que
+    a chave de fechamento chega, junto com o caminho do array em que estão.
+    Um objeto só é emitido quando está completo, então uma resposta cortada no
+    meio perde apenas o objeto incompleto. Texto antes do primeiro ``{``/``[``
+    (ex: cercas de markdown) e depois do fechamento da raiz é ignorado.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        # Contêineres abertos: [delimitador, chave no pai, posição inicial]
+        self._stack: List[list] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self.complete = False
+
+    @property
+    def text(self) -> str:
+        """Texto recebido até o momento."""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[JSONPath, Dict[str, Any]]]:
+        """Processa um pedaço do texto. Retorna [(caminho, objeto)] completados nele."""
+        self._text += chunk
+        emitted = []
+        text = self._text
+        while self._pos < len(text) and not self.complete:
+            char = text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start : self._pos + 1]
+            elif char in "{[":
+                parent = self._stack[-1][0] if self._stack else None
+                key = self._pending_key if parent == "{" else None
+                self._stack.append([char, key, self._pos])
+                self._pending_key = None
+            elif not self._stack:
+                pass
+            elif char in "}]":
+                kind, _, start = self._stack.pop()
+                if not self._stack:
+                    self.complete = True
+                elif kind == "{" and self._stack[-1][0] == "[":
+                    item = self._load(text[start : self._pos + 1])
+                    if isinstance(item, dict):
+                        path = tuple(entry[1] for entry in self._stack[1:])
+                        emitted.append((path, item))
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char == ":" and self._stack[-1][0] == "{":
+                key = self._load(self._last_string or "")
+                self._pending_key = key if isinstance(key, str) else None
+            elif char == ",":
+                self._pending_key = None
+            self._pos += 1
+        return emitted
+
+    @staticmethod
+    def _load(fragment: str) -> Any:
+        try:
+            return json.loads(fragment)
+        except ValueError:
+            return None
@@ -0,0 +1,77 @@
+"""Métricas em memória do processo (contadores e distribuições)."""
+
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Percentil por ranking mais próximo (0 para lista vazia)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class MetricsRegistry:
+    """Registro simples de métricas: contadores acumulados e janelas de observações."""
+
+    def __init__(self, window: int = 2000):
+        self.window = window
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._observations: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        """Soma um valor a um contador."""
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name: str, value: float) -> None:
+        """Registra uma observação (latência, espera em fila, etc.)."""
+        with self._lock:
+            if name not in self._observations:
+                self._observations[name] = deque(maxlen=self.window)
+            self._observations[name].append(value)
+            self._counters[f"{name}.count"] += 1
+            self._counters[f"{name}.sum"] += value
+
+    def values(self, name: str) -> list[float]:
+        """Retorna as observações mais recentes de uma métrica."""
+        with self._lock:
+            return list(self._observations.get(name, ()))
+
+    def summary(self, name: str) -> Dict[str, float]:
+        """Resume uma métrica observada (contagem, média e percentis)."""
+        values = self.values(name)
+        if not values:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 4),
+            "p50": round(percentile(values, 50), 4),
+            "p95": round(percentile(values, 95), 4),
+            "p99": round(percentile(values, 99), 4),
+            "max": round(max(values), 4),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna todos os contadores e resumos de observações."""
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._observations)
+        return {
+            "counters": counters,
+            "observations": {name: self.summary(name) for name in names},
+        }
+
+    def reset(self) -> None:
+        """Limpa todas as métricas."""
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+
+metrics = MetricsRegistry()
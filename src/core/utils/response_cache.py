@@ -0,0 +1,198 @@
+"""Cache persistente em disco para respostas dos agentes."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _schema_fingerprint(schema: type) -> str:
+    """Serializa o JSON Schema de um modelo Pydantic de forma estável."""
+    return json.dumps(schema.model_json_schema(), sort_keys=True)
+
+
+class ResponseCache:
+    """Cache endereçado por conteúdo para respostas estruturadas dos agentes.
+
+    Cada entrada é um arquivo JSON cujo nome é o SHA-256 da chave
+    (modelo, tipo de prompt, agente, prompt, schema, código numerado).
+    Entradas gravadas há mais de ``max_age_hours`` são descartadas na leitura
+    e, quando o diretório passa de ``max_size_mb``, as menos usadas
+    recentemente são removidas. A idade vem do ``st_mtime`` (momento da
+    gravação) e o último uso do ``st_atime``, atualizado a cada leitura.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float, max_age_hours: float):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt_type: str,
+        agent_name: str,
+        prompt: str,
+        schema: type,
+        numbered_code: str,
+    ) -> str:
+        """Gera a chave SHA-256 de uma chamada de agente."""
+        digest = hashlib.sha256()
+        for part in (
+            model,
+            prompt_type,
+            agent_name,
+            prompt,
+            _schema_fingerprint(schema),
+            numbered_code,
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada armazenada ou None se ausente/expirada."""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        if time.time() - stat.st_mtime > self.max_age_seconds:
+            self._remove(path, stat.st_size)
+            self.misses += 1
+            return None
+
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Entrada de cache corrompida %s: %s", path.name, e)
+            self._remove(path, stat.st_size)
+            self.misses += 1
+            return None
+
+        # Atualiza só o atime (LRU da evicção); o mtime segue marcando a idade
+        try:
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+
+        self.hits += 1
+        return payload
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        """Grava uma entrada de forma atômica e aplica a evicção por tamanho."""
+        path = self._path(key)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning("Falha ao gravar cache %s: %s", path.name, e)
+            return
+
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes += len(data) - previous
+
+        if self._current_size() > self.max_size_bytes:
+            self._evict()
+
+    def _remove(self, path: Path, size: int) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes -= size
+            self.evictions += 1
+
+    def _entries(self) -> list[tuple[float, float, int, Path]]:
+        """(último uso, gravação, tamanho, caminho) de cada entrada."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _current_size(self) -> int:
+        with self._lock:
+            if self._size_bytes is None:
+                self._size_bytes = sum(size for _, _, size, _ in self._entries())
+            return self._size_bytes
+
+    def _evict(self) -> None:
+        """Remove entradas expiradas e, depois, as menos usadas até caber no limite."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size, _ in entries)
+        now = time.time()
+
+        for _, mtime, size, path in entries:
+            expired = now - mtime > self.max_age_seconds
+            if not expired and total <= self.max_size_bytes * 0.9:
+                continue
+            self._remove(path, size)
+            total -= size
+
+        with self._lock:
+            self._size_bytes = total
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        for _, _, size, path in self._entries():
+            self._remove(path, size)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores de uso do cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size_bytes": self._current_size(),
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Retorna a instância de cache compartilhada pelo processo."""
+    global _response_cache  # pylint: disable=global-statement
+    if _response_cache is None:
+        from config.settings import settings
+
+        _response_cache = ResponseCache(
+            cache_dir=settings.RESPONSE_CACHE_DIR,
+            max_size_mb=settings.RESPONSE_CACHE_MAX_SIZE_MB,
+            max_age_hours=settings.RESPONSE_CACHE_MAX_AGE_HOURS,
+        )
+    return _response_cache
@@ -0,0 +1,354 @@
+"""Detecção determinística (sem LLM) dos smells baseados em métricas."""
+
+import ast
+import logging
+from typing import Any, Dict, List, Optional
+
+from core.schemas.agent_response import (
+    ComplexConditionalDetection,
+    ComplexMethodDetection,
+    LongIdentifierDetection,
+    LongLambdaFunctionDetection,
+    LongMethodDetection,
+    LongParameterListDetection,
+    LongStatementDetection,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _threshold(detection_model: type) -> int:
+    """Lê o threshold padrão declarado no schema da detecção."""
+    return detection_model.model_fields["threshold"].default
+
+
+def logical_operator_count(expression: ast.AST) -> int:
+    """Número de operadores and/or em uma expressão (incluindo BoolOps aninhados)."""
+    count = 0
+    for node in ast.walk(expression):
+        if isinstance(node, ast.BoolOp):
+            count += len(node.values) - 1
+    return count
+
+
+def parameter_count(function: ast.AST) -> int:
+    """Parâmetros de uma função, sem self/cls e sem *args/**kwargs."""
+    args = function.args
+    names = [a.arg for a in args.posonlyargs + args.args + args.kwonlyargs]
+    return sum(1 for name in names if name not in ("self", "cls"))
+
+
+class _SmellVisitor(ast.NodeVisitor):
+    """Percorre a AST uma única vez mantendo classe e método correntes.
+
+    A complexidade ciclomática é acumulada durante o percurso: cada ponto de
+    decisão (if, elif, expressão condicional, for, while, except, and, or,
+    assert, case de match que não seja o curinga, for e if de comprehension)
+    soma no escopo de função corrente. Funções aninhadas e lambdas abrem um escopo próprio, de modo que
+    não entram na conta da função externa.
+    """
+
+    def __init__(self, detector: "StaticSmellDetector"):
+        self.detector = detector
+        self.class_stack: List[str] = []
+        self.function_stack: List[str] = []
+        self.decisions: List[int] = [0]
+        self.function_spans: List[tuple] = []
+
+    @property
+    def current_class(self) -> str:
+        return self.class_stack[-1] if self.class_stack else ""
+
+    @property
+    def current_function(self) -> str:
+        return self.function_stack[-1] if self.function_stack else ""
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.detector._check_identifier(node.name, node.lineno, self.current_class, "")
+        self.class_stack.append(node.name)
+        self.generic_visit(node)
+        self.class_stack.pop()
+
+    def _visit_function(self, node: ast.AST) -> None:
+        class_name = self.current_class
+        self.detector._check_identifier(node.name, node.lineno, class_name, self.current_function)
+        for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+            self.detector._check_identifier(arg.arg, arg.lineno, class_name, node.name)
+        self.function_spans.append((node.lineno, node.end_lineno or node.lineno, node.name))
+        self.function_stack.append(node.name)
+        self.decisions.append(0)
+        # Classes definidas dentro de funções continuam com a classe externa
+        self.generic_visit(node)
+        complexity = 1 + self.decisions.pop()
+        self.function_stack.pop()
+        self.detector._check_function(node, class_name, complexity)
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def _visit_decision(self, node: ast.AST) -> None:
+        self.decisions[-1] += 1
+        self.generic_visit(node)
+
+    visit_For = _visit_decision
+    visit_AsyncFor = _visit_decision
+    visit_ExceptHandler = _visit_decision
+    visit_Assert = _visit_decision
+
+    def visit_comprehension(self, node: ast.comprehension) -> None:
+        self.decisions[-1] += 1 + len(node.ifs)
+        self.generic_visit(node)
+
+    def visit_Match(self, node: ast.Match) -> None:
+        # O case curinga final (case _) é o caminho padrão, não uma decisão
+        last = node.cases[-1] if node.cases else None
+        wildcard = (
+            last is not None
+            and last.guard is None
+            and isinstance(last.pattern, ast.MatchAs)
+            and last.pattern.pattern is None
+        )
+        self.decisions[-1] += len(node.cases) - wildcard
+        self.generic_visit(node)
+
+    def _visit_conditional(self, node: ast.AST) -> None:
+        self.decisions[-1] += 1
+        self.detector._check_conditional(node, self.current_class, self.current_function)
+        self.generic_visit(node)
+
+    visit_If = _visit_conditional
+    visit_While = _visit_conditional
+    visit_IfExp = _visit_conditional
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self.decisions[-1] += len(node.values) - 1
+        self.generic_visit(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self.detector._check_lambda(node, self.current_class, self.current_function)
+        self.decisions.append(0)
+        self.generic_visit(node)
+        self.decisions.pop()
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Store):
+            self.detector._check_identifier(
+                node.id, node.lineno, self.current_class, self.current_function
+            )
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        # Atributos definidos no próprio objeto (self.nome = ...)
+        if (
+            isinstance(node.ctx, ast.Store)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in ("self", "cls")
+        ):
+            self.detector._check_identifier(
+                node.attr, node.lineno, self.current_class, self.current_function
+            )
+        self.generic_visit(node)
+
+
+class StaticSmellDetector:
+    """Calcula exatamente, via AST, os smells definidos por thresholds numéricos.
+
+    Produz os mesmos modelos de detecção dos agentes (LongMethodDetection,
+    ComplexMethodDetection, ...) para que o restante do pipeline
+    (validação, metadados, formato de saída) seja reaproveitado.
+    """
+
+    SUPPORTED_AGENTS = (
+        "long_method",
+        "complex_method",
+        "complex_conditional",
+        "long_parameter_list",
+        "long_statement",
+        "long_identifier",
+        "long_lambda_function",
+    )
+
+    LONG_METHOD_THRESHOLD = _threshold(LongMethodDetection)
+    COMPLEX_METHOD_THRESHOLD = _threshold(ComplexMethodDetection)
+    COMPLEX_CONDITIONAL_THRESHOLD = _threshold(ComplexConditionalDetection)
+    LONG_PARAMETER_LIST_THRESHOLD = _threshold(LongParameterListDetection)
+    LONG_STATEMENT_THRESHOLD = _threshold(LongStatementDetection)
+    LONG_IDENTIFIER_THRESHOLD = _threshold(LongIdentifierDetection)
+    LONG_LAMBDA_THRESHOLD = _threshold(LongLambdaFunctionDetection)
+
+    def __init__(self, code: str, tree: Optional[ast.AST] = None):
+        self.code = code
+        self._tree = tree
+        self._lines = code.split("\n")
+        self._detections: Dict[str, List[Any]] = {}
+        self._seen_identifiers: set = set()
+        self._enabled: tuple = ()
+
+    def _add(self, agent_name: str, detection: Any) -> None:
+        if agent_name in self._enabled:
+            self._detections[agent_name].append(detection)
+
+    def _check_function(self, node: ast.AST, class_name: str, complexity: int) -> None:
+        start = node.lineno
+        end = node.end_lineno or node.lineno
+        total_lines = end - start + 1
+        if total_lines > self.LONG_METHOD_THRESHOLD:
+            self._add(
+                "long_method",
+                LongMethodDetection(
+                    Class=class_name,
+                    Method=node.name,
+                    Line_no="",
+                    Description=(
+                        f"Method '{node.name}' has {total_lines} lines "
+                        f"(threshold: {self.LONG_METHOD_THRESHOLD}). "
+                        "Consider breaking it down into smaller methods."
+                    ),
+                    total_lines=total_lines,
+                    start_line=start,
+                    end_line=end,
+                ),
+            )
+
+        if complexity > self.COMPLEX_METHOD_THRESHOLD:
+            self._add(
+                "complex_method",
+                ComplexMethodDetection(
+                    Class=class_name,
+                    Method=node.name,
+                    Line_no="",
+                    Description=(
+                        f"Method '{node.name}' has cyclomatic complexity of {complexity} "
+                        f"(threshold: {self.COMPLEX_METHOD_THRESHOLD}). "
+                        "Extract nested conditions into separate methods."
+                    ),
+                    cyclomatic_complexity=complexity,
+                    start_line=start,
+                    end_line=end,
+                ),
+            )
+
+        params = parameter_count(node)
+        if params > self.LONG_PARAMETER_LIST_THRESHOLD:
+            self._add(
+                "long_parameter_list",
+                LongParameterListDetection(
+                    Class=class_name,
+                    Method=node.name,
+                    Line_no=node.lineno,
+                    Description=(
+                        f"Method '{node.name}' has {params} parameters "
+                        f"(threshold: {self.LONG_PARAMETER_LIST_THRESHOLD}). "
+                        "Consider introducing a parameter object."
+                    ),
+                    parameter_count=params,
+                ),
+            )
+
+    def _check_conditional(self, node: ast.AST, class_name: str, method: str) -> None:
+        operators = logical_operator_count(node.test)
+        if operators > self.COMPLEX_CONDITIONAL_THRESHOLD:
+            self._add(
+                "complex_conditional",
+                ComplexConditionalDetection(
+                    Class=class_name,
+                    Method=method,
+                    Line_no=node.test.lineno,
+                    Description=(
+                        f"Conditional at line {node.test.lineno} has {operators} logical operators "
+                        f"(threshold: {self.COMPLEX_CONDITIONAL_THRESHOLD}). "
+                        "Consider decomposing the conditional."
+                    ),
+                    logical_operators=operators,
+                    threshold=self.COMPLEX_CONDITIONAL_THRESHOLD,
+                ),
+            )
+
+    def _check_lambda(self, node: ast.Lambda, class_name: str, method: str) -> None:
+        segment = ast.get_source_segment(self.code, node)
+        if segment is None:
+            return
+        length = len(segment)
+        if length > self.LONG_LAMBDA_THRESHOLD:
+            self._add(
+                "long_lambda_function",
+                LongLambdaFunctionDetection(
+                    Class=class_name,
+                    Method=method,
+                    Line_no=node.lineno,
+                    Description=(
+                        f"Lambda at line {node.lineno} has {length} characters "
+                        f"(threshold: {self.LONG_LAMBDA_THRESHOLD}). Convert to named function."
+                    ),
+                    lambda_length=length,
+                ),
+            )
+
+    def _check_identifier(self, name: str, line: int, class_name: str, method: str) -> None:
+        if name.startswith("__") and name.endswith("__"):
+            return
+        if len(name) <= self.LONG_IDENTIFIER_THRESHOLD or name in self._seen_identifiers:
+            return
+        self._seen_identifiers.add(name)
+        self._add(
+            "long_identifier",
+            LongIdentifierDetection(
+                Class=class_name,
+                Method=method,
+                Line_no=line,
+                Description=(
+                    f"Identifier '{name}' has {len(name)} characters "
+                    f"(threshold: {self.LONG_IDENTIFIER_THRESHOLD}). Consider shortening."
+                ),
+                identifier_name=name,
+                length=len(name),
+            ),
+        )
+
+    def _check_long_statements(self, functions: List[tuple]) -> None:
+        """Linhas físicas acima do threshold; ``functions`` em ordem de início."""
+        for number, line in enumerate(self._lines, start=1):
+            length = len(line.rstrip())
+            if length <= self.LONG_STATEMENT_THRESHOLD:
+                continue
+            # Método mais interno que contém a linha
+            method = ""
+            for start, end, name in functions:
+                if start <= number <= end:
+                    method = name
+            self._add(
+                "long_statement",
+                LongStatementDetection(
+                    Method=method,
+                    Line_no=number,
+                    Description=(
+                        f"Line {number} has {length} characters "
+                        f"(threshold: {self.LONG_STATEMENT_THRESHOLD}). Break into multiple lines."
+                    ),
+                    line_length=length,
+                ),
+            )
+
+    def detect(self, agents: Optional[tuple] = None) -> Dict[str, List[Any]]:
+        """Executa os detectores e retorna {agente: detecções}."""
+        self._enabled = tuple(
+            name for name in (agents or self.SUPPORTED_AGENTS) if name in self.SUPPORTED_AGENTS
+        )
+        self._detections = {name: [] for name in self._enabled}
+        self._seen_identifiers = set()
+
+        tree = self._tree
+        if tree is None:
+            try:
+                tree = ast.parse(self.code)
+            except SyntaxError as e:
+                logger.warning("Análise estática sem AST (erro de sintaxe): %s", e)
+
+        functions: List[tuple] = []
+        if tree is not None:
+            visitor = _SmellVisitor(self)
+            visitor.visit(tree)
+            functions = visitor.function_spans
+
+        if "long_statement" in self._enabled:
+            self._check_long_statements(functions)
+        return self._detections
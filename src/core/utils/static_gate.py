@@ -0,0 +1,178 @@
+"""Pré-análise estática para pular agentes que não podem detectar nada."""
+
+import ast
+import io
+import logging
+import tokenize
+from typing import Dict, Optional
+
+from core.schemas.agent_response import (
+    LongIdentifierDetection,
+    LongLambdaFunctionDetection,
+    LongMessageChainDetection,
+    LongMethodDetection,
+    LongParameterListDetection,
+    LongStatementDetection,
+)
+
+from .code_parser import CodeParser
+from .static_detector import StaticSmellDetector
+
+logger = logging.getLogger(__name__)
+
+
+def _threshold(detection_model: type) -> int:
+    """Lê o threshold padrão declarado no schema da detecção."""
+    return detection_model.model_fields["threshold"].default
+
+
+class StaticGate:
+    """Decide, com AST e tokenize, quais agentes não têm como disparar no código.
+
+    As regras são conservadoras: um agente só é pulado quando a construção
+    que ele procura não existe ou nenhuma ocorrência passa do threshold do
+    schema. Código com erro de sintaxe não pula nenhum agente baseado em AST.
+    """
+
+    LONG_METHOD_THRESHOLD = _threshold(LongMethodDetection)
+    LONG_PARAMETER_LIST_THRESHOLD = _threshold(LongParameterListDetection)
+    LONG_STATEMENT_THRESHOLD = _threshold(LongStatementDetection)
+    LONG_IDENTIFIER_THRESHOLD = _threshold(LongIdentifierDetection)
+    LONG_LAMBDA_THRESHOLD = _threshold(LongLambdaFunctionDetection)
+    LONG_MESSAGE_CHAIN_THRESHOLD = _threshold(LongMessageChainDetection)
+
+    def __init__(self, code: str, parser: Optional[CodeParser] = None):
+        self.code = code
+        self.parser = parser or CodeParser(code)
+
+    def _ast_reasons(self, tree: ast.AST) -> Dict[str, str]:
+        has_try = False
+        has_match = False
+        max_method_lines = 0
+        max_params = 0
+        max_lambda_length = 0
+
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Try, ast.TryStar)):
+                has_try = has_try or bool(node.handlers)
+            elif isinstance(node, ast.Match):
+                has_match = True
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                end = node.end_lineno or node.lineno
+                max_method_lines = max(max_method_lines, end - node.lineno + 1)
+                args = node.args
+                # Conta todos os parâmetros (inclusive self/*args) para não
+                # pular funções que o agente poderia considerar
+                params = len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+                params += bool(args.vararg) + bool(args.kwarg)
+                max_params = max(max_params, params)
+            elif isinstance(node, ast.Lambda):
+                segment = ast.get_source_segment(self.code, node)
+                length = len(segment) if segment is not None else self.LONG_LAMBDA_THRESHOLD + 1
+                max_lambda_length = max(max_lambda_length, length)
+
+        reasons = {}
+        if not has_try:
+            reasons["empty_catch_block"] = "sem try/except"
+        if not has_match:
+            reasons["missing_default"] = "sem match/case"
+        if max_method_lines <= self.LONG_METHOD_THRESHOLD:
+            reasons["long_method"] = (
+                f"maior função com {max_method_lines} linhas "
+                f"(threshold: {self.LONG_METHOD_THRESHOLD})"
+            )
+        if max_params <= self.LONG_PARAMETER_LIST_THRESHOLD:
+            reasons["long_parameter_list"] = (
+                f"máximo de {max_params} parâmetros "
+                f"(threshold: {self.LONG_PARAMETER_LIST_THRESHOLD})"
+            )
+        if max_lambda_length <= self.LONG_LAMBDA_THRESHOLD:
+            reasons["long_lambda_function"] = (
+                "sem lambda"
+                if not max_lambda_length
+                else f"maior lambda com {max_lambda_length} caracteres "
+                f"(threshold: {self.LONG_LAMBDA_THRESHOLD})"
+            )
+        return reasons
+
+    def _token_reasons(self) -> Dict[str, str]:
+        reasons = {}
+
+        max_line_length = max((len(line) for line in self.code.split("\n")), default=0)
+        if max_line_length <= self.LONG_STATEMENT_THRESHOLD:
+            reasons["long_statement"] = (
+                f"maior linha com {max_line_length} caracteres "
+                f"(threshold: {self.LONG_STATEMENT_THRESHOLD})"
+            )
+
+        try:
+            max_name_length = max(
+                (
+                    len(token.string)
+                    for token in tokenize.generate_tokens(io.StringIO(self.code).readline)
+                    if token.type == tokenize.NAME
+                ),
+                default=0,
+            )
+        except (tokenize.TokenError, SyntaxError) as e:
+            logger.debug("Tokenize falhou, long_identifier não será pulado: %s", e)
+            return reasons
+
+        if max_name_length <= self.LONG_IDENTIFIER_THRESHOLD:
+            reasons["long_identifier"] = (
+                f"maior identificador com {max_name_length} caracteres "
+                f"(threshold: {self.LONG_IDENTIFIER_THRESHOLD})"
+            )
+        return reasons
+
+    def skippable_agents(self) -> Dict[str, str]:
+        """Retorna {agente: motivo} para agentes que não podem disparar."""
+        reasons = self._token_reasons()
+        if self.parser.tree is not None:
+            reasons.update(self._ast_reasons(self.parser.tree))
+        return reasons
+
+    @staticmethod
+    def _chain_length(node: ast.Call) -> int:
+        """Chamadas encadeadas terminando em ``node`` (ex: a.b().c().d() -> 3)."""
+        length = 0
+        while isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            length += 1
+            node = node.func.value
+        return length
+
+    def candidate_counts(self) -> Dict[str, int]:
+        """Quantas ocorrências cada agente pode reportar, no máximo (estimativa).
+
+        Smells de métricas usam as próprias detecções do StaticSmellDetector;
+        para os semânticos conta-se a construção que o agente examina
+        (literais numéricos, handlers de except, match sem ``case _``, cadeias
+        de chamadas). Usado para prever o tamanho da resposta de cada agente.
+        """
+        counts = {
+            name: len(detections)
+            for name, detections in StaticSmellDetector(
+                self.code, self.parser.tree
+            ).detect().items()
+        }
+        counts.update(
+            magic_number=0, empty_catch_block=0, missing_default=0, long_message_chain=0
+        )
+        if self.parser.tree is None:
+            return counts
+        for node in ast.walk(self.parser.tree):
+            if isinstance(node, ast.Constant):
+                if (
+                    isinstance(node.value, (int, float, complex))
+                    and not isinstance(node.value, bool)
+                    and node.value not in (0, 1)
+                ):
+                    counts["magic_number"] += 1
+            elif isinstance(node, ast.ExceptHandler):
+                counts["empty_catch_block"] += 1
+            elif isinstance(node, ast.Match):
+                counts["missing_default"] += 1
+            elif isinstance(node, ast.Call):
+                if self._chain_length(node) > self.LONG_MESSAGE_CHAIN_THRESHOLD:
+                    counts["long_message_chain"] += 1
+        return counts
@@ -0,0 +1,25 @@
+"""Estimativa local de tokens sem chamar o provedor."""
+
+from functools import lru_cache
+
+# Média aproximada de caracteres por token para código Python + prompts em
+# português nos tokenizadores BPE usados pelos modelos do OpenRouter.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estima o número de tokens de um texto."""
+    if not text:
+        return 0
+    return estimate_tokens_for_length(len(text))
+
+
+def estimate_tokens_for_length(length: int) -> int:
+    """Estima tokens a partir do número de caracteres (sem montar o texto)."""
+    return (length + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=256)
+def estimate_prompt_tokens(prompt: str) -> int:
+    """Estima tokens de um prompt fixo (memoizado, prompts se repetem)."""
+    return estimate_tokens(prompt)
@@ -3,9 +3,30 @@
 from langchain_core.callbacks import AsyncCallbackHandler
 
 
+def _cached_prompt_tokens(usage: dict) -> int:
+    """Extrai tokens de entrada servidos pelo cache de prompt do provedor."""
+    # Formato OpenAI/OpenRouter: prompt_tokens_details.cached_tokens
+    details = usage.get("prompt_tokens_details") or {}
+    if details.get("cached_tokens"):
+        return details["cached_tokens"]
+
+    # Formato usage_metadata do LangChain: input_token_details.cache_read
+    details = usage.get("input_token_details") or {}
+    if details.get("cache_read"):
+        return details["cache_read"]
+
+    # Formato Anthropic nativo
+    return usage.get("cache_read_input_tokens", 0) or 0
+
+
 def _extract_token_usage_from_llm_result(response) -> dict:
     """Extrai informações de uso de tokens de um LLMResult."""
-    default_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    default_usage = {
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "cached_prompt_tokens": 0,
+    }
 
     if hasattr(response, "llm_output") and response.llm_output:
         if "token_usage" in response.llm_output:
@@ -14,6 +35,7 @@ def _extract_token_usage_from_llm_result(response) -> dict:
                 "prompt_tokens": usage.get("prompt_tokens", 0),
                 "completion_tokens": usage.get("completion_tokens", 0),
                 "total_tokens": usage.get("total_tokens", 0),
+                "cached_prompt_tokens": _cached_prompt_tokens(usage),
             }
 
     if hasattr(response, "generations"):
@@ -30,6 +52,7 @@ def _extract_token_usage_from_llm_result(response) -> dict:
                                 "prompt_tokens": usage.get("prompt_tokens", 0),
                                 "completion_tokens": usage.get("completion_tokens", 0),
                                 "total_tokens": usage.get("total_tokens", 0),
+                                "cached_prompt_tokens": _cached_prompt_tokens(usage),
                             }
                         if "usage" in metadata:
                             usage = metadata["usage"]
@@ -37,6 +60,7 @@ def _extract_token_usage_from_llm_result(response) -> dict:
                                 "prompt_tokens": usage.get("prompt_tokens", 0),
                                 "completion_tokens": usage.get("completion_tokens", 0),
                                 "total_tokens": usage.get("total_tokens", 0),
+                                "cached_prompt_tokens": _cached_prompt_tokens(usage),
                             }
 
                     if hasattr(message, "usage_metadata"):
@@ -46,6 +70,7 @@ def _extract_token_usage_from_llm_result(response) -> dict:
                                 "prompt_tokens": usage.get("input_tokens", 0),
                                 "completion_tokens": usage.get("output_tokens", 0),
                                 "total_tokens": usage.get("total_tokens", 0),
+                                "cached_prompt_tokens": _cached_prompt_tokens(usage),
                             }
 
     return default_usage
@@ -60,6 +85,7 @@ class TokenUsageCallback(AsyncCallbackHandler):
             "prompt_tokens": 0,
             "completion_tokens": 0,
             "total_tokens": 0,
+            "cached_prompt_tokens": 0,
         }
 
     async def on_llm_end(self, response, **kwargs):
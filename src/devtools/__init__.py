@@ -0,0 +1 @@
+"""Ferramentas de desenvolvimento: provedor falso e benchmarks."""
@@ -0,0 +1,409 @@
+"""Servidor chat-completions compatível com a API OpenAI, para testes de carga locais.
+
+Substitui o OpenRouter sem rede e sem custo. Aponte ``OPENROUTER_BASE_URL``
+para ele:
+
+    python -m devtools.fake_openrouter --port 8765 --latency-ms 800 --rate-429 0.05
+    OPENROUTER_BASE_URL=http://localhost:8765/v1 uvicorn api.app:app
+
+O agente de cada requisição é reconhecido pelo prompt (ou pelas seções
+``# SEÇÃO `nome``` dos agentes fundidos) e a resposta segue o
+Multiple*Response dele. As detecções caem em linhas sorteadas do código
+numerado, de forma determinística por requisição e ``--seed``. Latência,
+tokens e falhas (429, 5xx, respostas cortadas, arrays soltos, texto sem JSON e
+requisições que não respondem) são sorteados por requisição, então novas
+tentativas podem ter outro desfecho. ``GET /stats`` mostra os desfechos.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from core.supervisor.agent_config import get_agent_configs
+from core.supervisor.streaming import detection_type_of
+from core.utils.token_estimator import CHARS_PER_TOKEN, estimate_tokens
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "exponential")
+
+NUMBERED_LINE = re.compile(r"^\s*(\d+) \| (.*)$")
+FILE_HEADER = re.compile(r"### FILE: (.+?) ###")
+DEF_LINE = re.compile(r"^\s*(?:async\s+)?def\s+(\w+)")
+SECTION = re.compile(r"# SEÇÃO `(\w+)`")
+
+# Campos de detecção que não são métricas (não recebem threshold + 1)
+NON_METRIC_FIELDS = {"threshold", "start_line", "end_line"}
+
+
+@dataclass
+class FakeServerConfig:
+    """Comportamento do servidor falso (ver ``--help``)."""
+
+    latency_dist: str = "lognormal"
+    latency_ms: float = 800.0
+    latency_spread: float = 0.5
+    ms_per_token: float = 0.0
+    first_token_fraction: float = 0.3
+    chunk_chars: int = 64
+    detections_per_kloc: float = 30.0
+    cached_ratio: float = 0.0
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    rate_5xx: float = 0.0
+    rate_truncated: float = 0.0
+    rate_bare_array: float = 0.0
+    rate_malformed: float = 0.0
+    rate_hang: float = 0.0
+    hang_seconds: float = 300.0
+    seed: int = 0
+
+
+def _agent_prompts() -> List[Tuple[str, str, Any]]:
+    """(prompt, agente, schema) dos 11 agentes, com prompts simples e completos."""
+    prompts = []
+    for prompt_type in ("simple", "complete"):
+        for name, config in get_agent_configs(prompt_type).items():
+            prompts.append((config["prompt"], name, config["schema"]))
+    # Prompts mais longos primeiro: um prompt nunca é confundido com um prefixo dele
+    return sorted(prompts, key=lambda item: -len(item[0]))
+
+
+class FakeOpenRouter:
+    """Gera respostas e falhas conforme o FakeServerConfig."""
+
+    def __init__(self, config: FakeServerConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.prompts = _agent_prompts()
+        self.schemas = {name: schema for _, name, schema in self.prompts}
+        self.outcomes: Counter = Counter()
+        self.agents: Counter = Counter()
+        self.requests = 0
+        self.started = time.time()
+
+    def identify(self, text: str) -> Tuple[List[str], bool]:
+        """Agentes pedidos na requisição e se a resposta é agrupada por seção."""
+        sections = SECTION.findall(text)
+        if sections:
+            return [name for name in dict.fromkeys(sections) if name in self.schemas], True
+        for prompt, name, _ in self.prompts:
+            if prompt in text:
+                return [name], False
+        return [], False
+
+    @staticmethod
+    def numbered_lines(text: str) -> List[Tuple[str, int, str, str]]:
+        """(arquivo, linha, método, texto) de cada linha do código numerado."""
+        lines = []
+        current_file, method = "", ""
+        for raw in text.splitlines():
+            header = FILE_HEADER.search(raw)
+            if header:
+                current_file, method = header.group(1), ""
+                continue
+            match = NUMBERED_LINE.match(raw)
+            if not match:
+                continue
+            definition = DEF_LINE.match(match.group(2))
+            if definition:
+                method = definition.group(1)
+            lines.append((current_file, int(match.group(1)), method, match.group(2)))
+        return lines
+
+    def detections(self, agent: str, lines: List[tuple], rng: random.Random) -> List[Dict]:
+        """Detecções válidas no schema do agente em linhas sorteadas."""
+        detection_type = detection_type_of(self.schemas[agent])
+        rate = self.config.detections_per_kloc / 1000
+        result = []
+        for file_path, line_no, method, source in lines:
+            if rng.random() >= rate:
+                continue
+            fields: Dict[str, Any] = {
+                "Line_no": line_no,
+                "Method": method,
+                "File": file_path,
+                "description": f"fake: {source.strip()[:60]}",
+            }
+            threshold_field = detection_type.model_fields.get("threshold")
+            if threshold_field is not None:
+                # Métricas logo acima do threshold (ex: length de LongIdentifier)
+                above = threshold_field.default + 1
+                for name, field in detection_type.model_fields.items():
+                    if name in NON_METRIC_FIELDS:
+                        continue
+                    if field.annotation == Optional[int]:
+                        fields[name] = above
+                    elif field.annotation == Optional[str]:
+                        fields[name] = "x" * above
+            detection = detection_type.model_validate(fields)
+            result.append(detection.model_dump(by_alias=True))
+        return result
+
+    def body(self, agents: List[str], grouped: bool, text: str, rng: random.Random) -> Any:
+        """Objeto JSON da resposta (Multiple*Response ou um por seção)."""
+        lines = self.numbered_lines(text)
+        sections = {}
+        for agent in agents:
+            detections = self.detections(agent, lines, rng)
+            sections[agent] = {"detections": detections, "detected": bool(detections)}
+        if grouped:
+            return sections
+        if sections:
+            return next(iter(sections.values()))
+        return {"detections": [], "detected": False}
+
+    def latency(self, completion_tokens: int) -> float:
+        """Latência sorteada (segundos) para uma resposta."""
+        config = self.config
+        median = config.latency_ms / 1000
+        if config.latency_dist == "uniform":
+            value = self.rng.uniform(
+                median * (1 - config.latency_spread), median * (1 + config.latency_spread)
+            )
+        elif config.latency_dist == "lognormal":
+            value = median * self.rng.lognormvariate(0, config.latency_spread)
+        elif config.latency_dist == "exponential":
+            # Mediana de Exp(λ) = ln 2 / λ
+            value = self.rng.expovariate(math.log(2) / median) if median > 0 else 0.0
+        else:
+            value = median
+        return max(value, 0.0) + completion_tokens * config.ms_per_token / 1000
+
+    def fault(self) -> Optional[str]:
+        """Falha sorteada para a requisição (None = resposta normal)."""
+        config = self.config
+        draw = self.rng.random()
+        for name, rate in (
+            ("rate_limited", config.rate_429),
+            ("server_error", config.rate_5xx),
+            ("hang", config.rate_hang),
+            ("truncated", config.rate_truncated),
+            ("bare_array", config.rate_bare_array),
+            ("malformed", config.rate_malformed),
+        ):
+            if draw < rate:
+                return name
+            draw -= rate
+        return None
+
+    @staticmethod
+    def _messages_text(messages: List[Dict[str, Any]]) -> str:
+        parts = []
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, list):
+                parts.extend(block.get("text", "") for block in content if isinstance(block, dict))
+            elif content:
+                parts.append(str(content))
+        return "\n".join(parts)
+
+    async def complete(self, payload: Dict[str, Any]):
+        """Atende um POST /chat/completions."""
+        text = self._messages_text(payload.get("messages", []))
+        agents, grouped = self.identify(text)
+        self.requests += 1
+        for agent in agents or ["unknown"]:
+            self.agents[agent] += 1
+
+        fault = self.fault()
+        self.outcomes[fault or "ok"] += 1
+        if fault == "rate_limited":
+            await asyncio.sleep(self.latency(0) * 0.1)
+            return self._error(
+                429, "Rate limit exceeded", {"Retry-After": str(self.config.retry_after)}
+            )
+        if fault == "server_error":
+            await asyncio.sleep(self.latency(0))
+            return self._error(self.rng.choice((500, 502, 503)), "Upstream error")
+        if fault == "hang":
+            await asyncio.sleep(self.config.hang_seconds)
+
+        seed = hashlib.sha256(f"{self.config.seed}:{text}".encode("utf-8")).hexdigest()
+        body = self.body(agents, grouped, text, random.Random(seed))
+        if fault == "malformed":
+            content = "Desculpe, não consegui analisar este código."
+        elif fault == "bare_array" and not grouped:
+            content = json.dumps(body["detections"], ensure_ascii=False)
+        else:
+            content = json.dumps(body, ensure_ascii=False)
+
+        finish_reason = "stop"
+        max_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens")
+        if fault == "truncated":
+            content = content[: self.rng.randint(1, max(len(content) - 1, 1))]
+            finish_reason = "length"
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            content = content[: max_tokens * CHARS_PER_TOKEN]
+            finish_reason = "length"
+            self.outcomes["max_tokens"] += 1
+
+        prompt_tokens = estimate_tokens(text)
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {
+                "cached_tokens": int(prompt_tokens * self.config.cached_ratio)
+            },
+        }
+        latency = self.latency(completion_tokens)
+        model = payload.get("model", "fake")
+        if payload.get("stream"):
+            include_usage = (payload.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(
+                self._stream(
+                    model, content, finish_reason, usage if include_usage else None, latency
+                ),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(latency)
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": finish_reason,
+                    }
+                ],
+                "usage": usage,
+            }
+        )
+
+    async def _stream(
+        self,
+        model: str,
+        content: str,
+        finish_reason: str,
+        usage: Optional[Dict[str, Any]],
+        latency: float,
+    ):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        size = max(self.config.chunk_chars, 1)
+        pieces = [content[i : i + size] for i in range(0, len(content), size)] or [""]
+        first_token = latency * self.config.first_token_fraction
+        per_chunk = (latency - first_token) / len(pieces)
+
+        def event(choices: List[Dict[str, Any]], **extra: Any) -> str:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+        await asyncio.sleep(first_token)
+        yield event(
+            [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]
+        )
+        for piece in pieces:
+            yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+            await asyncio.sleep(per_chunk)
+        yield event([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+        if usage is not None:
+            yield event([], usage=usage)
+        yield "data: [DONE]\n\n"
+
+    @staticmethod
+    def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+        return JSONResponse(
+            {"error": {"message": message, "type": "fake_error", "code": status}},
+            status_code=status,
+            headers=headers,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Desfechos e requisições por agente desde o início."""
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "outcomes": dict(self.outcomes),
+            "agents": dict(self.agents),
+            "config": asdict(self.config),
+        }
+
+
+def create_app(config: Optional[FakeServerConfig] = None) -> FastAPI:
+    """App FastAPI do servidor falso."""
+    fake = FakeOpenRouter(config or FakeServerConfig())
+    app = FastAPI(title="Fake OpenRouter")
+    app.state.fake = fake
+
+    async def chat_completions(request: Request):
+        return await fake.complete(await request.json())
+
+    # /v1 (OpenAI) e /api/v1 (OpenRouter)
+    for prefix in ("", "/v1", "/api/v1"):
+        app.add_api_route(f"{prefix}/chat/completions", chat_completions, methods=["POST"])
+
+    @app.get("/stats")
+    async def get_stats() -> dict:
+        return fake.stats()
+
+    return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Tuple[argparse.Namespace, FakeServerConfig]:
+    """Lê as opções de linha de comando."""
+    defaults = FakeServerConfig()
+    parser = argparse.ArgumentParser(description="Servidor OpenRouter falso para testes de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    options = (
+        ("--latency-dist", "Distribuição da latência: " + ", ".join(LATENCY_DISTRIBUTIONS)),
+        ("--latency-ms", "Latência mediana (ms)"),
+        ("--latency-spread", "Sigma da lognormal ou meia-largura relativa da uniforme"),
+        ("--ms-per-token", "Tempo de geração por token de saída (ms)"),
+        ("--first-token-fraction", "Fração da latência antes do primeiro chunk (streaming)"),
+        ("--chunk-chars", "Caracteres por chunk (streaming)"),
+        ("--detections-per-kloc", "Detecções por mil linhas, por agente"),
+        ("--cached-ratio", "Fração dos tokens de entrada informada como cache de prompt"),
+        ("--rate-429", "Fração de respostas 429"),
+        ("--retry-after", "Retry-After das respostas 429 (s)"),
+        ("--rate-5xx", "Fração de respostas 500/502/503"),
+        ("--rate-truncated", "Fração de respostas cortadas (finish_reason=length)"),
+        ("--rate-bare-array", "Fração de respostas com o array de detecções solto"),
+        ("--rate-malformed", "Fração de respostas em texto, sem JSON"),
+        ("--rate-hang", "Fração de requisições que demoram --hang-seconds"),
+        ("--hang-seconds", "Espera das requisições sorteadas em --rate-hang (s)"),
+        ("--seed", "Semente do sorteio de detecções, latências e falhas"),
+    )
+    for flag, help_text in options:
+        default = getattr(defaults, flag[2:].replace("-", "_"))
+        parser.add_argument(flag, type=type(default), default=default, help=help_text)
+    args = parser.parse_args(argv)
+    if args.latency_dist not in LATENCY_DISTRIBUTIONS:
+        parser.error(f"--latency-dist inválida: {args.latency_dist}")
+    config = FakeServerConfig(**{field: getattr(args, field) for field in asdict(defaults)})
+    return args, config
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    args, config = parse_args(argv)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Configurações explícitas para scripts que não chamam o provedor real."""
+
+import os
+import sys
+from typing import Any
+
+from dotenv import dotenv_values
+
+# Credenciais fictícias, usadas só quando nem o ambiente nem o .env as definem
+PLACEHOLDERS = {
+    "OPENROUTER_API_KEY": "devtools",
+    "OPENROUTER_BASE_URL": "http://localhost",
+    "OPENROUTER_API_MODEL": "devtools",
+}
+
+# Configurações instaladas pela primeira chamada de configure_settings
+_configured = None
+
+
+def configure_settings(**overrides: Any):
+    """Cria as configurações do script e as instala em ``config.settings``.
+
+    As credenciais vêm do ambiente e do .env, como na API (o modelo do .env
+    continua valendo, o que importa para reproduzir gravações do replay); só
+    as ausentes nos dois recebem os valores de ``PLACEHOLDERS``. Os
+    ``overrides`` (ex: ``LLM_BACKEND="replay"``) têm precedência sobre ambos.
+    Deve ser chamada antes de importar ``core``, cujos módulos guardam a
+    instância de ``config.settings.settings`` ao serem importados. Chamada de
+    novo sem ``overrides`` (ex: um script importado pelos testes), reaproveita
+    as configurações já instaladas.
+    """
+    global _configured  # pylint: disable=global-statement
+    if _configured is not None and not overrides:
+        return _configured
+    if any(name == "core" or name.startswith("core.") for name in sys.modules):
+        raise RuntimeError("configure_settings deve ser chamada antes de importar core")
+
+    # Mesmo arquivo lido por Settings (env_file=".env", relativo ao diretório atual)
+    env_file = dotenv_values(".env")
+    for name, value in PLACEHOLDERS.items():
+        if not os.environ.get(name) and not env_file.get(name):
+            os.environ[name] = value
+
+    import config.settings  # pylint: disable=import-outside-toplevel
+
+    config.settings.settings = config.settings.Settings(**overrides)
+    _configured = config.settings.settings
+    return _configured
@@ -0,0 +1,10 @@
+"""Configuração comum dos testes: ``src`` no path e configurações explícitas."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from devtools.settings import configure_settings
+
+# Nenhum teste chama o provedor
+configure_settings()
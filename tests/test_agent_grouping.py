@@ -0,0 +1,55 @@
+"""Agrupamento dos agentes em famílias ou em uma única chamada."""
+
+import asyncio
+
+import httpx
+
+from core.supervisor import CodeSmellSupervisor
+from core.supervisor.agent_config import AGENT_GROUPS, get_agent_configs
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+CODE = "def f(x):\n    if x > 7:\n        return x * 42\n    return x + 13\n"
+
+
+def test_families_and_single_cover_all_agents():
+    agents = set(get_agent_configs())
+    families = get_agent_configs(grouping="families")
+    assert set(families) == set(AGENT_GROUPS)
+    assert set().union(*(config["members"] for config in families.values())) == agents
+
+    single = get_agent_configs(grouping="single")
+    assert list(single) == ["all_smells"]
+    assert set(single["all_smells"]["members"]) == agents
+
+
+def test_combined_schema_keeps_each_member_response():
+    config = get_agent_configs(grouping="families")["naming"]
+    answer = {"magic_number": {"detected": False, "detections": []}}
+    response = config["schema"].model_validate(answer)
+    assert response.long_identifier.detections == []
+    assert "# SEÇÃO `magic_number`" in config["prompt"]
+
+
+def test_excluded_agents_drop_empty_families():
+    excluded = tuple(AGENT_GROUPS["structure"])
+    assert "structure" not in get_agent_configs(grouping="families", exclude=excluded)
+
+
+def test_invalid_grouping_is_rejected():
+    try:
+        get_agent_configs(grouping="pairs")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError não lançado")
+
+
+def test_families_use_one_call_per_family():
+    app = create_app(FakeServerConfig(latency_ms=0, detections_per_kloc=400))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(grouping="families", http_async_client=client)
+    result = asyncio.run(supervisor.analyze_code(CODE, "m.py", use_cache=False))
+
+    assert app.state.fake.stats()["requests"] == len(AGENT_GROUPS)
+    assert result["agents_executed"] == len(get_agent_configs())
+    assert not result["agent_calls"]["failed_agents"]
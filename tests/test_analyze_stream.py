@@ -0,0 +1,58 @@
+"""Streaming das detecções por agente (SSE/NDJSON)."""
+
+import asyncio
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from api.app import app
+from core.supervisor import CodeSmellSupervisor
+from core.utils.metrics import metrics
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+CODE = "def f(x):\n    if x > 7:\n        return x * 42\n    return x + 13\n"
+
+
+def test_agents_are_emitted_as_they_finish_then_summary():
+    metrics.reset()
+    fake = create_app(FakeServerConfig(latency_ms=0, detections_per_kloc=400))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+
+    async def collect():
+        stream = supervisor.analyze_code_stream(CODE, "m.py", use_cache=False)
+        return [event async for event in stream]
+
+    events = asyncio.run(collect())
+    agents, summary = events[:-1], events[-1]
+    assert {event["event"] for event in agents} == {"agent"}
+    assert len({event["agent"] for event in agents}) == 11
+    assert summary["event"] == "summary"
+    assert summary["total_smells_detected"] == sum(len(e["detections"]) for e in agents)
+    assert summary["time_to_first_result_seconds"] is not None
+    assert metrics.summary("stream.time_to_first_result_seconds")["count"] == 1
+
+
+def stream(stream_format, **body):
+    with TestClient(app) as client:
+        return client.post(
+            f"/api/analyze/stream?format={stream_format}", json={"python_code": CODE, **body}
+        )
+
+
+def test_ndjson_and_sse_formats():
+    response = stream("ndjson", engine="static")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["agent", "summary"]
+    assert events[0]["agent"] == "static"
+
+    response = stream("sse", engine="static")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: agent\ndata: {")
+    assert "event: summary\n" in response.text
+
+
+def test_unsupported_options_are_rejected():
+    assert stream("sse", chunked=True).status_code == 400
@@ -0,0 +1,60 @@
+"""Microbenchmarks do supervisor: entradas sintéticas e comparação com o baseline."""
+
+import importlib.util
+import json
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "benchmark_hotpaths.py"
+spec = importlib.util.spec_from_file_location("benchmark_hotpaths", SCRIPT)
+hotpaths = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hotpaths)
+
+
+def result(ns_per_op, alloc_peak_bytes):
+    return {"ns_per_op": ns_per_op, "alloc_peak_bytes": alloc_peak_bytes}
+
+
+def baseline(**cases):
+    return {"results": {"calibration": result(1000, 0), **cases}}
+
+
+def test_synthetic_inputs_have_the_requested_size():
+    for lines in hotpaths.SIZES.values():
+        code = hotpaths.make_code(lines)
+        assert len(code.split("\n")) == lines
+        assert len(hotpaths.make_detections(code)) == lines // 10
+
+
+def test_times_are_normalized_by_calibration():
+    old = baseline(case=result(100, 5000))
+    slower_machine = {"calibration": result(2000, 0), "case": result(200, 5000)}
+    _, regressed = hotpaths.compare(slower_machine, old, tolerance=0.5, alloc_tolerance=0.1)
+    assert not regressed
+
+    slower_code = {"calibration": result(1000, 0), "case": result(200, 5000)}
+    rows, regressed = hotpaths.compare(slower_code, old, tolerance=0.5, alloc_tolerance=0.1)
+    assert regressed and rows[0][-1] == "REGRESSÃO"
+
+
+def test_allocation_growth_beyond_slack_fails():
+    old = baseline(case=result(100, 50_000))
+    for grown, expected in ((50_500, False), (60_000, True)):
+        current = {"calibration": result(1000, 0), "case": result(100, grown)}
+        _, regressed = hotpaths.compare(current, old, tolerance=0.5, alloc_tolerance=0.1)
+        assert regressed is expected
+
+
+def test_baseline_covers_every_case():
+    shipped = json.loads(hotpaths.baseline_file.read_text(encoding="utf-8"))["results"]
+    measured = hotpaths.run_benchmarks(only={"code_parser[small]"})
+    assert set(measured) == {"calibration", "code_parser[small]"}
+    assert measured["code_parser[small]"]["ns_per_op"] > 0
+    cases = (
+        "format_code_with_line_numbers",
+        "code_parser",
+        "add_metadata",
+        "model_dump",
+        "detection_validator",
+    )
+    expected = {f"{case}[{size}]" for case in cases for size in hotpaths.SIZES}
+    assert expected | {"calibration"} == set(shipped)
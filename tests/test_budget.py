@@ -0,0 +1,60 @@
+"""Orçamento de custo e tokens: degradação e parada das chamadas ao LLM."""
+
+import asyncio
+
+import httpx
+
+from core.supervisor import CodeSmellSupervisor
+from core.supervisor.budget import DEGRADED, EXHAUSTED, OK, BudgetGovernor
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+USAGE = {"prompt_tokens": 600, "completion_tokens": 200}
+CHEAP = {"prompt_type": "simple", "engine": "hybrid", "gating": True}
+
+
+def test_state_follows_the_tightest_limit():
+    governor = BudgetGovernor(max_tokens=1000, degrade_ratio=0.8, degraded_options=CHEAP)
+    assert governor.state == OK
+    assert governor.plan(prompt_type="complete") == {"prompt_type": "complete"}
+
+    governor.record("gpt-4o-mini", USAGE)
+    assert governor.state == DEGRADED
+    assert governor.plan(prompt_type="complete", engine="llm") == CHEAP
+    assert governor.plan(engine="static")["engine"] == "static"
+
+    governor.record("gpt-4o-mini", USAGE)
+    assert governor.state == EXHAUSTED and not governor.allows_calls()
+    assert governor.plan(engine="llm") == {"engine": "static"}
+
+
+def test_cost_is_priced_and_unknown_models_are_counted():
+    governor = BudgetGovernor(max_cost_usd=1.0)
+    governor.record("gpt-4o-mini", {"prompt_tokens": 1_000_000, "completion_tokens": 0})
+    governor.record("modelo/desconhecido", USAGE)
+    stats = governor.stats()
+    assert stats["spent_usd"] == 0.15
+    assert stats["unpriced_calls"] == 1
+
+
+def test_child_reports_spend_and_inherits_parent_state():
+    process = BudgetGovernor(max_tokens=1000)
+    job = BudgetGovernor(max_tokens=100_000, name="job", parent=process)
+    job.record("gpt-4o-mini", USAGE)
+    job.record("gpt-4o-mini", USAGE)
+    assert process.total_tokens == 1600
+    assert job.state == EXHAUSTED
+
+
+def test_exhausted_budget_skips_every_agent():
+    governor = BudgetGovernor(max_tokens=100)
+    governor.record("gpt-4o-mini", USAGE)
+    app = create_app(FakeServerConfig(latency_ms=0))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+    code = "def f(x):\n    return x * 42\n"
+    result = asyncio.run(supervisor.analyze_code(code, "m.py", use_cache=False, budget=governor))
+
+    assert app.state.fake.stats()["requests"] == 0
+    skipped = result["agent_calls"]["budget_skipped_agents"]
+    assert sorted(skipped) == sorted(supervisor.agent_configs)
+    assert governor.skipped_calls == len(skipped)
@@ -0,0 +1,54 @@
+"""Divisão de arquivos grandes em blocos nas fronteiras de def/class."""
+
+import asyncio
+
+import httpx
+
+from core.supervisor import CodeSmellSupervisor
+from core.utils.code_chunker import CodeChunker
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+CODE = "\n\n".join(
+    f"def f{i}(a, b):\n    x = a + b\n    return x * {i + 100}\n" for i in range(10)
+)
+
+
+def test_chunks_are_contiguous_and_start_at_definitions():
+    lines = CODE.split("\n")
+    chunks = CodeChunker(max_tokens=30).split(CODE)
+    assert len(chunks) > 1
+    assert chunks[0].start_line == 1 and chunks[-1].end_line == len(lines)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_line == previous.end_line + 1
+        assert chunk.code.startswith("def ")
+        assert chunk.code == "\n".join(lines[chunk.start_line - 1 : chunk.end_line])
+
+
+def test_small_file_and_oversized_function_stay_whole():
+    assert len(CodeChunker(max_tokens=10_000).split(CODE)) == 1
+    big = "def big():\n" + "".join(f"    v{i} = {i}\n" for i in range(200))
+    chunks = CodeChunker(max_tokens=30).split(big)
+    assert len(chunks) == 1
+
+
+def test_large_class_is_split_between_members():
+    members = "".join(f"    def m{i}(self):\n        return {i}\n\n" for i in range(20))
+    chunks = CodeChunker(max_tokens=40).split("class C:\n" + members)
+    assert len(chunks) > 1
+    assert chunks[0].code.startswith("class C:")
+    assert all(c.code.lstrip().startswith("def ") for c in chunks[1:])
+
+
+def test_chunked_analysis_keeps_original_line_numbers():
+    app = create_app(FakeServerConfig(latency_ms=0, detections_per_kloc=400))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+    supervisor.chunker = CodeChunker(max_tokens=30)
+    result = asyncio.run(supervisor.analyze_code(CODE, "m.py", use_cache=False, chunked=True))
+
+    assert result["chunks"] > 1
+    lines = [int(d["Line no"]) for d in result["code_smells"]]
+    assert lines and max(lines) > CodeChunker(max_tokens=30).split(CODE)[0].end_line
+    assert all(1 <= line <= len(CODE.split("\n")) for line in lines)
+    keys = [(d["Smell"], d["Line no"], d.get("Method")) for d in result["code_smells"]]
+    assert len(keys) == len(set(keys))
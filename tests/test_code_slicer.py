@@ -0,0 +1,50 @@
+"""Recorte do código por agente com a numeração original."""
+
+from core.supervisor import CodeSmellSupervisor
+from core.utils.code_slicer import CodeSlicer
+
+CODE = """class Loader:
+    def load(self, path, mode):
+        size = 4096
+        try:
+            data = open(path).read(size)
+        except OSError:
+            pass
+        return data if mode else None
+
+    def name(self):
+        return "loader"
+"""
+
+
+def test_each_agent_sees_its_regions_with_headers():
+    slicer = CodeSlicer(CODE)
+    assert slicer.lines_for(["magic_number"]) == {1, 2, 3}
+    assert slicer.lines_for(["empty_catch_block"]) == {1, 2, 4, 6, 7}
+    assert slicer.lines_for(["complex_conditional"]) == {1, 2, 8}
+    assert slicer.lines_for(["long_parameter_list"]) == {1, 2, 10}
+
+
+def test_full_code_agents_and_empty_regions():
+    slicer = CodeSlicer(CODE)
+    assert slicer.lines_for(["long_method"]) is None
+    assert slicer.lines_for(["magic_number", "complex_method"]) is None
+    assert slicer.lines_for(["missing_default"]) == set()
+
+
+def test_focus_restricts_the_slice():
+    slicer = CodeSlicer(CODE)
+    assert slicer.lines_for(["long_parameter_list"], focus={10, 11}) == {1, 10}
+    assert slicer.lines_for(["long_method"], focus={10, 11}) == {1, 10, 11}
+
+
+def test_sliced_inputs_keep_original_numbering_and_drop_empty_agents():
+    supervisor = CodeSmellSupervisor()
+    configs, inputs = supervisor._slice_inputs(CODE, supervisor.agent_configs)
+    assert "missing_default" not in configs
+    assert inputs["long_method"] == supervisor._format_code_with_line_numbers(CODE)
+    numbered = inputs["empty_catch_block"].split("\n")
+    assert "   6 |         except OSError:" in numbered
+    assert "(linhas omitidas)" in numbered[2]
+    assert not any("return data" in line for line in numbered)
+    assert CodeSlicer.to_ranges({1, 2, 3, 7, 8}) == [(1, 3), (7, 8)]
@@ -0,0 +1,60 @@
+"""Prazo da análise: agentes pendentes são cancelados e reportados."""
+
+import asyncio
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from api.app import app
+from core.supervisor import CodeSmellSupervisor
+from core.utils.fingerprint_store import FingerprintStore
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+CODE = "def f(x):\n    if x > 7:\n        return x * 42\n    return x + 13\n"
+
+
+def supervisor(latency_ms, **options):
+    config = FakeServerConfig(latency_dist="fixed", latency_ms=latency_ms, detections_per_kloc=400)
+    fake = create_app(config)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake))
+    analyzer = CodeSmellSupervisor(http_async_client=client, **options)
+    analyzer.fake = fake.state.fake
+    return analyzer
+
+
+def test_pending_agents_become_incomplete_at_the_deadline():
+    slow = supervisor(5000, engine="hybrid")
+    started = time.perf_counter()
+    result = asyncio.run(
+        slow.analyze_code(CODE, "m.py", use_cache=False, deadline_seconds=0.3)
+    )
+    assert time.perf_counter() - started < 3
+    assert sorted(result["incomplete_agents"]) == sorted(slow.agent_configs)
+    # As detecções estáticas não dependem do prazo
+    assert result["total_smells_detected"] == len(result["code_smells"])
+
+
+def test_incomplete_analysis_does_not_update_incremental_state(tmp_path):
+    store = FingerprintStore(str(tmp_path))
+    for latency_ms, deadline in ((5000, 0.3), (0, None)):
+        analyzer = supervisor(latency_ms)
+        analyzer.fingerprint_store = store
+        result = asyncio.run(
+            analyzer.analyze_code(
+                CODE, "m.py", use_cache=False, incremental_key="p", deadline_seconds=deadline
+            )
+        )
+    # Sem estado salvo pela execução interrompida, tudo é reanalisado
+    assert analyzer.fake.stats()["requests"] == len(analyzer.agent_configs)
+    assert not result["incomplete_agents"]
+
+
+def test_non_positive_deadline_is_rejected():
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/analyze",
+            json={"python_code": CODE},
+            headers={"X-Deadline-Seconds": "0"},
+        )
+    assert response.status_code == 400
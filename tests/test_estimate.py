@@ -0,0 +1,39 @@
+"""Endpoint de estimativa de tokens e custo (sem chamar o modelo)."""
+
+from fastapi.testclient import TestClient
+
+from api.app import app
+
+CODE = "def soma(a, b):\n    return a + b\n"
+
+
+def estimate(**body):
+    with TestClient(app) as client:
+        return client.post("/api/estimate", json=body)
+
+
+def test_estimates_each_file_and_the_total():
+    files = [
+        {"file_path": "a.py", "python_code": CODE},
+        {"file_path": "b.py", "python_code": CODE * 3},
+    ]
+    response = estimate(files=files, model="gpt-4o-mini")
+    assert response.status_code == 200
+    result = response.json()
+    assert [f["file_path"] for f in result["files"]] == ["a.py", "b.py"]
+    first, second = result["files"]
+    assert first["llm_calls"] == 11
+    assert second["prompt_tokens"] > first["prompt_tokens"]
+    assert result["total"]["prompt_tokens"] == first["prompt_tokens"] + second["prompt_tokens"]
+
+
+def test_grouping_reduces_calls():
+    files = [{"file_path": "a.py", "python_code": CODE}]
+    single = estimate(files=files, grouping="single").json()
+    assert single["total"]["llm_calls"] == 1
+
+
+def test_rejects_empty_files_and_invalid_options():
+    assert estimate(files=[{"file_path": "a.py", "python_code": "  "}]).status_code == 400
+    files = [{"file_path": "a.py", "python_code": CODE}]
+    assert estimate(files=files, engine="desconhecida").status_code == 400
@@ -0,0 +1,78 @@
+"""Provedor falso: respostas por agente e falhas injetadas."""
+
+import asyncio
+import json
+
+import httpx
+
+from core.supervisor.agent_config import get_agent_configs
+from devtools.fake_openrouter import FakeServerConfig, create_app, parse_args
+
+CODE = "   1 | def f(x):\n   2 |     return x * 42\n"
+
+
+def post(config, agent="magic_number", **payload):
+    app = create_app(config)
+    prompt = get_agent_configs()[agent]["prompt"]
+    body = {"model": "m", "messages": [{"role": "user", "content": f"{prompt}\n\n{CODE}"}]}
+
+    async def call():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+            return await client.post("/v1/chat/completions", json={**body, **payload})
+
+    return asyncio.run(call()), app.state.fake
+
+
+def content(response):
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def test_agent_is_identified_and_answer_follows_its_schema():
+    response, fake = post(FakeServerConfig(latency_ms=0, detections_per_kloc=1000))
+    schema = get_agent_configs()["magic_number"]["schema"]
+    answer = schema.model_validate_json(content(response))
+    assert answer.detected and all(d.Line_no in ("1", "2") for d in answer.detections)
+    assert fake.stats()["agents"] == {"magic_number": 1}
+    # Mesma requisição, mesmas detecções
+    again, _ = post(FakeServerConfig(latency_ms=0, detections_per_kloc=1000))
+    assert content(again) == content(response)
+
+
+def test_injected_failures():
+    response, _ = post(FakeServerConfig(latency_ms=0, rate_429=1.0, retry_after=7))
+    assert response.status_code == 429 and float(response.headers["retry-after"]) == 7
+    response, _ = post(FakeServerConfig(latency_ms=0, rate_5xx=1.0))
+    assert response.status_code in (500, 502, 503)
+    response, _ = post(FakeServerConfig(latency_ms=0, rate_malformed=1.0))
+    assert not content(response).lstrip().startswith(("{", "["))
+    response, _ = post(FakeServerConfig(latency_ms=0, rate_bare_array=1.0))
+    assert isinstance(json.loads(content(response)), list)
+    response, fake = post(FakeServerConfig(latency_ms=0, rate_truncated=1.0))
+    assert response.json()["choices"][0]["finish_reason"] == "length"
+    assert fake.stats()["outcomes"] == {"truncated": 1}
+
+
+def test_max_tokens_cuts_the_answer():
+    config = FakeServerConfig(latency_ms=0, detections_per_kloc=1000)
+    response, fake = post(config, max_tokens=5)
+    assert response.json()["choices"][0]["finish_reason"] == "length"
+    assert fake.stats()["outcomes"]["max_tokens"] == 1
+
+
+def test_stream_reports_usage_in_the_last_chunk():
+    response, _ = post(
+        FakeServerConfig(latency_ms=0), stream=True, stream_options={"include_usage": True}
+    )
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.split("\n\n")
+        if line.startswith("data: {")
+    ]
+    assert events[-1]["choices"] == [] and events[-1]["usage"]["prompt_tokens"] > 0
+    assert "data: [DONE]" in response.text
+
+
+def test_command_line_options():
+    _, config = parse_args(["--latency-ms", "200", "--rate-429", "0.05", "--seed", "3"])
+    assert (config.latency_ms, config.rate_429, config.seed) == (200.0, 0.05, 3)
@@ -0,0 +1,62 @@
+"""Empacotamento de arquivos pequenos e divisão de pacotes cortados."""
+
+import asyncio
+
+import httpx
+
+from core.supervisor import CodeSmellSupervisor
+from core.supervisor.supervisor import _candidate_counts
+from core.utils.file_packer import FilePacker
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+CODE = "def f(x):\n    return x * 42\n\n\ndef g(y):\n    if y > 7:\n        return 3\n    return y\n"
+
+
+def make_pack(count=3, code=CODE):
+    files = [(f"m{i}.py", code) for i in range(count)]
+    packs = FilePacker(max_tokens=10_000).pack(files, [100] * count)
+    assert len(packs) == 1
+    return packs[0]
+
+
+def test_candidate_counts_sum_pack_files():
+    pack = make_pack()
+    single = _candidate_counts(CODE)
+    assert _candidate_counts(pack.source) == {name: 3 * n for name, n in single.items()}
+
+
+def test_pack_bisects_between_files():
+    supervisor = CodeSmellSupervisor()
+    pack = make_pack(count=4)
+    halves = supervisor._bisect_numbered_code(pack.source, supervisor._format_pack(pack))
+    assert [half.count("### FILE:") for half in halves] == [2, 2]
+    assert halves[1].startswith("### FILE: m2.py ###")
+
+
+def test_single_file_half_bisects_by_ast_and_keeps_header():
+    supervisor = CodeSmellSupervisor()
+    pack = make_pack(count=1)
+    first, second = supervisor._bisect_numbered_code(pack.source, supervisor._format_pack(pack))
+    assert first.startswith("### FILE: m0.py ###")
+    assert second.startswith("### FILE: m0.py ###\n   5 | def g(y):")
+
+
+def test_truncated_pack_is_split():
+    app = create_app(FakeServerConfig(latency_ms=0, rate_truncated=1.0))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+    files = [(f"m{i}.py", CODE) for i in range(3)]
+    result = asyncio.run(supervisor.analyze_batch(files, use_cache=False))
+    assert result["packing"]["packs"] == 1
+    assert result["agent_calls"]["overflow_splits"] >= len(supervisor.agent_configs)
+
+
+def test_batch_stats_merge_files_and_packs():
+    total = {"skipped_agents": {}}
+    CodeSmellSupervisor._merge_batch_stats(total, {"retries": 1, "attempts": {"magic_number": 2}})
+    single = CodeSmellSupervisor._stats_of_result(
+        {"cache": {"hits": 3}, "agent_calls": {"attempts": {"magic_number": 1}, "retries": 2}}
+    )
+    CodeSmellSupervisor._merge_batch_stats(total, single)
+    assert total["retries"] == 3 and total["cache_hits"] == 3
+    assert total["attempts"] == {"magic_number": 3}
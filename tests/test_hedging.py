@@ -0,0 +1,61 @@
+"""Hedge de chamadas lentas e grupo de controle da comparação de latências."""
+
+import asyncio
+
+from core.supervisor import CodeSmellSupervisor
+from core.supervisor.hedging import HedgePolicy
+from core.utils.metrics import metrics
+
+
+def hedged_supervisor(control_ratio, primary_seconds=1.0):
+    """Supervisor com histórico de latência do agente ``slow`` e chamadas simuladas."""
+    metrics.reset()
+    for _ in range(3):
+        metrics.observe("llm.agent_latency_seconds.slow", 0.01)
+    supervisor = CodeSmellSupervisor(hedging=True)
+    supervisor.hedge_policy = HedgePolicy(
+        min_samples=3, min_delay=0.05, budget_ratio=1.0, control_ratio=control_ratio
+    )
+    calls = []
+
+    async def invoke_once(agent_name, model, limiter, messages, estimated_tokens, stats):
+        calls.append(model)
+        await asyncio.sleep(primary_seconds if len(calls) == 1 else 0)
+        return f"resposta {len(calls)}", {}
+
+    supervisor._invoke_once = invoke_once
+    return supervisor, calls
+
+
+def test_no_hedge_without_history():
+    metrics.reset()
+    assert HedgePolicy(min_samples=3).delay("unknown") is None
+
+
+def test_budget_limits_hedges():
+    policy = HedgePolicy(budget_ratio=0.5)
+    policy.record_call()
+    assert not policy.try_acquire()
+    policy.record_call()
+    assert policy.try_acquire()
+
+
+def test_slow_primary_is_hedged():
+    supervisor, calls = hedged_supervisor(control_ratio=0.0)
+    stats = {}
+    result = asyncio.run(supervisor._invoke_hedged("slow", None, [], 10, stats))
+    assert result == ("resposta 2", {})
+    assert stats["hedges"] == stats["hedge_wins"] == 1
+    assert metrics.summary("hedge.latency_seconds")["count"] == 1
+    assert metrics.summary("hedge.baseline_latency_seconds")["count"] == 0
+
+
+def test_control_calls_are_baseline_without_hedge():
+    supervisor, calls = hedged_supervisor(control_ratio=1.0, primary_seconds=0.1)
+    stats = {}
+    result = asyncio.run(supervisor._invoke_hedged("slow", None, [], 10, stats))
+    assert result == ("resposta 1", {})
+    assert len(calls) == 1
+    assert stats["hedge_control"] == 1
+    assert metrics.summary("hedge.baseline_latency_seconds")["count"] == 1
+    assert metrics.summary("hedge.latency_seconds")["count"] == 0
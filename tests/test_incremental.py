@@ -0,0 +1,60 @@
+"""Reanálise incremental por função com impressões digitais das unidades."""
+
+import asyncio
+
+import httpx
+
+from core.supervisor import CodeSmellSupervisor
+from core.utils.code_parser import CodeParser
+from core.utils.fingerprint_store import FingerprintStore
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+FUNCTION = "def f(x):\n    if x > 7:\n        return x * 42\n    return x + 13\n"
+# Redefinição idêntica: duas unidades com o mesmo código
+CODE = "import os\n\n\n" + FUNCTION + "\n\n" + FUNCTION
+
+
+def fingerprints(code):
+    return {unit["name"]: unit["fingerprint"] for unit in CodeParser(code).get_fingerprinted_units()}
+
+
+def test_identical_units_have_distinct_fingerprints():
+    units = CodeParser(CODE).get_fingerprinted_units()
+    assert [unit["name"] for unit in units] == ["f", "f", "<module>"]
+    assert units[0]["fingerprint"] != units[1]["fingerprint"]
+
+
+def test_moved_unit_keeps_its_fingerprint():
+    other = "def g():\n    return 1\n"
+    before = fingerprints(FUNCTION + "\n\n" + other)
+    after = fingerprints("import os\n\n\n" + other + "\n\n" + FUNCTION)
+    assert before["f"] == after["f"] and before["g"] == after["g"]
+
+
+def run(code, store, **options):
+    app = create_app(FakeServerConfig(latency_ms=0, detections_per_kloc=400))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+    supervisor.fingerprint_store = store
+    result = asyncio.run(
+        supervisor.analyze_code(code, "m.py", use_cache=False, incremental_key="p", **options)
+    )
+    return result, app.state.fake.stats()["requests"]
+
+
+def test_unchanged_file_reuses_detections_without_duplicates(tmp_path):
+    store = FingerprintStore(str(tmp_path))
+    first, requests = run(CODE, store)
+    assert requests and first["total_smells_detected"]
+
+    second, requests = run(CODE, store)
+    assert requests == 0
+    assert second["incremental"]["reused_detections"] == first["total_smells_detected"]
+    assert second["total_smells_detected"] == first["total_smells_detected"]
+
+
+def test_changed_options_invalidate_state(tmp_path):
+    store = FingerprintStore(str(tmp_path))
+    run(CODE, store)
+    _, requests = run(CODE, store, slicing=True)
+    assert requests
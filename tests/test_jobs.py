@@ -0,0 +1,75 @@
+"""Fila persistente de jobs: deduplicação, retomada, custo por modelo e validação."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from api.models import JobRequest
+from api.routes.jobs import _validate_options
+from core.jobs.manager import TOKEN_FIELDS, JobManager
+from core.jobs.store import COMPLETED, PENDING, JobStore
+from core.supervisor import supervisor_registry
+
+FILES = [("a.py", "def f(x):\n    return x * 42\n"), ("b.py", "X = 1\n")]
+
+
+def test_identical_submission_is_deduplicated(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id, created = store.create(FILES, "p", {"engine": "static"})
+    assert created
+    assert store.create(list(reversed(FILES)), "p", {"engine": "static"}) == (job_id, False)
+    assert store.create(FILES, "p", {"engine": "llm"})[0] != job_id
+
+
+def test_interrupted_files_are_requeued(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id, _ = store.create(FILES, "p", {})
+    assert store.claim_file(job_id, 0)["file_path"] == "a.py"
+    assert store.claim_file(job_id, 0) is None
+    store.close()
+
+    reopened = JobStore(str(tmp_path / "jobs.db"))
+    assert sorted(reopened.recover()) == [(job_id, 0), (job_id, 1)]
+    assert [f["status"] for f in reopened.get(job_id)["files"]] == [PENDING, PENDING]
+
+
+def test_usage_is_grouped_by_result_model(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id, _ = store.create(FILES, "p", {})
+    for index, model in enumerate(("m1", "m2")):
+        store.claim_file(job_id, index)
+        usage = {field: 10 * (index + 1) for field in TOKEN_FIELDS}
+        store.finish_file(
+            job_id,
+            index,
+            result={"total_smells_detected": 1, "token_usage": usage, "budget": {"model": model}},
+        )
+    usage = store.usage_by_model(job_id, TOKEN_FIELDS)
+    assert usage["m1"]["prompt_tokens"] == 10
+    assert usage["m2"]["completion_tokens"] == 20
+
+
+def test_static_job_runs_to_completion(tmp_path):
+    async def run():
+        manager = JobManager(db_path=str(tmp_path / "jobs.db"), workers=2)
+        await manager.start()
+        try:
+            job_id, _ = manager.submit(FILES, "p", {"engine": "static", "use_cache": False})
+            await manager._queue.join()
+            return manager.get_status(job_id)
+        finally:
+            await manager.stop()
+
+    status = asyncio.run(run())
+    assert status["status"] == COMPLETED
+    assert status["progress"]["completed"] == 2
+    assert status["cost_usd"] == 0.0
+
+
+def test_option_validation_has_no_side_effects():
+    before = len(supervisor_registry)
+    with pytest.raises(HTTPException):
+        _validate_options(JobRequest(files=[], engine="nope"))
+    _validate_options(JobRequest(files=[], grouping="families", engine="hybrid"))
+    assert len(supervisor_registry) == before
@@ -0,0 +1,87 @@
+"""Backend de gravação e reprodução das respostas do modelo."""
+
+import asyncio
+import json
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from core.supervisor.llm_backend import (
+    RecordReplayChatModel,
+    ReplayMissError,
+    ResponseArchive,
+)
+
+ANSWER = '{"detected": false, "detections": []}'
+
+
+def sse_body():
+    events = [
+        {"choices": [{"index": 0, "delta": {"role": "assistant", "content": ANSWER}}]},
+        {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+        {"choices": [], "usage": {"prompt_tokens": 50, "completion_tokens": 9, "total_tokens": 59}},
+    ]
+    chunk = {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": "m"}
+    body = "".join(f"data: {json.dumps({**chunk, **event})}\n\n" for event in events)
+    return (body + "data: [DONE]\n\n").encode("utf-8")
+
+
+def provider(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(
+            200, content=sse_body(), headers={"content-type": "text/event-stream"}
+        )
+
+    transport = httpx.MockTransport(handler)
+    return ChatOpenAI(
+        model="m",
+        api_key="test",
+        base_url="http://provider.test/v1",
+        stream_usage=True,
+        http_client=httpx.Client(transport=transport),
+        http_async_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+def backend(mode, path, inner=None):
+    return RecordReplayChatModel(
+        mode=mode,
+        archive=ResponseArchive(str(path)),
+        inner=inner,
+        model_name="m",
+        latency_scale=0,
+    )
+
+
+def test_recorded_responses_replay_offline(tmp_path):
+    path = tmp_path / "responses.jsonl.gz"
+    requests = []
+    recorder = backend("record", path, provider(requests))
+    asyncio.run(recorder.ainvoke("async"))
+    recorder.invoke("sync")
+    assert len(requests) == 2
+
+    replayer = backend("replay", path)
+    assert len(replayer.archive) == 2
+    for message in (asyncio.run(replayer.ainvoke("async")), replayer.invoke("sync")):
+        assert message.content == ANSWER
+        assert message.usage_metadata["output_tokens"] == 9
+
+
+def test_replay_miss_is_reported(tmp_path):
+    replayer = backend("replay", tmp_path / "empty.jsonl.gz")
+    try:
+        replayer.invoke("unknown")
+    except ReplayMissError:
+        pass
+    else:
+        raise AssertionError("ReplayMissError não lançado")
+
+
+def test_records_are_buffered_until_flush(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "responses.jsonl.gz"))
+    archive.add({"key": "k", "text": ANSWER})
+    assert not archive.path.exists()
+    asyncio.run(archive.aflush())
+    assert len(ResponseArchive(str(archive.path))) == 1
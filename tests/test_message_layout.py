@@ -0,0 +1,45 @@
+"""Layout das mensagens: prefixo comum para o cache de prompt do provedor."""
+
+from core.supervisor import CodeSmellSupervisor
+
+CODE = "def f(x):\n    return x * 42\n"
+
+
+def messages_per_agent(layout):
+    supervisor = CodeSmellSupervisor(layout=layout)
+    numbered = supervisor._format_code_with_line_numbers(CODE)
+    return supervisor, {
+        name: supervisor._build_messages(config, numbered)
+        for name, config in supervisor.agent_configs.items()
+    }
+
+
+def test_code_first_shares_the_prefix_across_agents():
+    _, messages = messages_per_agent("code_first")
+    systems = {str(agent_messages[0]["content"]) for agent_messages in messages.values()}
+    assert len(systems) == 1
+    assert "return x * 42" in systems.pop()
+    assert all("return x * 42" not in m[1]["content"] for m in messages.values())
+
+
+def test_prompt_first_keeps_code_after_instructions():
+    _, messages = messages_per_agent("prompt_first")
+    user = messages["magic_number"][1]["content"]
+    assert user.index("return x * 42") > user.index("Magic Number")
+
+
+def test_cache_control_marks_the_shared_prefix():
+    supervisor, _ = messages_per_agent("code_first")
+    supervisor.use_cache_control = True
+    config = supervisor.agent_configs["magic_number"]
+    system = supervisor._build_messages(config, "1: x = 1")[0]["content"]
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_prompt_cache_summary():
+    usage = {"prompt_tokens": 1000, "cached_prompt_tokens": 750}
+    assert CodeSmellSupervisor._summarize_prompt_cache(usage) == {
+        "cached_prompt_tokens": 750,
+        "uncached_prompt_tokens": 250,
+        "cached_ratio": 0.75,
+    }
@@ -0,0 +1,34 @@
+"""Orçamento de tokens de saída previsto pelos candidatos estáticos."""
+
+from core.supervisor.output_budget import OutputBudgetPolicy
+from core.utils.metrics import metrics
+
+
+def test_prediction_grows_in_powers_of_two_up_to_the_limit():
+    policy = OutputBudgetPolicy(min_tokens=512, max_tokens=4096)
+    assert policy.predict("magic_number", 0) == 512
+    assert policy.predict("magic_number", 5) == 2048
+    assert policy.predict("magic_number", 100) == 4096
+
+
+def test_fused_agent_sums_member_candidates():
+    counts = {"long_method": 2, "complex_method": 3, "magic_number": 7}
+    members = ("long_method", "complex_method")
+    assert OutputBudgetPolicy.candidates_for(counts, members) == 5
+
+
+def test_learning_recalibrates_from_observed_usage():
+    metrics.reset()
+    policy = OutputBudgetPolicy(min_samples=3, learn=True)
+    for _ in range(3):
+        policy.record("learned_agent", candidates=4, predicted=1024, completion_tokens=64 + 4 * 20)
+    assert policy.tokens_per_candidate("learned_agent") == 20
+    assert policy.predict("learned_agent", 4) == 512
+
+
+def test_truncated_calls_count_as_underpredicted_without_calibrating():
+    metrics.reset()
+    policy = OutputBudgetPolicy(min_samples=1, learn=True)
+    policy.record("cut_agent", candidates=1, predicted=512, completion_tokens=512, truncated=True)
+    assert policy.underpredicted == {"cut_agent": 1}
+    assert policy.tokens_per_candidate("cut_agent") == policy.default_per_candidate
@@ -0,0 +1,62 @@
+"""Divisão das chamadas cortadas pelo limite de tokens de saída."""
+
+import asyncio
+
+import httpx
+
+from config.settings import settings
+from core.supervisor import CodeSmellSupervisor
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+FUNCTIONS = "\n\n".join(f"def f{i}(x):\n    return x * {i + 100}\n" for i in range(4))
+CLASS = "class C:\n" + "\n".join(
+    f"    def m{i}(self):\n        return {i + 100}\n" for i in range(4)
+)
+BODY = "def g(x):\n" + "".join(f"    x = x * {i + 100}\n" for i in range(6)) + "    return x\n"
+
+
+def bisect(code):
+    supervisor = CodeSmellSupervisor()
+    numbered = supervisor._format_code_with_line_numbers(code)
+    halves = supervisor._bisect_numbered_code(code, numbered)
+    if halves is None:
+        return None
+    return [[line.split("|", 1)[1] for line in half.split("\n")] for half in halves]
+
+
+def test_module_is_cut_between_top_level_statements():
+    first, second = bisect(FUNCTIONS)
+    assert second[0] == " def f2(x):"
+    assert len(first) + len(second) == len(FUNCTIONS.split("\n"))
+
+
+def test_finer_levels_are_used_only_without_module_cuts():
+    _, second = bisect(CLASS)
+    assert second[0] == "     def m2(self):"
+    _, second = bisect(BODY)
+    assert second[0].strip().startswith("x = x *")
+    assert bisect("x = 1\n") is None
+
+
+def split_run(monkeypatch, depth):
+    monkeypatch.setattr(settings, "OVERFLOW_SPLIT_MAX_DEPTH", depth)
+    app = create_app(FakeServerConfig(latency_ms=0, rate_truncated=1.0))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+    result = asyncio.run(supervisor.analyze_code(FUNCTIONS, "m.py", use_cache=False))
+    return supervisor, result["agent_calls"], app.state.fake.stats()["requests"]
+
+
+def test_truncated_agents_are_rerun_in_halves(monkeypatch):
+    supervisor, calls, requests = split_run(monkeypatch, depth=1)
+    agents = len(supervisor.agent_configs)
+    assert calls["overflow_splits"] == agents
+    assert requests == 3 * agents
+    # Ainda cortados no último nível: continuam reportados
+    assert sorted(calls["truncated_agents"]) == sorted(supervisor.agent_configs)
+
+
+def test_no_split_without_depth(monkeypatch):
+    supervisor, calls, requests = split_run(monkeypatch, depth=0)
+    assert calls["overflow_splits"] == 0
+    assert requests == len(supervisor.agent_configs)
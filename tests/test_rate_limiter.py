@@ -0,0 +1,62 @@
+"""Limitador do provedor: orçamento de TPM e concorrência adaptativa (AIMD)."""
+
+import asyncio
+
+import httpx
+import openai
+
+from core.supervisor.rate_limiter import ProviderRateLimiter
+
+
+def limiter(**options):
+    defaults = {"requests_per_minute": 0, "tokens_per_minute": 0, "max_concurrency": 8}
+    return ProviderRateLimiter("m", **{**defaults, **options})
+
+
+def rate_limit_error(retry_after="2"):
+    request = httpx.Request("POST", "http://provider.test/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return openai.RateLimitError("limite", response=response, body=None)
+
+
+def test_reconciles_clamped_reservation():
+    rate = limiter(tokens_per_minute=1000)
+
+    async def call():
+        async with rate.slot(5000) as ticket:
+            assert ticket.reserved_tokens == 1000
+            ticket.actual_tokens = 600
+
+    asyncio.run(call())
+    # Reservou 1000 (não 5000) e usou 600: sobram ~400 tokens, não 4400
+    assert 390 <= rate._token_budget <= 410
+
+
+def test_successes_raise_concurrency():
+    rate = limiter()
+    start = rate.concurrency
+
+    async def calls():
+        for _ in range(start):
+            async with rate.slot(10):
+                pass
+
+    asyncio.run(calls())
+    assert rate.concurrency == start + 1
+
+
+def test_rate_limit_halves_concurrency_and_pauses():
+    rate = limiter()
+    start = rate.concurrency
+
+    async def call():
+        async with rate.slot(10):
+            raise rate_limit_error()
+
+    try:
+        asyncio.run(call())
+    except openai.RateLimitError:
+        pass
+    assert rate.concurrency == start // 2
+    assert rate.rate_limited_count == 1
+    assert rate._seconds_until_available(10, rate._last_refill) > 1.5
@@ -0,0 +1,37 @@
+"""Registro de supervisores e pool HTTP compartilhado."""
+
+import asyncio
+
+from core.supervisor import SupervisorRegistry
+
+
+def test_supervisors_are_reused_and_share_the_pool():
+    registry = SupervisorRegistry()
+
+    async def get():
+        return registry.get(), registry.get(), registry.get(engine="hybrid")
+
+    first, again, hybrid = asyncio.run(get())
+    assert first is again
+    assert hybrid is not first
+    assert len(registry) == 2
+
+
+def test_loop_change_closes_the_old_pool():
+    registry = SupervisorRegistry()
+
+    async def client():
+        registry.get()
+        return registry.http_client
+
+    old = asyncio.run(client())
+
+    async def next_loop():
+        new = await client()
+        await asyncio.sleep(0)
+        return new
+
+    new = asyncio.run(next_loop())
+    assert new is not old
+    assert old.is_closed and not new.is_closed
+    assert len(registry) == 1
@@ -0,0 +1,49 @@
+"""Cache em disco das respostas: idade pela gravação, evicção pelo último uso."""
+
+import os
+import time
+
+from core.utils.response_cache import ResponseCache
+
+PAYLOAD = {"detections": ["x" * 400]}
+
+
+def age(cache, key, written, used):
+    now = time.time()
+    os.utime(cache._path(key), (now - used, now - written))
+
+
+def test_expired_entries_are_dropped_on_read(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size_mb=1, max_age_hours=1)
+    cache.set("aa", PAYLOAD)
+    assert cache.get("aa") == PAYLOAD
+    age(cache, "aa", written=2 * 3600, used=0)
+    assert cache.get("aa") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_read_keeps_entry_age_but_refreshes_its_use(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size_mb=1, max_age_hours=1)
+    cache.set("aa", PAYLOAD)
+    age(cache, "aa", written=600, used=600)
+    cache.get("aa")
+    stat = cache._path("aa").stat()
+    assert time.time() - stat.st_mtime >= 590
+    assert time.time() - stat.st_atime < 60
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size_mb=1, max_age_hours=1)
+    for index, key in enumerate(("aa", "bb", "cc")):
+        cache.set(key, PAYLOAD)
+        age(cache, key, written=300 - index, used=300 - index)
+    cache.get("aa")
+
+    entry_size = cache._path("aa").stat().st_size
+    cache.max_size_bytes = int(entry_size * 3.5)
+    cache._size_bytes = None
+    cache.set("dd", PAYLOAD)
+
+    assert cache.get("bb") is None
+    assert cache.get("aa") == PAYLOAD
+    assert cache.get("dd") == PAYLOAD
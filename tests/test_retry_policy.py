@@ -0,0 +1,33 @@
+"""Classificação de erros do provedor (retentável ou terminal)."""
+
+import httpx
+import openai
+from langchain_core.exceptions import OutputParserException
+
+from core.supervisor.rate_limiter import is_rate_limit_error
+from core.supervisor.retry_policy import classify_error
+
+REQUEST = httpx.Request("POST", "http://localhost/chat/completions")
+
+
+def test_parse_errors_quoting_429_are_terminal():
+    error = OutputParserException("Invalid json output: Magic number 429 in line 12")
+    assert not is_rate_limit_error(error)
+    assert classify_error(error) == (False, "parsing")
+
+
+def test_schema_errors_quoting_429_are_terminal():
+    error = ValueError("line 1429: bad")
+    assert not is_rate_limit_error(error)
+    assert classify_error(error) == (False, "schema")
+
+
+def test_http_429_is_rate_limit():
+    response = httpx.Response(429, request=REQUEST)
+    error = openai.RateLimitError("Too Many Requests", response=response, body=None)
+    assert classify_error(error) == (True, "rate_limit")
+
+
+def test_status_less_api_error_reporting_429_is_rate_limit():
+    error = openai.APIError("Provider returned error 429", REQUEST, body=None)
+    assert classify_error(error) == (True, "rate_limit")
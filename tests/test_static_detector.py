@@ -0,0 +1,49 @@
+"""Engine estática: complexidade ciclomática e condicionais complexas pela AST."""
+
+import textwrap
+
+from core.utils.static_detector import StaticSmellDetector
+
+
+def detect(code, agent):
+    return StaticSmellDetector(textwrap.dedent(code)).detect((agent,))[agent]
+
+
+def complexity(body):
+    """Complexidade de ``f`` com o corpo dado (threshold zerado para sempre detectar)."""
+    code = "def f(a, b, c, items):\n" + textwrap.indent(textwrap.dedent(body), "    ")
+    detector = StaticSmellDetector(code)
+    detector.COMPLEX_METHOD_THRESHOLD = 0
+    (detection,) = detector.detect(("complex_method",))["complex_method"]
+    return detection.cyclomatic_complexity
+
+
+def test_complexity_counts_expression_decisions():
+    assert complexity("return a") == 1
+    assert complexity("return a if b else c") == 2
+    assert complexity("assert a\nreturn b") == 2
+    assert complexity("return [x for x in items if x if a]") == 4
+
+
+def test_complexity_counts_match_cases_except_wildcard():
+    body = """
+    match a:
+        case 1:
+            return b
+        case 2 if c:
+            return c
+        case _:
+            return None
+    """
+    assert complexity(body) == 3
+
+
+def test_conditional_threshold_matches_schema():
+    assert StaticSmellDetector.COMPLEX_CONDITIONAL_THRESHOLD == 2
+    assert not detect("if a and b or c:\n    pass\n", "complex_conditional")
+    assert detect("if a and b or c and d:\n    pass\n", "complex_conditional")
+
+
+def test_conditional_expression_is_checked():
+    (detection,) = detect("x = 1 if a and b and c or d else 2\n", "complex_conditional")
+    assert detection.logical_operators == 3
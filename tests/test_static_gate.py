@@ -0,0 +1,61 @@
+"""Pré-análise estática: agentes que não têm como disparar são pulados."""
+
+import asyncio
+
+import httpx
+
+from core.supervisor import CodeSmellSupervisor
+from core.utils.static_gate import StaticGate
+from devtools.fake_openrouter import FakeServerConfig, create_app
+
+SIMPLE = "def f(x):\n    return x * 42\n"
+
+
+def test_simple_code_skips_structural_agents():
+    skipped = StaticGate(SIMPLE).skippable_agents()
+    assert {
+        "empty_catch_block",
+        "missing_default",
+        "long_method",
+        "long_parameter_list",
+        "long_lambda_function",
+        "long_statement",
+        "long_identifier",
+    } <= set(skipped)
+    # Smells semânticos nunca são pulados
+    assert "magic_number" not in skipped and "complex_conditional" not in skipped
+
+
+def test_constructs_above_threshold_keep_their_agents():
+    code = (
+        "def g(a, b, c, d, e):\n"
+        "    try:\n"
+        "        pass\n"
+        "    except ValueError:\n"
+        "        pass\n"
+        "    match a:\n"
+        "        case 1:\n"
+        "            pass\n"
+        "    identificador_com_nome_bem_comprido = 1\n"
+    )
+    skipped = StaticGate(code).skippable_agents()
+    kept = ("long_parameter_list", "empty_catch_block", "missing_default", "long_identifier")
+    assert not set(kept) & set(skipped)
+
+
+def test_syntax_error_does_not_skip_ast_agents():
+    skipped = StaticGate("def f(:\n    try:\n").skippable_agents()
+    assert "empty_catch_block" not in skipped
+    assert "long_method" not in skipped
+
+
+def test_gated_analysis_calls_only_remaining_agents():
+    app = create_app(FakeServerConfig(latency_ms=0))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    supervisor = CodeSmellSupervisor(http_async_client=client)
+    result = asyncio.run(supervisor.analyze_code(SIMPLE, "m.py", use_cache=False, gating=True))
+
+    skipped = result["gating"]["skipped_agents"]
+    assert set(skipped) == set(StaticGate(SIMPLE).skippable_agents())
+    assert app.state.fake.stats()["requests"] == 11 - len(skipped)
+    assert result["gating"]["estimated_prompt_tokens_saved"] > 0
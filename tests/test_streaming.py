@@ -0,0 +1,71 @@
+"""Leitura em streaming das respostas dos agentes pelo ChatOpenAI."""
+
+import asyncio
+import json
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from core.schemas.agent_response import MultipleMagicNumberResponse
+from core.supervisor.streaming import StreamingStructuredModel, TruncatedResponseError
+
+DETECTION = {"Method": "f", "Line_no": 3, "Description": "Magic number 42 in expression"}
+
+
+def sse_body(content, finish_reason):
+    """Resposta chat-completions em SSE, em pedaços de 20 caracteres."""
+
+    def event(choices, **extra):
+        chunk = {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": "m"}
+        return f"data: {json.dumps({**chunk, 'choices': choices, **extra})}\n\n"
+
+    body = event([{"index": 0, "delta": {"role": "assistant", "content": ""}}])
+    for start in range(0, len(content), 20):
+        body += event([{"index": 0, "delta": {"content": content[start : start + 20]}}])
+    body += event([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+    body += event([], usage={"prompt_tokens": 100, "completion_tokens": 40, "total_tokens": 140})
+    return (body + "data: [DONE]\n\n").encode("utf-8")
+
+
+def chat_model(content, finish_reason):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200,
+            content=sse_body(content, finish_reason),
+            headers={"content-type": "text/event-stream"},
+        )
+    )
+    return ChatOpenAI(
+        model="m",
+        api_key="test",
+        base_url="http://provider.test/v1",
+        streaming=True,
+        stream_usage=True,
+        http_async_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+def invoke(content, finish_reason):
+    structured = StreamingStructuredModel(
+        chat_model(content, finish_reason), MultipleMagicNumberResponse
+    )
+    return asyncio.run(structured.ainvoke([("user", "analise")]))
+
+
+def test_complete_stream_returns_all_detections():
+    content = json.dumps({"detected": True, "detections": [DETECTION, DETECTION]})
+    response = invoke(content, "stop")
+    assert len(response.detections) == 2
+
+
+def test_length_cut_keeps_complete_detections():
+    complete = json.dumps({"detected": True, "detections": [DETECTION]})[:-2]
+    content = complete + ', {"Method": "g", "Li'
+    try:
+        invoke(content, "length")
+    except TruncatedResponseError as e:
+        assert e.detections == 1
+        assert e.response.detections[0].Method == "f"
+        assert e.token_usage["completion_tokens"] == 40
+    else:
+        raise AssertionError("TruncatedResponseError não lançado")